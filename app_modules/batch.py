@@ -0,0 +1,386 @@
+"""
+Klasör / dosya listesi için toplu işleme.
+
+Arkaplan kaldırma ana süreçte, matte veren kaldırıcılarda
+remove_background_matte_batch() ile parça parça yapılır; kompozit, yüz
+analizi, yerleşim, rötuş ve JPG kaydetme gibi OpenCV/PIL işleri sınırlı bir
+süreç havuzuna dağıtılır. Havuzda bekleyen iş sayısı sınırlı tutulur, böylece
+yüzlerce fotoğraflık bir klasör belleğe bir anda yüklenmez; model bir sonraki
+parçayı işlerken havuz bir öncekinin çıktılarını üretir.
+
+Tüm çıktıları zaten var olan dosyalar atlanır (yarıda kalan bir iş aynı
+komutla devam ettirilebilir). Bir dosyadaki hata diğerlerini durdurmaz.
+
+Bu modül PyTorch import etmez; alt süreçler yalnızca OpenCV/PIL yükler.
+"""
+
+import os
+import time
+from contextlib import contextmanager
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from .centering import analyze_face, render_photo
+from .duzen import (
+    build_image_layout,
+    build_image_layout_2lu_biyometrik,
+    build_image_layout_2lu_vesikalik,
+    build_image_layout_vesikalik,
+    save_layout,
+)
+from .enhance import natural_enhance
+from .image_io import bgr_to_pil, composite
+from .matting import MAX_BATCH
+from .photo_spec import BIYOMETRIK, VESIKALIK
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.tif', '.tiff')
+
+# 10x15 cm tek fotoğraf sayfası (300 DPI)
+TARGET_WIDTH_10x15 = 1181
+TARGET_HEIGHT_10x15 = 1772
+TOP_MARGIN_10x15 = 118
+
+# Havuzda süreç başına bekleyebilecek en fazla iş (bellek sınırı)
+PENDING_PER_WORKER = 2
+
+# (tür, yerleşim): ("vesikalik" | "biyometrik" | "10x15", "4lu" | "2li")
+Target = Tuple[str, str]
+Callback = Callable[..., None]
+
+
+class BatchResult(NamedTuple):
+    """Toplu işin özeti."""
+    produced: List[str]                # kaydedilen çıktı dosyaları
+    skipped: List[str]                 # çıktıları zaten var olan girişler
+    failed: List[Tuple[str, str]]      # (giriş, hata mesajı)
+
+
+def default_workers() -> int:
+    """Arayüz / model için bir çekirdek bırakarak en fazla 4 süreç."""
+    return max(0, min(4, (os.cpu_count() or 1) - 1))
+
+
+def collect_images(sources: "str | Sequence[str]") -> List[str]:
+    """Klasör(ler) ve dosyalardan desteklenen görüntüleri sıralı topla."""
+    if isinstance(sources, str):
+        sources = [sources]
+    paths = []
+    for source in sources:
+        if os.path.isdir(source):
+            for entry in sorted(os.listdir(source)):
+                path = os.path.join(source, entry)
+                if os.path.isfile(path) and entry.lower().endswith(IMAGE_EXTENSIONS):
+                    paths.append(path)
+        else:
+            paths.append(source)
+    return paths
+
+
+def output_path(input_path: str, selection: str, layout_choice: str, out_dir: Optional[str] = None) -> str:
+    """Bir çıktının dosya yolu; out_dir None ise girişin yanına yazılır."""
+    base_dir, filename = os.path.split(input_path)
+    name, _ = os.path.splitext(filename)
+    if selection == "10x15":
+        filename = f"{name}_10x15cm.jpg"
+    else:
+        size = "10x15" if layout_choice == "4lu" else "5x15"
+        filename = f"{name}_{size}_{selection}.jpg"
+    return os.path.join(out_dir or base_dir, filename)
+
+
+def pending_images(paths: Sequence[str], targets: Sequence[Target],
+                   out_dir: Optional[str] = None) -> Tuple[List[str], List[str]]:
+    """Girişleri (işlenecek, atlanacak) olarak ayır: tüm çıktıları varsa atlanır."""
+    pending, skipped = [], []
+    for path in paths:
+        done = all(os.path.exists(output_path(path, s, l, out_dir)) for s, l in targets)
+        (skipped if done else pending).append(path)
+    return pending, skipped
+
+
+def compose_10x15(cropped_bgr: np.ndarray) -> np.ndarray:
+    """Tek fotoğrafı üst boşluklu 10x15 cm sayfaya ortalayarak yerleştir."""
+    h, w = cropped_bgr.shape[:2]
+    aspect_ratio = w / h
+    available_width = TARGET_WIDTH_10x15
+    available_height = TARGET_HEIGHT_10x15 - TOP_MARGIN_10x15
+    target_aspect = available_width / available_height
+
+    if aspect_ratio > target_aspect:
+        new_height = available_height
+        new_width = int(new_height * aspect_ratio)
+        resized = cv2.resize(cropped_bgr, (new_width, new_height), interpolation=cv2.INTER_LANCZOS4)
+        start_crop_x = (resized.shape[1] - available_width) // 2
+        resized = resized[:, start_crop_x:start_crop_x + available_width]
+    else:
+        new_width = available_width
+        new_height = int(new_width / aspect_ratio)
+        resized = cv2.resize(cropped_bgr, (new_width, new_height), interpolation=cv2.INTER_LANCZOS4)
+        start_crop_y = (resized.shape[0] - available_height) // 2
+        resized = resized[start_crop_y:start_crop_y + available_height, :]
+
+    resized = cv2.resize(resized, (available_width, available_height), interpolation=cv2.INTER_LANCZOS4)
+
+    final_image = np.full((TARGET_HEIGHT_10x15, TARGET_WIDTH_10x15, 3), 255, dtype=np.uint8)
+    final_image[TOP_MARGIN_10x15:TOP_MARGIN_10x15 + available_height, 0:available_width] = resized
+    return final_image
+
+
+def render_page(selection: str, layout_choice: str, cropped_bgr: np.ndarray) -> Image.Image:
+    """Kırpılmış fotoğraftan seçilen tür ve yerleşimdeki sayfayı oluştur."""
+    if selection == "10x15":
+        return bgr_to_pil(compose_10x15(cropped_bgr))
+    if selection == "biyometrik":
+        if layout_choice == "4lu":
+            return build_image_layout(cropped_bgr)
+        return build_image_layout_2lu_biyometrik(cropped_bgr)
+    if layout_choice == "4lu":
+        return build_image_layout_vesikalik(cropped_bgr)
+    return build_image_layout_2lu_vesikalik(cropped_bgr)
+
+
+def spec_for(selection: str):
+    """Türün fotoğraf ölçüsü (10x15 sayfası vesikalık ölçüsünü kullanır)."""
+    return VESIKALIK if selection in ("vesikalik", "10x15") else BIYOMETRIK
+
+
+def configure_resolution(bg_remover, targets: Sequence[Target]) -> None:
+    """Matte üreten kaldırıcıda işlem boyutunu hedef formatlara göre seç (küçük baskıda daha küçük)."""
+    if hasattr(bg_remover, "set_resolution"):
+        bg_remover.set_resolution({spec_for(selection) for selection, _ in targets})
+
+
+@contextmanager
+def stage_timer(timings: Optional[Dict[str, float]], stage: str):
+    """timings verilirse bloğun süresini timings[stage]'e (saniye) ekle."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if timings is not None:
+            timings[stage] = timings.get(stage, 0.0) + time.perf_counter() - start
+
+
+def render_pages(image_bgr: np.ndarray, matte: Optional[np.ndarray],
+                 targets: Sequence[Target], retouch: bool = False,
+                 timings: Optional[Dict[str, float]] = None) -> Iterator[Tuple[Target, Image.Image]]:
+    """
+    Arkaplanı kaldırılmış bir fotoğraftan hedef sayfaları sırayla üret.
+
+    matte verilirse image_bgr orijinal görüntüdür; beyaza kompozit burada
+    yapılır ve baş üstü matte'den bulunur. matte None ise image_bgr zaten
+    kompozittir (API kaldırıcısı). timings verilirse aşama süreleri
+    (composite, face_analysis, render, layout, retouch) eklenir.
+    """
+    if matte is not None:
+        with stage_timer(timings, "composite"):
+            image_bgr = composite(image_bgr, matte)
+
+    # Yüz ve baş üstü tespiti tüm çıktılar için bir kez yapılır
+    with stage_timer(timings, "face_analysis"):
+        analysis = analyze_face(image_bgr, matte=matte)
+    canvases: Dict[str, np.ndarray] = {}
+    for selection, layout_choice in targets:
+        spec = spec_for(selection)
+        # Aynı format birden fazla çıktıda kullanılırsa tekrar ölçeklenmez
+        if spec.name not in canvases:
+            with stage_timer(timings, "render"):
+                canvases[spec.name] = render_photo(image_bgr, analysis, spec)
+        with stage_timer(timings, "layout"):
+            page = render_page(selection, layout_choice, canvases[spec.name])
+        if retouch:
+            with stage_timer(timings, "retouch"):
+                page = natural_enhance(page)
+        yield (selection, layout_choice), page
+
+
+def render_outputs(input_path: str, image_bgr: np.ndarray, matte: Optional[np.ndarray],
+                   targets: Sequence[Target], retouch: bool = False,
+                   out_dir: Optional[str] = None,
+                   timings: Optional[Dict[str, float]] = None) -> List[str]:
+    """
+    render_pages() ile tüm hedef çıktıları üret ve kaydet ("save" aşaması).
+
+    Returns:
+        Kaydedilen dosya yolları (targets sırasıyla)
+    """
+    produced = []
+    for (selection, layout_choice), page in render_pages(image_bgr, matte, targets, retouch, timings):
+        path = output_path(input_path, selection, layout_choice, out_dir)
+        with stage_timer(timings, "save"):
+            save_layout(page, path)
+        produced.append(path)
+    return produced
+
+
+def create_bg_remover(method: str = "local"):
+    """
+    'local': dışa aktarılmış ONNX modeli varsa ONNX Runtime, yoksa PyTorch;
+    'api': Replicate; 'auto': ikisi birlikte (HybridBGRemover).
+    Model kütüphaneleri yalnızca burada import edilir.
+    """
+    if method == "api":
+        from .modnet_bg import ModNetBGRemover
+        return ModNetBGRemover()
+    if method == "auto":
+        from .hybrid_bg import HybridBGRemover
+        return HybridBGRemover(create_bg_remover("local"), create_bg_remover("api"))
+    try:
+        from .modnet_onnx import ModNetOnnxBGRemover, find_onnx_model
+        if find_onnx_model() is not None:
+            return ModNetOnnxBGRemover()
+    except Exception as e:
+        print(f"[INFO] ModNet ONNX kullanilamiyor: {e}")
+    from .modnet_local import ModNetLocalBGRemover
+    return ModNetLocalBGRemover()
+
+
+def _init_worker() -> None:
+    # Süreçler paralel çalıştığından OpenCV'nin kendi iş parçacıkları kapatılır
+    cv2.setNumThreads(1)
+
+
+def _remove_backgrounds(bg_remover, paths: Sequence[str], max_batch: int):
+    """
+    Bir parça giriş için [(yol, görüntü, matte | None, istisna | None), ...].
+    Toplu çağrı başarısız olursa hatalı dosyayı ayırmak için tek tek denenir.
+    """
+    if hasattr(bg_remover, "remove_backgrounds"):
+        # Otomatik: görüntüler yerel model ile API arasında dağıtılır
+        return [(path, None, None, result) if isinstance(result, Exception) else (path, *result, None)
+                for path, result in zip(paths, bg_remover.remove_backgrounds(list(paths)))]
+
+    if hasattr(bg_remover, "remove_background_matte_batch"):
+        try:
+            results = bg_remover.remove_background_matte_batch(list(paths), max_batch=max_batch)
+            return [(path, image, matte, None) for path, (image, matte) in zip(paths, results)]
+        except Exception as e:
+            if len(paths) == 1:
+                return [(paths[0], None, None, e)]
+
+    if hasattr(bg_remover, "remove_background_images"):
+        # API: parçadaki görüntüler eşzamanlı tahmin olarak gönderilir
+        return [(path, None, None, result) if isinstance(result, Exception) else (path, result, None, None)
+                for path, result in zip(paths, bg_remover.remove_background_images(list(paths)))]
+
+    removed = []
+    for path in paths:
+        try:
+            if hasattr(bg_remover, "remove_background_matte"):
+                image, matte = bg_remover.remove_background_matte(path)
+            else:
+                image, matte = bg_remover.remove_background_image(path), None
+                if image is None:
+                    raise RuntimeError("Arkaplan kaldırılamadı")
+            removed.append((path, image, matte, None))
+        except Exception as e:
+            removed.append((path, None, None, e))
+    return removed
+
+
+def run_batch(
+    bg_remover,
+    paths: Sequence[str],
+    targets: Sequence[Target],
+    retouch: bool = False,
+    out_dir: Optional[str] = None,
+    workers: Optional[int] = None,
+    max_batch: int = MAX_BATCH,
+    skip_existing: bool = True,
+    callback: Optional[Callback] = None,
+) -> BatchResult:
+    """
+    Girişlerin tamamını işle.
+
+    Args:
+        bg_remover: Matte veren yerel kaldırıcı veya API kaldırıcısı
+        paths: Giriş dosyaları (collect_images ile toplanabilir)
+        targets: Her giriş için üretilecek [(tür, yerleşim), ...]
+        retouch: Doğal rötuş uygulansın mı
+        out_dir: Çıkış klasörü (None ise her girişin yanına)
+        workers: Süreç sayısı; 0 ise her şey bu süreçte yapılır
+        max_batch: Tek ileri geçişteki en fazla görüntü
+        skip_existing: Çıktıları zaten var olan girişleri atla
+        callback: callback("progress", metin, tamamlanan, toplam) ile ilerleme
+
+    Returns:
+        BatchResult (üretilen, atlanan, hatalı dosyalar)
+    """
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    if workers is None:
+        workers = default_workers()
+    configure_resolution(bg_remover, targets)
+
+    if skip_existing:
+        paths, skipped = pending_images(paths, targets, out_dir)
+    else:
+        paths, skipped = list(paths), []
+
+    produced: List[str] = []
+    failed: List[Tuple[str, str]] = []
+    completed = 0
+    total = len(paths)
+
+    def report(text: str) -> None:
+        print(text)
+        if callback:
+            callback("progress", text, completed, total)
+
+    def succeed(path: str, outputs: List[str]) -> None:
+        nonlocal completed
+        completed += 1
+        produced.extend(outputs)
+        report(f"✅ {os.path.basename(path)} ({completed}/{total})")
+
+    def fail(path: str, error: Exception) -> None:
+        nonlocal completed
+        completed += 1
+        failed.append((path, str(error)))
+        report(f"❌ {os.path.basename(path)}: {error}")
+
+    def collect(futures) -> None:
+        for future in futures:
+            path = running.pop(future)
+            try:
+                succeed(path, future.result())
+            except Exception as e:
+                fail(path, e)
+
+    if skipped:
+        print(f"⏭️ Çıktıları zaten var olan {len(skipped)} dosya atlandı")
+
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) if workers > 0 else None
+    running: Dict[Future, str] = {}
+    try:
+        # Eşzamanlı API istemcisinde parça, aynı anda çalışabilecek tahmin sayısı kadardır
+        chunk_size = max(max_batch, getattr(bg_remover, "concurrency", 0))
+        for start in range(0, total, chunk_size):
+            chunk = paths[start:start + chunk_size]
+            report(f"Arkaplan kaldırılıyor: {start + 1}-{start + len(chunk)} / {total}")
+            for path, image, matte, error in _remove_backgrounds(bg_remover, chunk, max_batch):
+                if error is not None:
+                    fail(path, error)
+                elif executor is None:
+                    try:
+                        succeed(path, render_outputs(path, image, matte, targets, retouch, out_dir))
+                    except Exception as e:
+                        fail(path, e)
+                else:
+                    running[executor.submit(render_outputs, path, image, matte, targets, retouch, out_dir)] = path
+                    # Bekleyen iş sınırı: en az biri bitene kadar yeni parça yüklenmez
+                    while len(running) >= workers * PENDING_PER_WORKER:
+                        collect(wait(running, return_when=FIRST_COMPLETED)[0])
+
+        while running:
+            collect(wait(running, return_when=FIRST_COMPLETED)[0])
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    print(f"[OK] Toplu işlem bitti: {total - len(failed)} başarılı, {len(failed)} hatalı, {len(skipped)} atlandı")
+    return BatchResult(produced=produced, skipped=skipped, failed=failed)
@@ -1,5 +1,6 @@
 from PIL import Image, ImageDraw
 import numpy as np
+import io
 import os
 
 def _to_pil_image(image_input: "Image.Image | np.ndarray | str") -> Image.Image:
@@ -26,7 +27,26 @@ def _to_pil_image(image_input: "Image.Image | np.ndarray | str") -> Image.Image:
     
     raise TypeError(f"Desteklenmeyen görüntü tipi: {type(image_input)}")
 
-def create_image_layout(image_input, output_path="layout_10x15_biyometrik.jpg"):
+LAYOUT_DPI = 300
+
+def save_layout(page: Image.Image, output_path: str, dpi: int = LAYOUT_DPI) -> None:
+    """Sayfayı tek seferde, maksimum kalitede JPEG olarak kaydeder."""
+    try:
+        page.save(output_path, 'JPEG', quality=100, subsampling=0, dpi=(dpi, dpi), optimize=True)
+        # Dosyanın başarıyla oluşturulduğunu kontrol et
+        if not os.path.exists(output_path):
+            raise RuntimeError(f"Dosya kaydedilemedi: {output_path}")
+    except Exception as e:
+        raise RuntimeError(f"Dosya kaydetme hatası: {str(e)}")
+
+def encode_layout(page: Image.Image, dpi: int = LAYOUT_DPI) -> bytes:
+    """Sayfayı save_layout ile aynı ayarlarla bellekte JPEG'e çevirir."""
+    buffer = io.BytesIO()
+    page.save(buffer, 'JPEG', quality=100, subsampling=0, dpi=(dpi, dpi), optimize=True)
+    return buffer.getvalue()
+
+def build_image_layout(image_input) -> Image.Image:
+    """4'lü biyometrik (10x15 cm) sayfasını bellekte oluşturur (RGB PIL görüntüsü)."""
     dpi = 300
     cm_to_px = lambda cm: int(round(cm * dpi / 2.54))
     page_width_px = cm_to_px(10.0)
@@ -59,15 +79,10 @@ def create_image_layout(image_input, output_path="layout_10x15_biyometrik.jpg"):
     center_y = page_height_px // 2
     draw.line([(0, center_y), (page_width_px, center_y)], fill=(0,0,0), width=2)
     
-    try:
-        page.save(output_path, 'JPEG', quality=100, subsampling=0, dpi=(dpi, dpi), optimize=True)
-        # Dosyanın başarıyla oluşturulduğunu kontrol et
-        if not os.path.exists(output_path):
-            raise RuntimeError(f"Dosya kaydedilemedi: {output_path}")
-    except Exception as e:
-        raise RuntimeError(f"Dosya kaydetme hatası: {str(e)}")
+    return page
 
-def create_image_layout_vesikalik(image_input, output_path="layout_10x15_vesikalik.jpg"):
+def build_image_layout_vesikalik(image_input) -> Image.Image:
+    """4'lü vesikalık (10x15 cm) sayfasını bellekte oluşturur (RGB PIL görüntüsü)."""
     dpi = 300
     cm_to_px = lambda cm: int(round(cm * dpi / 2.54))
     page_width_cm = 10.0
@@ -112,15 +127,10 @@ def create_image_layout_vesikalik(image_input, output_path="layout_10x15_vesikal
         page.paste(source_image, (x, y))
         rect = (x, y, x + image_width_px - 1, y + image_height_px - 1)
         draw.rectangle(rect, outline=frame_color, width=frame_width)
-    try:
-        page.save(output_path, 'JPEG', quality=100, subsampling=0, dpi=(dpi, dpi), optimize=True)
-        # Dosyanın başarıyla oluşturulduğunu kontrol et
-        if not os.path.exists(output_path):
-            raise RuntimeError(f"Dosya kaydedilemedi: {output_path}")
-    except Exception as e:
-        raise RuntimeError(f"Dosya kaydetme hatası: {str(e)}")
+    return page
 
-def create_image_layout_2lu_biyometrik(image_input, output_path="layout_5x15_biyometrik.jpg"):
+def build_image_layout_2lu_biyometrik(image_input) -> Image.Image:
+    """2'li biyometrik (5x15 cm) sayfasını bellekte oluşturur (RGB PIL görüntüsü)."""
     dpi = 300
     cm_to_px = lambda cm: int(round(cm * dpi / 2.54))
     page_width_px = cm_to_px(5.0)
@@ -145,15 +155,10 @@ def create_image_layout_2lu_biyometrik(image_input, output_path="layout_5x15_biy
         # Kesim çizgileri: her fotoğrafın etrafına çerçeve
         rect = (x, y, x + image_width_px - 1, y + image_height_px - 1)
         draw.rectangle(rect, outline=frame_color, width=frame_width)
-    try:
-        page.save(output_path, 'JPEG', quality=100, subsampling=0, dpi=(dpi, dpi), optimize=True)
-        # Dosyanın başarıyla oluşturulduğunu kontrol et
-        if not os.path.exists(output_path):
-            raise RuntimeError(f"Dosya kaydedilemedi: {output_path}")
-    except Exception as e:
-        raise RuntimeError(f"Dosya kaydetme hatası: {str(e)}")
+    return page
 
-def create_image_layout_2lu_vesikalik(image_input, output_path="layout_5x15_vesikalik.jpg"):
+def build_image_layout_2lu_vesikalik(image_input) -> Image.Image:
+    """2'li vesikalık (5x15 cm) sayfasını bellekte oluşturur (RGB PIL görüntüsü)."""
     dpi = 300
     cm_to_px = lambda cm: int(round(cm * dpi / 2.54))
     page_width_px = cm_to_px(5.0)
@@ -178,12 +183,18 @@ def create_image_layout_2lu_vesikalik(image_input, output_path="layout_5x15_vesi
         page.paste(source_image, (x, y))
         rect = (x, y, x + image_width_px - 1, y + image_height_px - 1)
         draw.rectangle(rect, outline=frame_color, width=frame_width)
-    try:
-        page.save(output_path, 'JPEG', quality=100, subsampling=0, dpi=(dpi, dpi), optimize=True)
-        # Dosyanın başarıyla oluşturulduğunu kontrol et
-        if not os.path.exists(output_path):
-            raise RuntimeError(f"Dosya kaydedilemedi: {output_path}")
-    except Exception as e:
-        raise RuntimeError(f"Dosya kaydetme hatası: {str(e)}")
+    return page
+
+# Dosya tabanlı uyumluluk sarmalayıcıları
 
+def create_image_layout(image_input, output_path="layout_10x15_biyometrik.jpg"):
+    save_layout(build_image_layout(image_input), output_path)
+
+def create_image_layout_vesikalik(image_input, output_path="layout_10x15_vesikalik.jpg"):
+    save_layout(build_image_layout_vesikalik(image_input), output_path)
 
+def create_image_layout_2lu_biyometrik(image_input, output_path="layout_5x15_biyometrik.jpg"):
+    save_layout(build_image_layout_2lu_biyometrik(image_input), output_path)
+
+def create_image_layout_2lu_vesikalik(image_input, output_path="layout_5x15_vesikalik.jpg"):
+    save_layout(build_image_layout_2lu_vesikalik(image_input), output_path)
@@ -3,6 +3,50 @@ import numpy as np
 from PIL import Image, ImageEnhance, ImageFilter
 import os
 
+def auto_enhance(image: Image.Image, contrast_factor: float = 1.05, brightness_factor: float = 1.02,
+                 sharpness_radius: float = 0.5, sharpness_amount: float = 0.3) -> Image.Image:
+    """
+    Bellekteki görüntüye kontrast, parlaklık ve netlik ayarı uygular (diske yazmaz).
+    
+    Args:
+        image (Image.Image): PIL görüntüsü (RGBA ise beyaz arkaplanla birleştirilir).
+        contrast_factor, brightness_factor, sharpness_radius, sharpness_amount:
+            auto_enhance_image ile aynı anlamda.
+    
+    Returns:
+        Image.Image: İşlenmiş RGB görüntü.
+    """
+    # RGB formatına çevir (RGBA ise beyaz arkaplanla birleştir)
+    if image.mode == 'RGBA':
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.split()[-1])
+        image = background
+    elif image.mode != 'RGB':
+        image = image.convert('RGB')
+
+    print("Görüntüye doğal rötuş uygulanıyor...")
+
+    # 1. Hafif parlaklık ayarı (çok yumuşak)
+    print(f"Parlaklık hafifçe artırılıyor (Faktör: {brightness_factor})...")
+    brightness_enhancer = ImageEnhance.Brightness(image)
+    image = brightness_enhancer.enhance(brightness_factor)
+    
+    # 2. Hafif kontrast ayarı (doğal görünüm için)
+    print(f"Kontrast hafifçe artırılıyor (Faktör: {contrast_factor})...")
+    contrast_enhancer = ImageEnhance.Contrast(image)
+    image = contrast_enhancer.enhance(contrast_factor)
+    
+    # 3. Çok hafif netlik ayarı (yapay görünümü önlemek için)
+    print(f"Netlik çok hafifçe uygulanıyor (Yarıçap: {sharpness_radius}, Miktar: {sharpness_amount})...")
+    image = apply_unsharp_mask(image, radius=sharpness_radius, amount=sharpness_amount)
+    
+    # 4. Renk doygunluğunu hafifçe artır (daha canlı ama doğal)
+    print("Renk doygunluğu hafifçe artırılıyor...")
+    color_enhancer = ImageEnhance.Color(image)
+    image = color_enhancer.enhance(1.05)  # Çok hafif renk artırma
+    
+    return image
+
 def auto_enhance_image(input_path: str, output_path: str = None, 
                        contrast_factor: float = 1.05, brightness_factor: float = 1.02, 
                        sharpness_radius: float = 0.5, sharpness_amount: float = 0.3) -> str:
@@ -25,34 +69,13 @@ def auto_enhance_image(input_path: str, output_path: str = None,
         # Görüntüyü PIL ile aç
         image = Image.open(input_path)
         
-        # RGB formatına çevir (RGBA ise beyaz arkaplanla birleştir)
-        if image.mode == 'RGBA':
-            background = Image.new('RGB', image.size, (255, 255, 255))
-            background.paste(image, mask=image.split()[-1])
-            image = background
-        elif image.mode != 'RGB':
-            image = image.convert('RGB')
-
-        print("Görüntüye doğal rötuş uygulanıyor...")
-
-        # 1. Hafif parlaklık ayarı (çok yumuşak)
-        print(f"Parlaklık hafifçe artırılıyor (Faktör: {brightness_factor})...")
-        brightness_enhancer = ImageEnhance.Brightness(image)
-        image = brightness_enhancer.enhance(brightness_factor)
-        
-        # 2. Hafif kontrast ayarı (doğal görünüm için)
-        print(f"Kontrast hafifçe artırılıyor (Faktör: {contrast_factor})...")
-        contrast_enhancer = ImageEnhance.Contrast(image)
-        image = contrast_enhancer.enhance(contrast_factor)
-        
-        # 3. Çok hafif netlik ayarı (yapay görünümü önlemek için)
-        print(f"Netlik çok hafifçe uygulanıyor (Yarıçap: {sharpness_radius}, Miktar: {sharpness_amount})...")
-        image = apply_unsharp_mask(image, radius=sharpness_radius, amount=sharpness_amount)
-        
-        # 4. Renk doygunluğunu hafifçe artır (daha canlı ama doğal)
-        print("Renk doygunluğu hafifçe artırılıyor...")
-        color_enhancer = ImageEnhance.Color(image)
-        image = color_enhancer.enhance(1.05)  # Çok hafif renk artırma
+        image = auto_enhance(
+            image,
+            contrast_factor=contrast_factor,
+            brightness_factor=brightness_factor,
+            sharpness_radius=sharpness_radius,
+            sharpness_amount=sharpness_amount
+        )
         
         # Çıkış yolu belirle
         if output_path is None:
@@ -86,6 +109,22 @@ def enhance_image(input_path: str, output_path: str = None, contrast_factor: flo
         sharpness_amount=sharpness_factor
     )
 
+# Kimlik fotoğrafları için minimal rötuş parametreleri
+NATURAL_ENHANCE_PARAMS = dict(
+    contrast_factor=1.03,      # Çok hafif kontrast
+    brightness_factor=1.01,    # Çok hafif parlaklık
+    sharpness_radius=0.3,      # Çok yumuşak netlik
+    sharpness_amount=0.2       # Minimal netlik artırma
+)
+
+def natural_enhance(image: Image.Image) -> Image.Image:
+    """natural_enhance_image'in bellek içi sürümü: PIL görüntüsü alır ve döndürür."""
+    try:
+        return auto_enhance(image, **NATURAL_ENHANCE_PARAMS)
+    except Exception as e:
+        print(f"Görüntü otomatik iyileştirme hatası: {e}")
+        return image
+
 def natural_enhance_image(input_path: str, output_path: str = None) -> str:
     """
     Çok doğal ve profesyonel rötuş için özel fonksiyon.
@@ -101,10 +140,7 @@ def natural_enhance_image(input_path: str, output_path: str = None) -> str:
     return auto_enhance_image(
         input_path=input_path,
         output_path=output_path,
-        contrast_factor=1.03,      # Çok hafif kontrast
-        brightness_factor=1.01,    # Çok hafif parlaklık
-        sharpness_radius=0.3,      # Çok yumuşak netlik
-        sharpness_amount=0.2       # Minimal netlik artırma
+        **NATURAL_ENHANCE_PARAMS
     )
 
 def apply_unsharp_mask(image: Image.Image, radius: float = 1.0, amount: float = 0.5) -> Image.Image:
@@ -0,0 +1,166 @@
+import os
+import threading
+
+import cv2
+import numpy as np
+
+FRONTAL_FACE_CASCADE = 'haarcascade_frontalface_default.xml'
+
+# Long edge of the proxy image used by detect_faces_proxy
+PROXY_MAX_SIDE = 1024
+# Padding around a back-projected box, as a fraction of its size
+REFINE_PAD = 0.25
+# Size range searched at full resolution around a back-projected box
+REFINE_MIN_RATIO = 0.8
+REFINE_MAX_RATIO = 1.25
+
+# filename -> resolved XML path, probed once per process
+_cascade_paths = {}
+_registry_lock = threading.Lock()
+# Per-thread classifiers (filename -> CascadeClassifier). detectMultiScale
+# keeps scratch buffers in the classifier, so threads never share one.
+_local = threading.local()
+
+def _candidate_paths(filename):
+    """Paths probed for a cascade file, in priority order."""
+    candidate_paths = []
+    # 1) OpenCV'nin kendi haarcascades dizini
+    try:
+        candidate_paths.append(os.path.join(cv2.data.haarcascades, filename))
+    except Exception:
+        pass
+    # 2) Proje kökü (dosya yapısına göre bir üst klasör)
+    repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    candidate_paths.append(os.path.join(repo_root, filename))
+    # 3) Çalışma dizini
+    candidate_paths.append(os.path.join(os.getcwd(), filename))
+    return candidate_paths
+
+def _resolve_cascade(filename):
+    """Haar cascade dosyasının yolunu bul (ilk yüklenebilen aday)."""
+    candidate_paths = _candidate_paths(filename)
+
+    last_err = None
+    for p in candidate_paths:
+        try:
+            if os.path.exists(p):
+                cascade = cv2.CascadeClassifier(p)
+                if not cascade.empty():
+                    print(f"Using face cascade: {p}")
+                    return p, cascade
+        except Exception as e:
+            last_err = e
+            continue
+
+    raise RuntimeError(f"Yüz algılama modeli yüklenemedi. Denenen yollar: {candidate_paths}. Hata: {last_err}")
+
+def get_face_cascade(filename=FRONTAL_FACE_CASCADE):
+    """Return the calling thread's CascadeClassifier for `filename`.
+
+    The cascade path is probed once per process; each thread parses its
+    own classifier on first use and keeps it, so detections from worker
+    threads, the processing server and the hybrid scheduler run in
+    parallel without a lock.
+    """
+    cascades = getattr(_local, 'cascades', None)
+    if cascades is None:
+        cascades = _local.cascades = {}
+    cascade = cascades.get(filename)
+    if cascade is None:
+        path = _cascade_paths.get(filename)
+        if path is None:
+            with _registry_lock:
+                path = _cascade_paths.get(filename)
+                if path is None:
+                    path, cascade = _resolve_cascade(filename)
+                    _cascade_paths[filename] = path
+        if cascade is None:
+            cascade = cv2.CascadeClassifier(path)
+        cascades[filename] = cascade
+    return cascade
+
+def warm_face_cascades(filenames=(FRONTAL_FACE_CASCADE,)):
+    """Resolve the given cascades ahead of the first detection (called at startup).
+
+    Probing and the calling thread's parse happen here; any other thread
+    only parses its own copy (~25 ms) on its first detection.
+    """
+    for filename in filenames:
+        get_face_cascade(filename)
+
+def detect_faces(gray, scaleFactor=1.1, minNeighbors=5, minSize=(100, 100), filename=FRONTAL_FACE_CASCADE, **kwargs):
+    """detectMultiScale on the calling thread's cascade."""
+    return get_face_cascade(filename).detectMultiScale(
+        gray, scaleFactor=scaleFactor, minNeighbors=minNeighbors, minSize=minSize, **kwargs)
+
+def _iou(a, b):
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    iw = max(0, min(ax + aw, bx + bw) - max(ax, bx))
+    ih = max(0, min(ay + ah, by + bh) - max(ay, by))
+    inter = iw * ih
+    union = aw * ah + bw * bh - inter
+    return inter / union if union > 0 else 0.0
+
+def _refine_face(gray, box, scaleFactor, minNeighbors, minSize, filename):
+    """Re-run the cascade at full resolution in a small ROI around `box`."""
+    x, y, w, h = box
+    pad_x, pad_y = int(w * REFINE_PAD), int(h * REFINE_PAD)
+    x1, y1 = max(0, x - pad_x), max(0, y - pad_y)
+    x2, y2 = min(gray.shape[1], x + w + pad_x), min(gray.shape[0], y + h + pad_y)
+
+    min_side = max(minSize[0], int(min(w, h) * REFINE_MIN_RATIO))
+    max_side = int(max(w, h) * REFINE_MAX_RATIO) + 1
+    if min_side > min(x2 - x1, y2 - y1):
+        return box
+
+    found = detect_faces(gray[y1:y2, x1:x2], scaleFactor=scaleFactor, minNeighbors=minNeighbors,
+                         minSize=(min_side, min_side), maxSize=(max_side, max_side), filename=filename)
+    if len(found) == 0:
+        return box
+
+    best = max(((fx + x1, fy + y1, fw, fh) for fx, fy, fw, fh in found), key=lambda f: _iou(f, box))
+    return best if _iou(best, box) > 0 else box
+
+def detect_faces_proxy(gray, max_side=PROXY_MAX_SIDE, scaleFactor=1.1, minNeighbors=5, minSize=(100, 100), filename=FRONTAL_FACE_CASCADE):
+    """Face detection on a downscaled proxy with full-resolution refinement.
+
+    The cascade scans a copy of `gray` whose long edge is `max_side` px,
+    each hit is mapped back to full resolution and re-detected in a padded
+    ROI there, so boxes keep full-resolution precision while the pyramid
+    only covers the proxy. Images already within `max_side` (or
+    max_side=None) use the plain full-resolution path. If the proxy finds
+    nothing the full-resolution path is tried before giving up.
+
+    The proxy is never made so small that `minSize` maps below the
+    cascade's base window (24 px for the frontal cascade): faces near
+    `minSize` would be invisible on it. In that case the proxy is enlarged
+    until `minSize` covers the window, or skipped when that would reach
+    full resolution anyway.
+
+    Returns boxes in the same (N, 4) int layout as detectMultiScale.
+    """
+    height, width = gray.shape[:2]
+    if not max_side or max(height, width) <= max_side:
+        return detect_faces(gray, scaleFactor=scaleFactor, minNeighbors=minNeighbors, minSize=minSize, filename=filename)
+
+    scale = max_side / float(max(height, width))
+    window = get_face_cascade(filename).getOriginalWindowSize()
+    scale = max(scale, window[0] / float(minSize[0]), window[1] / float(minSize[1]))
+    if scale >= 1.0:
+        return detect_faces(gray, scaleFactor=scaleFactor, minNeighbors=minNeighbors, minSize=minSize, filename=filename)
+
+    proxy = cv2.resize(gray, (max(1, int(round(width * scale))), max(1, int(round(height * scale)))),
+                       interpolation=cv2.INTER_AREA)
+    proxy_min = (max(1, int(round(minSize[0] * scale))), max(1, int(round(minSize[1] * scale))))
+    proxy_faces = detect_faces(proxy, scaleFactor=scaleFactor, minNeighbors=minNeighbors, minSize=proxy_min, filename=filename)
+
+    if len(proxy_faces) == 0:
+        print("Proxy face detection found nothing, retrying at full resolution")
+        return detect_faces(gray, scaleFactor=scaleFactor, minNeighbors=minNeighbors, minSize=minSize, filename=filename)
+
+    faces = []
+    for px, py, pw, ph in proxy_faces:
+        box = (int(px / scale), int(py / scale), int(round(pw / scale)), int(round(ph / scale)))
+        faces.append(_refine_face(gray, box, scaleFactor, minNeighbors, minSize, filename))
+    return np.array(faces, dtype=np.int32)
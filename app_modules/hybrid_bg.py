@@ -0,0 +1,215 @@
+"""
+Yerel model ile API'yi birlikte kullanan arkaplan kaldırma dağıtıcısı.
+
+Her arka uç için canlı gecikme tahmini (üstel ağırlıklı hareketli
+ortalama) tutulur. Sıradaki her görüntü, o anki kuyruk ve tahminlere göre
+en erken bitireceği tahmin edilen arka uca gönderilir: yerel kuyruk
+(remove_background_matte_batch ile toplu işlenir) veya API (submit() ile
+eşzamanlı tahminler). API'nin henüz ölçümü yoksa yerel kuyruk doluyken tek
+bir görüntüyle yoklanır. API'de hata olursa görüntü otomatik olarak yerel
+kuyruğa aktarılır; art arda hatalarda API o iş için devre dışı kalır.
+
+Sonuçlar (görüntü BGR, matte | None) biçimindedir: yerelde işlenen
+görüntünün matte'si vardır, API'den gelen zaten kompozittir (matte None).
+"""
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .matting import MAX_BATCH
+
+# Başlangıç gecikme tahminleri (saniye); ilk sonuçlarla hızla güncellenir
+INITIAL_LOCAL_LATENCY_S = 3.0
+INITIAL_API_LATENCY_S = 90.0
+# Hareketli ortalamada yeni ölçümün ağırlığı
+EWMA_ALPHA = 0.3
+# Bu kadar art arda API hatasından sonra API o iş için kullanılmaz
+API_FAILURE_LIMIT = 3
+
+Result = Union[Tuple[np.ndarray, Optional[np.ndarray]], Exception]
+
+
+class LatencyEstimate:
+    """Bir arka ucun görüntü başına gecikme tahmini (EWMA)."""
+
+    def __init__(self, initial: float, alpha: float = EWMA_ALPHA):
+        self.value = initial
+        self.alpha = alpha
+        self.samples = 0
+
+    def update(self, seconds: float) -> None:
+        # İlk ölçüm başlangıç tahmininin yerine geçer
+        self.value = seconds if self.samples == 0 else self.alpha * seconds + (1 - self.alpha) * self.value
+        self.samples += 1
+
+
+class HybridBGRemover:
+    """
+    bg_removers["local"] ve bg_removers["api"] üzerinde dağıtıcı.
+    remove_backgrounds() toplu işte iki arka ucu aynı anda kullanır.
+    """
+
+    label = "Otomatik (Yerel + API)"
+
+    def __init__(self, local, api, max_batch: int = MAX_BATCH):
+        self.local = local
+        self.api = api
+        self.max_batch = max_batch
+        self.local_latency = LatencyEstimate(INITIAL_LOCAL_LATENCY_S)
+        self.api_latency = LatencyEstimate(INITIAL_API_LATENCY_S)
+        # submit() olmayan API istemcileri (ör. işlem sunucusu) iş parçacığı havuzunda çalışır
+        self.api_concurrency = getattr(api, "concurrency", 1)
+        self._api_pool = None if hasattr(api, "submit") else ThreadPoolExecutor(self.api_concurrency)
+        # run_batch parça boyutu: API yuvaları + yerel kuyruk
+        self.concurrency = self.api_concurrency + 2 * max_batch
+
+    def set_resolution(self, specs=None, budget_s=None) -> Optional[int]:
+        """Yerel modelin işlem boyutunu seç (MattingBGRemover.set_resolution)."""
+        if hasattr(self.local, "set_resolution"):
+            return self.local.set_resolution(specs, budget_s)
+        return None
+
+    def _submit_api(self, image_input, bg) -> Future:
+        if self._api_pool is None:
+            return self.api.submit(image_input, bg)
+        if hasattr(self.api, "remove_background_matte"):
+            return self._api_pool.submit(self.api.remove_background_matte, image_input)
+        return self._api_pool.submit(self.api.remove_background_image, image_input, bg)
+
+    def _eta(self, local_pending: int, api_inflight: int, api_enabled: bool) -> Tuple[float, float]:
+        """(yerel, API) için yeni bir görüntünün tahmini bitiş süresi."""
+        local_eta = (local_pending + 1) * self.local_latency.value
+        if not api_enabled:
+            return local_eta, float("inf")
+        api_eta = (1 + api_inflight // self.api_concurrency) * self.api_latency.value
+        return local_eta, api_eta
+
+    def remove_backgrounds(
+        self,
+        inputs: Sequence,
+        bg: Tuple[int, int, int] = (255, 255, 255),
+        on_result: Optional[Callable[[int, Result], None]] = None
+    ) -> List[Result]:
+        """
+        Girişleri iki arka uca dağıtarak işle.
+
+        Returns:
+            Girdi sırasıyla (görüntü BGR, matte | None) veya istisna
+        """
+        results: List[Optional[Result]] = [None] * len(inputs)
+        pending = list(range(len(inputs)))      # henüz atanmamış
+        local_queue: List[int] = []             # yerel kuyrukta bekleyen
+        api_futures = {}                        # Future -> (index, başlangıç)
+        events: List[Tuple[str, object]] = []   # tamamlanan işler
+        condition = threading.Condition()
+        state = {"local_busy": 0, "api_failures": 0}
+        local_only = set()                      # API'de başarısız olup yerele aktarılanlar
+
+        def finish(index: int, result: Result) -> None:
+            results[index] = result
+            if on_result:
+                on_result(index, result)
+
+        def local_worker() -> None:
+            while True:
+                with condition:
+                    while not local_queue and (pending or api_futures or state["local_busy"]):
+                        condition.wait()
+                    if not local_queue:
+                        return
+                    chunk = local_queue[:self.max_batch]
+                    del local_queue[:len(chunk)]
+                    state["local_busy"] = len(chunk)
+                start = time.perf_counter()
+                try:
+                    outputs = self.local.remove_background_matte_batch([inputs[i] for i in chunk], self.max_batch)
+                    chunk_results = list(outputs)
+                except Exception:
+                    # Hatalı görüntüyü ayırmak için tek tek dene
+                    chunk_results = []
+                    for i in chunk:
+                        try:
+                            chunk_results.append(self.local.remove_background_matte(inputs[i]))
+                        except Exception as e:
+                            chunk_results.append(e)
+                elapsed = time.perf_counter() - start
+                with condition:
+                    self.local_latency.update(elapsed / len(chunk))
+                    state["local_busy"] = 0
+                    events.extend(("local", (i, r)) for i, r in zip(chunk, chunk_results))
+                    condition.notify_all()
+
+        def api_done(future: Future) -> None:
+            with condition:
+                events.append(("api", future))
+                condition.notify_all()
+
+        worker = threading.Thread(target=local_worker, name="HybridLocal", daemon=True)
+        worker.start()
+
+        with condition:
+            while pending or local_queue or api_futures or state["local_busy"] or events:
+                # Tamamlananları işle, tahminleri güncelle
+                while events:
+                    kind, payload = events.pop(0)
+                    if kind == "local":
+                        index, result = payload
+                        finish(index, result)
+                        continue
+                    index, start = api_futures.pop(payload)
+                    try:
+                        output = payload.result()
+                        self.api_latency.update(time.monotonic() - start)
+                        state["api_failures"] = 0
+                        finish(index, output if isinstance(output, tuple) else (output, None))
+                    except Exception as e:
+                        state["api_failures"] += 1
+                        print(f"⚠️ API hatası, yerel modele aktarılıyor: {e}")
+                        local_only.add(index)
+                        pending.insert(0, index)
+
+                # Atanmamış görüntüleri en erken bitirecek arka uca ver
+                api_enabled = state["api_failures"] < API_FAILURE_LIMIT
+                while pending:
+                    local_pending = len(local_queue) + state["local_busy"]
+                    local_eta, api_eta = self._eta(local_pending, len(api_futures), api_enabled)
+                    index = pending[0]
+                    # API'nin henüz ölçümü yoksa yerel kuyruk doluyken bir görüntüyle yoklanır
+                    probe = (api_enabled and self.api_latency.samples == 0 and not api_futures
+                             and local_pending > 0)
+                    if (api_eta < local_eta or probe) and index not in local_only:
+                        pending.pop(0)
+                        future = self._submit_api(inputs[index], bg)
+                        api_futures[future] = (index, time.monotonic())
+                        future.add_done_callback(api_done)
+                    elif len(local_queue) < 2 * self.max_batch:
+                        # Yerel kuyruk kısa tutulur, böylece kararlar güncel tahminlerle verilir
+                        local_queue.append(pending.pop(0))
+                        condition.notify_all()
+                    else:
+                        break
+
+                if pending or local_queue or api_futures or state["local_busy"]:
+                    if not events:
+                        condition.wait()
+            condition.notify_all()
+
+        worker.join()
+        local_count = sum(1 for r in results if isinstance(r, tuple) and r[1] is not None)
+        print(f"[OK] Otomatik dağıtım: {local_count} yerel, {len(inputs) - local_count} API/hata "
+              f"(tahmini gecikme yerel {self.local_latency.value:.1f} s, API {self.api_latency.value:.1f} s)")
+        return results
+
+    def remove_background_image(self, image_input, bg: Tuple[int, int, int] = (255, 255, 255)) -> np.ndarray:
+        """Tek görüntü: tahmini en hızlı arka uç (API hatasında yerel)."""
+        from .image_io import composite
+
+        result = self.remove_backgrounds([image_input], bg)[0]
+        if isinstance(result, Exception):
+            raise result
+        image, matte = result
+        return image if matte is None else composite(image, matte, bg)
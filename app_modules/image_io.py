@@ -0,0 +1,66 @@
+"""
+Aşamalar arası bellek içi görüntü dönüşümleri.
+
+Boru hattında diziler OpenCV düzeninde (BGR, uint8) taşınır; PIL kullanan
+aşamalar bu yardımcılarla dönüşüm yapar, diske yalnızca son çıktı yazılır.
+"""
+
+import os
+
+import numpy as np
+from PIL import Image
+
+
+def bgr_to_pil(image_bgr: np.ndarray) -> Image.Image:
+    """BGR (veya gri) diziyi RGB PIL görüntüsüne çevir."""
+    if image_bgr.ndim == 3 and image_bgr.shape[2] == 3:
+        return Image.fromarray(np.ascontiguousarray(image_bgr[:, :, ::-1]))
+    return Image.fromarray(image_bgr)
+
+
+def pil_to_bgr(image: Image.Image) -> np.ndarray:
+    """PIL görüntüsünü BGR uint8 diziye çevir."""
+    rgb = np.asarray(image.convert('RGB'))
+    return np.ascontiguousarray(rgb[:, :, ::-1])
+
+
+def load_rgb(image_input: "str | np.ndarray | Image.Image") -> Image.Image:
+    """Dosya yolu, BGR dizi veya PIL görüntüsünü RGB PIL görüntüsü olarak döndür."""
+    if isinstance(image_input, Image.Image):
+        return image_input.convert('RGB')
+    if isinstance(image_input, np.ndarray):
+        if image_input.size == 0:
+            raise ValueError("Boş görüntü dizisi")
+        return bgr_to_pil(image_input).convert('RGB')
+    if isinstance(image_input, str):
+        if not os.path.exists(image_input):
+            raise RuntimeError(f"Giriş dosyası bulunamadı: {image_input}")
+        with Image.open(image_input) as img:
+            return img.convert('RGB')
+    raise TypeError(f"Desteklenmeyen görüntü tipi: {type(image_input)}")
+
+
+def jpg_output_path(input_path: str, output_path: "str | None", suffix: str) -> str:
+    """Çıkış yolu verilmediyse '<girdi><suffix>.jpg' üret; .png verilse bile .jpg'e zorla."""
+    if output_path is None:
+        base, _ = os.path.splitext(input_path)
+        output_path = f"{base}{suffix}.jpg"
+    if output_path.lower().endswith('.png'):
+        output_path = output_path[:-4] + '.jpg'
+    return output_path
+
+
+def composite(image_bgr: np.ndarray, matte: np.ndarray, bg: "tuple[int, int, int]" = (255, 255, 255)) -> np.ndarray:
+    """
+    Görüntüyü matte ile düz renkli arkaplana karıştır (BGR, uint8 döner).
+
+    matte uint8 (0-255) veya float (0-1) olabilir. bg (R, G, B) sırasındadır;
+    /255 bölmesi PIL paste ile aynı tamsayı yuvarlamasıyla yapılır, böylece
+    sonuç eski RGBA + paste yoluyla piksel piksel aynıdır.
+    """
+    if matte.dtype != np.uint8:
+        matte = np.clip(matte * 255.0 + 0.5, 0, 255).astype(np.uint8)
+    alpha = matte.astype(np.uint16)[:, :, None]
+    background = np.array(bg[::-1], dtype=np.uint16)
+    blended = image_bgr.astype(np.uint16) * alpha + background * (255 - alpha) + 128
+    return ((blended + (blended >> 8)) >> 8).astype(np.uint8)
@@ -0,0 +1,184 @@
+"""
+Arkaplan kaldırma sonuçları için içerik adresli disk önbelleği.
+
+Anahtar, giriş görüntüsünün içeriği (dosya baytları veya piksel verisi) ile
+modelin kimliğinden türetilir; aynı fotoğraf farklı bir yerleşim veya
+rötuş ayarıyla tekrar işlendiğinde model çağrılmaz. Her kayıt bir veri
+dosyası (yerel modelde PNG matte, Replicate'te dönen PNG) ve bir JSON
+meta dosyasıdır. Toplam boyut sınırı aşılınca en uzun süredir
+kullanılmayan kayıtlar silinir (kullanımda dosya zamanı güncellenir).
+
+Ayarlar ortam değişkenleriyle değiştirilebilir:
+    BIYOVES_MATTE_CACHE_DIR   önbellek klasörü (varsayılan: AppData/BiyoVes/matte_cache)
+    BIYOVES_MATTE_CACHE_MB    boyut sınırı, MB (0 önbelleği kapatır)
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+import cv2
+import numpy as np
+from PIL import Image
+
+CACHE_DIR_ENV = "BIYOVES_MATTE_CACHE_DIR"
+CACHE_SIZE_ENV = "BIYOVES_MATTE_CACHE_MB"
+DEFAULT_MAX_MB = 256
+# Sınır aşıldığında bu orana inene kadar silinir (her kayıtta tarama yapılmasın)
+EVICT_TO_RATIO = 0.9
+
+
+def input_digest(image_input: "str | np.ndarray | Image.Image") -> str:
+    """Girişin içerik özeti: dosya baytları, dizi veya PIL pikselleri (sha256)."""
+    digest = hashlib.sha256()
+    if isinstance(image_input, str):
+        with open(image_input, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+    if isinstance(image_input, Image.Image):
+        digest.update(f"pil:{image_input.mode}:{image_input.size}".encode())
+        digest.update(image_input.tobytes())
+        return digest.hexdigest()
+    if isinstance(image_input, np.ndarray):
+        digest.update(f"array:{image_input.dtype}:{image_input.shape}".encode())
+        digest.update(np.ascontiguousarray(image_input).data)
+        return digest.hexdigest()
+    raise TypeError(f"Desteklenmeyen görüntü tipi: {type(image_input)}")
+
+
+def encode_matte(matte: np.ndarray) -> bytes:
+    """uint8 matte'yi kayıpsız PNG'ye çevir."""
+    ok, png = cv2.imencode(".png", matte, [cv2.IMWRITE_PNG_COMPRESSION, 3])
+    if not ok:
+        raise RuntimeError("Matte PNG'ye çevrilemedi")
+    return png.tobytes()
+
+
+def decode_matte(data: bytes) -> Optional[np.ndarray]:
+    return cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_GRAYSCALE)
+
+
+def default_cache_dir() -> Path:
+    """Kredi dosyasıyla aynı uygulama klasörü altında matte_cache."""
+    if os.name == "nt":
+        appdata_path = os.environ.get("APPDATA", os.path.expanduser("~"))
+    else:
+        appdata_path = os.path.expanduser("~")
+    return Path(appdata_path) / "BiyoVes" / "matte_cache"
+
+
+class MatteCache:
+    """Boyut sınırlı, LRU tahliyeli disk önbelleği (anahtar -> bayt + meta)."""
+
+    def __init__(self, directory: "str | Path", max_bytes: int):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._size = sum(entry.stat().st_size for entry in os.scandir(self.directory) if entry.is_file())
+
+    @staticmethod
+    def key(image_input: "str | np.ndarray | Image.Image", model_id: str) -> str:
+        """Giriş içeriği + model kimliği -> önbellek anahtarı."""
+        return hashlib.sha256(f"{input_digest(image_input)}:{model_id}".encode()).hexdigest()
+
+    def _paths(self, key: str):
+        return self.directory / f"{key}.bin", self.directory / f"{key}.json"
+
+    def get(self, key: str) -> Optional[bytes]:
+        data_path, meta_path = self._paths(key)
+        try:
+            data = data_path.read_bytes()
+            # LRU: son kullanım zamanı dosya zamanında tutulur
+            now = time.time()
+            os.utime(data_path, (now, now))
+            return data
+        except OSError:
+            return None
+
+    def meta(self, key: str) -> Optional[dict]:
+        """Kaydın meta bilgisi; yoksa veya okunamazsa None."""
+        _, meta_path = self._paths(key)
+        try:
+            return json.loads(meta_path.read_bytes().decode("utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key: str, data: bytes, meta: Optional[dict] = None) -> None:
+        data_path, meta_path = self._paths(key)
+        meta_bytes = json.dumps({**(meta or {}), "created": time.time(), "bytes": len(data)},
+                                ensure_ascii=False).encode("utf-8")
+        added = 0
+        try:
+            for path, content in ((meta_path, meta_bytes), (data_path, data)):
+                tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+                tmp.write_bytes(content)
+                # Aynı anahtarın üzerine yazılıyorsa eski dosyanın boyutu düşülür
+                try:
+                    added -= path.stat().st_size
+                except OSError:
+                    pass
+                os.replace(tmp, path)
+                added += len(content)
+        except OSError as e:
+            print(f"[WARN] Matte onbellege yazilamadi: {e}")
+        with self._lock:
+            self._size += added
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        """En eski kullanılan kayıtları sınırın EVICT_TO_RATIO'suna inene kadar sil."""
+        entries = {}
+        total = 0
+        for entry in os.scandir(self.directory):
+            if not entry.is_file():
+                continue
+            stat = entry.stat()
+            total += stat.st_size
+            key = entry.name.split(".", 1)[0]
+            size, mtime = entries.get(key, (0, 0.0))
+            # Kaydın zamanı veri dosyasından gelir (get() onu günceller)
+            entries[key] = (size + stat.st_size, max(mtime, stat.st_mtime) if entry.name.endswith(".bin") else mtime)
+
+        target = self.max_bytes * EVICT_TO_RATIO
+        for key, (size, _) in sorted(entries.items(), key=lambda item: item[1][1]):
+            if total <= target:
+                break
+            for path in self._paths(key):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+            total -= size
+        self._size = total
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_matte_cache() -> Optional[MatteCache]:
+    """Ortam ayarlarına göre paylaşılan önbellek; kapalıysa veya açılamazsa None."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            try:
+                max_mb = float(os.environ.get(CACHE_SIZE_ENV, DEFAULT_MAX_MB))
+            except ValueError:
+                max_mb = DEFAULT_MAX_MB
+            if max_mb <= 0:
+                _default_cache = False
+            else:
+                directory = os.environ.get(CACHE_DIR_ENV) or default_cache_dir()
+                try:
+                    _default_cache = MatteCache(directory, int(max_mb * 1024 * 1024))
+                except OSError as e:
+                    print(f"[WARN] Matte onbellegi acilamadi ({directory}): {e}")
+                    _default_cache = False
+        return _default_cache or None
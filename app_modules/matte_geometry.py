@@ -0,0 +1,110 @@
+from typing import NamedTuple, Optional
+
+import cv2
+import numpy as np
+
+# Alpha (0-255) at or above which a matte pixel counts as person
+MATTE_THRESHOLD = 128
+# Minimum foreground pixels in a row before it can be the head top; keeps
+# isolated hair strands and matte speckle from winning
+MIN_ROW_PIXELS = 3
+# With a face box the minimum grows with the face width: speckle upscaled
+# from the model resolution is several pixels wide on large photos, while the
+# head outline passes this width within a pixel of its top
+MIN_ROW_FACE_FRACTION = 0.05
+# Rows below the head top averaged for the head top x (same band as the edge method)
+HEAD_TOP_BAND_PX = 10
+# A row below the chin whose silhouette is this much wider than the head is the shoulder line
+SHOULDER_WIDTH_RATIO = 1.6
+# Half-width, in face widths, of the window searched for the shoulders
+SHOULDER_SEARCH_FACE_WIDTHS = 3
+
+class MatteGeometry(NamedTuple):
+    """Person geometry read from an alpha matte, in image coordinates."""
+    head_top: tuple              # (x, y) of the topmost silhouette row
+    center_x: int                # silhouette centre between head top and chin
+    head_bounds: tuple           # (x1, x2) silhouette extent at face height
+    shoulder_y: Optional[int]    # first row of the shoulder line, None if not in frame
+
+def _projection(mask, axis):
+    """Foreground pixel count per column (axis=0) or per row (axis=1)."""
+    if mask.size == 0:
+        return np.zeros(mask.shape[1 - axis], dtype=np.int64)
+    return cv2.reduce(mask, axis, cv2.REDUCE_SUM, dtype=cv2.CV_32S).ravel()
+
+def analyze_matte(matte, face=None, threshold=MATTE_THRESHOLD):
+    """Head top, silhouette centre, head bounds and shoulder line from a matte.
+
+    `matte` is (H, W) uint8 0-255 or float 0-1. With a face box (x, y, w, h)
+    only the columns within 0.6 face widths of the face centre are used for
+    the head top, like detect_head_top, and only a window of a few face
+    widths down to 1.5 face heights below the chin is read at all; without
+    one the whole matte is projected.
+
+    Everything comes from row / column projections of the thresholded
+    matte, so the cost is one threshold and two reductions of that window.
+    Returns None when the matte has no usable foreground there.
+    """
+    if matte.dtype != np.uint8:
+        matte = np.clip(matte * 255.0 + 0.5, 0, 255).astype(np.uint8)
+    height, width = matte.shape[:2]
+
+    if face is not None:
+        fx, fy, fw, fh = face
+        face_center_x = fx + fw // 2
+        max_dx = fw * 0.6
+        # Head columns (strict |x - centre| < max_dx, as in detect_head_top)
+        hx1 = max(0, int(np.floor(face_center_x - max_dx)) + 1)
+        hx2 = min(width, int(np.ceil(face_center_x + max_dx)))
+        # Body window: shoulders span a few face widths, rows stop well past the chin
+        wx1 = max(0, face_center_x - SHOULDER_SEARCH_FACE_WIDTHS * fw)
+        wx2 = min(width, face_center_x + SHOULDER_SEARCH_FACE_WIDTHS * fw)
+        y2 = min(height, fy + fh + int(fh * 1.5))
+        chin_y = min(y2, fy + fh)
+        min_row_pixels = max(MIN_ROW_PIXELS, int(fw * MIN_ROW_FACE_FRACTION))
+    else:
+        hx1, hx2, wx1, wx2, y2, chin_y = 0, width, 0, width, height, None
+        min_row_pixels = MIN_ROW_PIXELS
+
+    if hx2 <= hx1 or y2 <= 0:
+        return None
+
+    _, mask = cv2.threshold(matte[:y2, wx1:wx2], threshold - 1, 1, cv2.THRESH_BINARY)
+
+    # Head top: first row of the head columns with enough foreground
+    head_mask = mask[:, hx1 - wx1:hx2 - wx1]
+    rows = np.flatnonzero(_projection(head_mask, 1) >= min_row_pixels)
+    if rows.size == 0:
+        return None
+    top_row = int(rows[0])
+    counts = _projection(head_mask[top_row:top_row + HEAD_TOP_BAND_PX + 1], 0)
+    head_top_x = int(int(np.dot(counts, np.arange(hx1, hx2))) / int(counts.sum()))
+
+    if chin_y is None:
+        # No face box: treat the top third of the visible silhouette as the head
+        chin_y = top_row + max(1, (y2 - top_row) // 3)
+        face_mid_y = (top_row + chin_y) // 2
+    else:
+        face_mid_y = min(y2 - 1, fy + fh // 2)
+    chin_y = max(chin_y, top_row + 1)
+
+    # Column projection over the head rows gives the silhouette centre
+    columns = _projection(mask[top_row:chin_y], 0)
+    total = int(columns.sum())
+    center_x = int(int(np.dot(columns, np.arange(wx1, wx2))) / total) if total else head_top_x
+
+    # Silhouette extent at face height
+    xs = np.flatnonzero(mask[max(face_mid_y, top_row)])
+    head_bounds = (wx1 + int(xs[0]), wx1 + int(xs[-1]) + 1) if xs.size else (head_top_x, head_top_x + 1)
+
+    # Shoulder line: first row under the chin with clearly more foreground than the head
+    head_width = max(1, head_bounds[1] - head_bounds[0])
+    wide = np.flatnonzero(_projection(mask[chin_y:y2], 1) >= head_width * SHOULDER_WIDTH_RATIO)
+    shoulder_y = chin_y + int(wide[0]) if wide.size else None
+
+    return MatteGeometry(
+        head_top=(head_top_x, top_row),
+        center_x=center_x,
+        head_bounds=head_bounds,
+        shoulder_y=shoulder_y,
+    )
@@ -0,0 +1,135 @@
+"""
+Kenar duyarlı matte büyütme (hızlı guided filter).
+
+MODNet 512 px'te çalışır; matte'yi orijinal boyuta INTER_LINEAR ile
+büyütmek saç kenarlarını bulanıklaştırır. Burada tam çözünürlüklü görüntü
+kılavuz olarak kullanılır (He ve Sun, "Fast Guided Filter"): doğrusal
+katsayılar (a, b) küçük bir ızgarada (uzun kenar GRID_SIDE) kutu
+filtreleriyle hesaplanır, orijinal boyuta çift doğrusal büyütülür ve
+matte = a * I + b olarak tam çözünürlükte uygulanır. Tam çözünürlükte
+yalnızca büyütme ve çarp-topla yapılır; maliyet piksel sayısıyla doğrusal.
+
+Varsayılan gri kılavuzdur. Renkli kılavuz (3x3 kovaryans, ızgarada vektörel
+çözülür) saç ile arkaplanın parlaklığı yakın olduğunda daha iyi ayırır,
+ancak yaklaşık 2,5 kat yavaştır.
+
+Ayar ortam değişkeniyle değiştirilebilir:
+    BIYOVES_MATTE_REFINE   guided (varsayılan, gri) | color | linear
+"""
+
+import os
+from typing import Tuple
+
+import cv2
+import numpy as np
+
+REFINE_ENV = "BIYOVES_MATTE_REFINE"
+REFINE_MODES = ("guided", "color", "linear")
+DEFAULT_REFINE = "guided"
+
+# Katsayıların hesaplandığı ızgaranın uzun kenarı (model boyutunun 2 katı)
+GRID_SIDE = 1024
+# Izgarada kutu filtresi yarıçapı (~4 model pikseli) ve düzenleme (I ve p 0-1 aralığında)
+RADIUS = 8
+EPS = 1e-4
+
+
+def refine_mode() -> str:
+    """Ortam ayarından büyütme yöntemi; geçersizse varsayılan."""
+    mode = os.environ.get(REFINE_ENV, DEFAULT_REFINE).strip().lower()
+    return mode if mode in REFINE_MODES else DEFAULT_REFINE
+
+
+def _box(x: np.ndarray, radius: int) -> np.ndarray:
+    return cv2.boxFilter(x, -1, (2 * radius + 1, 2 * radius + 1), borderType=cv2.BORDER_REFLECT)
+
+
+def _gray_coefficients(guide: np.ndarray, p: np.ndarray, radius: int, eps: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Gri kılavuz: her pencerede p ~ a * I + b en küçük kareler çözümü."""
+    mean_i = _box(guide, radius)
+    mean_p = _box(p, radius)
+    cov_ip = _box(guide * p, radius) - mean_i * mean_p
+    var_i = _box(guide * guide, radius) - mean_i * mean_i
+    a = cov_ip / (var_i + eps)
+    b = mean_p - a * mean_i
+    return _box(a, radius), _box(b, radius)
+
+
+def _color_coefficients(guide: np.ndarray, p: np.ndarray, radius: int, eps: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Renkli kılavuz: a (H, W, 3) = (Σ + eps·I)^-1 cov(I, p), 3x3 tersi kofaktörlerle."""
+    mean_i = _box(guide, radius)
+    mean_p = _box(p, radius)
+    cov_ip = _box(guide * p[..., None], radius) - mean_i * mean_p[..., None]
+
+    r, g, b = guide[..., 0], guide[..., 1], guide[..., 2]
+    mr, mg, mb = mean_i[..., 0], mean_i[..., 1], mean_i[..., 2]
+    srr = _box(r * r, radius) - mr * mr + eps
+    srg = _box(r * g, radius) - mr * mg
+    srb = _box(r * b, radius) - mr * mb
+    sgg = _box(g * g, radius) - mg * mg + eps
+    sgb = _box(g * b, radius) - mg * mb
+    sbb = _box(b * b, radius) - mb * mb + eps
+
+    # Simetrik 3x3 matrisin kofaktörleri
+    inv_rr = sgg * sbb - sgb * sgb
+    inv_rg = srb * sgb - srg * sbb
+    inv_rb = srg * sgb - srb * sgg
+    inv_gg = srr * sbb - srb * srb
+    inv_gb = srb * srg - srr * sgb
+    inv_bb = srr * sgg - srg * srg
+    det = srr * inv_rr + srg * inv_rg + srb * inv_rb
+
+    cr, cg, cb = cov_ip[..., 0], cov_ip[..., 1], cov_ip[..., 2]
+    a = np.stack([
+        inv_rr * cr + inv_rg * cg + inv_rb * cb,
+        inv_rg * cr + inv_gg * cg + inv_gb * cb,
+        inv_rb * cr + inv_gb * cg + inv_bb * cb,
+    ], axis=-1) / det[..., None]
+    b_coef = mean_p - (a * mean_i).sum(axis=-1)
+    return _box(a, radius), _box(b_coef, radius)
+
+
+def guided_upsample(
+    matte: np.ndarray,
+    image: np.ndarray,
+    color: bool = False,
+    grid_side: int = GRID_SIDE,
+    radius: int = RADIUS,
+    eps: float = EPS,
+) -> np.ndarray:
+    """
+    Düşük çözünürlüklü matte'yi görüntü boyutuna kenar duyarlı büyüt.
+
+    Args:
+        matte: (h, w) float32 matte, 0-1 (model çıktısı)
+        image: (H, W, 3) uint8 kılavuz görüntü (kanal sırası önemsiz)
+        color: Renkli (True) veya gri kılavuz
+
+    Returns:
+        (H, W) float32 matte, 0-1 aralığına kırpılmış
+    """
+    height, width = image.shape[:2]
+    scale = min(1.0, grid_side / max(height, width))
+    grid = (max(1, round(width * scale)), max(1, round(height * scale)))
+
+    small = cv2.resize(image, grid, interpolation=cv2.INTER_AREA) if scale < 1.0 else image
+    p = cv2.resize(matte.astype(np.float32, copy=False), grid, interpolation=cv2.INTER_LINEAR)
+
+    if color:
+        guide = small.astype(np.float32) * (1.0 / 255)
+        a, b = _color_coefficients(guide, p, radius, eps)
+        # Tam çözünürlükte: b + Σ a_c · I_c. Katsayılar kanal kanal büyütülür
+        # (1/255 ızgarada uygulanır); aynı anda en fazla bir tam boy kanal tutulur.
+        q = cv2.resize(b, (width, height), interpolation=cv2.INTER_LINEAR)
+        a *= 1.0 / 255
+        for channel in range(3):
+            a_full = cv2.resize(np.ascontiguousarray(a[..., channel]), (width, height),
+                                interpolation=cv2.INTER_LINEAR)
+            q += cv2.multiply(a_full, image[..., channel], dtype=cv2.CV_32F)
+    else:
+        guide = cv2.cvtColor(small, cv2.COLOR_RGB2GRAY).astype(np.float32) * (1.0 / 255)
+        a, b = _gray_coefficients(guide, p, radius, eps)
+        full = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY).astype(np.float32) * (1.0 / 255)
+        q = cv2.resize(a, (width, height), interpolation=cv2.INTER_LINEAR) * full
+        q += cv2.resize(b, (width, height), interpolation=cv2.INTER_LINEAR)
+    return np.clip(q, 0.0, 1.0, out=q)
@@ -0,0 +1,365 @@
+"""
+Yerel MODNet arka uçlarının (PyTorch, ONNX Runtime) ortak parçaları.
+
+Ön işleme (işlem boyutuna, varsayılan 512 px'e sığdırma, 32'nin katına yuvarlama, [-1, 1] normalize),
+matte'nin orijinal boyuta kenar duyarlı döndürülmesi (matte_refine), toplu işleme ve matte'den türeyen
+kompozit / dosya sarmalayıcıları burada; arka uçlar yalnızca (N, 3, H, W)
+bir yığın üzerinde çıkarımı uygular. Bu modül PyTorch import etmez.
+"""
+
+import math
+import os
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from .image_io import bgr_to_pil, composite, jpg_output_path, load_rgb, pil_to_bgr
+from .matte_cache import decode_matte, encode_matte, get_matte_cache
+from .matte_refine import guided_upsample, refine_mode
+from .photo_spec import PHOTO_SPECS, spec_geometry
+
+# MODNet'in eğitildiği referans boyut
+REF_SIZE = 512
+# Otomatik işlem boyutu sınırları (32'nin katları)
+REF_SIZE_MIN = 256
+REF_SIZE_MAX = 768
+# Çıktıdaki her baş pikseli için işlem boyutunun uzun kenarı (piksel). Baş
+# karenin yaklaşık üçte biri olduğundan matte, başın üzerinde çıktının üçte
+# biri kadar piksele sahip olur; aradaki büyütmeyi matte_refine tamamlar.
+MATTE_PX_PER_HEAD_PX = 1.0
+# Süre tahmini için tipik portre en-boy oranı (kısa / uzun kenar)
+PORTRAIT_ASPECT = 2 / 3
+# Görüntü başına model çıkarımı süre bütçesi (ms); boşsa sınırsız
+BUDGET_ENV = "BIYOVES_MATTING_BUDGET_MS"
+# Ölçülen çıkarım hızı (saniye / megapiksel) hareketli ortalamasında yeni ölçümün ağırlığı
+SPEED_EWMA_ALPHA = 0.3
+# Toplu işlemede tek ileri geçişteki en fazla görüntü (512 px'te ~1 GB tepe bellek)
+MAX_BATCH = 4
+
+
+def inference_size(original_size: Tuple[int, int], ref_size: int = REF_SIZE) -> Tuple[int, int]:
+    """En-boy oranını koruyarak ref_size'a sığdır ve 32'nin katlarına yuvarla."""
+    if max(original_size) > ref_size:
+        scale = ref_size / max(original_size)
+        new_size = (int(original_size[0] * scale), int(original_size[1] * scale))
+    else:
+        new_size = original_size
+
+    # 32'nin katlarına yuvarla (MODNet gereksinimi)
+    return (new_size[0] // 32) * 32, (new_size[1] // 32) * 32
+
+
+def prepare_input(image: Image.Image, ref_size: int = REF_SIZE) -> np.ndarray:
+    """
+    RGB PIL görüntüsünü model girdisine çevir: (1, 3, H, W) float32, [-1, 1].
+    torchvision ToTensor + Normalize(0.5, 0.5) ile aynı aritmetik.
+    """
+    new_size = inference_size(image.size, ref_size)
+    if new_size != image.size:
+        image = image.resize(new_size, Image.Resampling.LANCZOS)
+        print(f"📏 İşlem boyutu: {new_size[0]}x{new_size[1]}")
+
+    array = np.asarray(image, dtype=np.float32) / 255.0
+    array = (array - 0.5) / 0.5
+    return np.ascontiguousarray(array.transpose(2, 0, 1)[np.newaxis])
+
+
+def required_ref_size(specs: Optional[Iterable] = None, dpi: Optional[int] = None) -> int:
+    """
+    Hedef formatların ihtiyaç duyduğu işlem boyutu: en büyük baş yüksekliği
+    (çene-saç, tuval pikseli) x MATTE_PX_PER_HEAD_PX, 32'nin katına yukarı
+    yuvarlanıp [REF_SIZE_MIN, REF_SIZE_MAX] aralığına sıkıştırılır.
+    Varsayılan formatlarda vesikalık 416, biyometrik 512 verir.
+    """
+    specs = list(PHOTO_SPECS.values() if specs is None else specs)
+    head_px = max(spec_geometry(spec, dpi).head_height_px for spec in specs)
+    ref_size = math.ceil(head_px * MATTE_PX_PER_HEAD_PX / 32) * 32
+    return min(REF_SIZE_MAX, max(REF_SIZE_MIN, ref_size))
+
+
+def budget_seconds() -> Optional[float]:
+    """BIYOVES_MATTING_BUDGET_MS ayarı (saniye); yoksa veya geçersizse None."""
+    try:
+        value = float(os.environ.get(BUDGET_ENV, ""))
+    except ValueError:
+        return None
+    return value / 1000 if value > 0 else None
+
+
+def select_ref_size(
+    specs: Optional[Iterable] = None,
+    budget_s: Optional[float] = None,
+    seconds_per_mpx: Optional[float] = None
+) -> int:
+    """
+    İşlem boyutu politikası: formatların gerektirdiği boyut (required_ref_size);
+    süre bütçesi ve ölçülmüş çıkarım hızı verilirse, bütçeye sığan en büyük
+    boyuta düşürülür (en az REF_SIZE_MIN).
+    """
+    ref_size = required_ref_size(specs)
+    if budget_s and seconds_per_mpx:
+        # Süre piksel sayısıyla yaklaşık doğrusal: t = s/MP x ref² x en-boy
+        affordable = math.sqrt(budget_s / seconds_per_mpx * 1e6 / PORTRAIT_ASPECT)
+        ref_size = min(ref_size, max(REF_SIZE_MIN, int(affordable) // 32 * 32))
+    return ref_size
+
+
+def matte_to_original(
+    matte: np.ndarray,
+    original_size: Tuple[int, int],
+    guide: Optional[np.ndarray] = None,
+    mode: Optional[str] = None
+) -> np.ndarray:
+    """
+    Model çıktısı (H, W) float matte'yi orijinal boyutta uint8 (0-255) yap.
+    guide (orijinal RGB) verilirse büyütme kenar duyarlıdır (matte_refine;
+    mode None ise BIYOVES_MATTE_REFINE), yoksa INTER_LINEAR.
+    """
+    if (matte.shape[1], matte.shape[0]) != tuple(original_size):
+        mode = mode or refine_mode()
+        if guide is not None and mode != "linear":
+            matte = guided_upsample(matte, guide, color=(mode == "color"))
+        else:
+            matte = cv2.resize(matte, original_size, interpolation=cv2.INTER_LINEAR)
+    return (matte * 255).astype(np.uint8)
+
+
+class MattingBGRemover:
+    """
+    Matte üreten arkaplan kaldırıcıların ortak arayüzü.
+    Alt sınıf yalnızca _infer_batch() uygular; ön/son işleme, toplu işleme,
+    kompozit ve JPG kaydetme buradan gelir.
+    """
+
+    # Konsol mesajlarında görünen ad
+    label = "ModNet Local"
+    # Matte önbelleği anahtarındaki model kimliği (ağırlık özeti); None ise önbellek kullanılmaz
+    model_id: Optional[str] = None
+    use_matte_cache = True
+    # İşlem boyutu (uzun kenar); set_resolution() hedef formatlara göre seçer
+    ref_size = REF_SIZE
+    # Ölçülen çıkarım hızı (saniye / megapiksel), ilk çıkarımdan sonra dolar
+    seconds_per_mpx: Optional[float] = None
+
+    def _infer_batch(self, batch: np.ndarray) -> np.ndarray:
+        """(N, 3, H, W) float32 girdi -> (N, H, W) float32 matte (0-1)."""
+        raise NotImplementedError
+
+    def _run(self, batch: np.ndarray) -> np.ndarray:
+        start = time.perf_counter()
+        try:
+            mattes = self._infer_batch(batch)
+        except Exception as e:
+            raise RuntimeError(f"Model inference hatası: {e}")
+        # Bütçe politikası için hız ölçümü (ilk çağrı ısınma içerebilir, ortalama düzeltir)
+        speed = (time.perf_counter() - start) / (batch.shape[0] * batch.shape[2] * batch.shape[3] / 1e6)
+        previous = self.seconds_per_mpx
+        self.seconds_per_mpx = speed if previous is None else \
+            SPEED_EWMA_ALPHA * speed + (1 - SPEED_EWMA_ALPHA) * previous
+        return mattes
+
+    def set_resolution(self, specs: Optional[Iterable] = None, budget_s: Optional[float] = None) -> int:
+        """
+        İşlem boyutunu hedef formatlara (ör. yalnızca vesikalık) ve süre
+        bütçesine (varsayılan BIYOVES_MATTING_BUDGET_MS) göre seç.
+
+        Returns:
+            Seçilen ref_size
+        """
+        budget_s = budget_seconds() if budget_s is None else budget_s
+        ref_size = select_ref_size(specs, budget_s, self.seconds_per_mpx)
+        if ref_size != self.ref_size:
+            print(f"📏 İşlem boyutu: {self.ref_size} -> {ref_size}")
+        self.ref_size = ref_size
+        return ref_size
+
+    def _cache_key(self, image_input: "str | np.ndarray | Image.Image") -> Optional[str]:
+        """Önbellek anahtarı; önbellek kapalıysa veya giriş okunamıyorsa None."""
+        cache = get_matte_cache() if self.use_matte_cache and self.model_id else None
+        if cache is None:
+            return None
+        precision = getattr(self, "precision", "fp32")
+        try:
+            return cache.key(image_input, f"{self.model_id}:{precision}:ref{self.ref_size}:{refine_mode()}")
+        except (OSError, TypeError):
+            return None
+
+    def _cached_matte(self, key: Optional[str], image: Image.Image) -> Optional[np.ndarray]:
+        if key is None:
+            return None
+        data = get_matte_cache().get(key)
+        matte = decode_matte(data) if data else None
+        if matte is None or (matte.shape[1], matte.shape[0]) != image.size:
+            return None
+        print("♻️ Matte önbellekten alındı")
+        return matte
+
+    def _store_matte(self, key: Optional[str], matte: np.ndarray) -> None:
+        if key is not None:
+            get_matte_cache().put(key, encode_matte(matte), {"model": self.model_id, "label": self.label,
+                                                             "size": [matte.shape[1], matte.shape[0]]})
+
+    @staticmethod
+    def _load(image_input: "str | np.ndarray | Image.Image") -> Image.Image:
+        try:
+            image = load_rgb(image_input)
+            print(f"📐 Orijinal boyut: {image.size[0]}x{image.size[1]}")
+            return image
+        except Exception as e:
+            raise RuntimeError(f"Görüntü dosyası açılamadı: {e}")
+
+    def remove_background_matte(
+        self,
+        image_input: "str | np.ndarray | Image.Image"
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Alfa matte üret, kompozit yapmadan döndür.
+
+        Arkaplan rengini değiştirmek (ör. vize için mavi), baş tepesi tespiti
+        veya önbellekleme için matte tekrar çıkarım yapmadan kullanılabilir.
+        Aynı giriş daha önce işlendiyse matte disk önbelleğinden gelir.
+
+        Args:
+            image_input: Giriş dosyası yolu, BGR numpy dizisi veya PIL görüntüsü
+
+        Returns:
+            (image, matte): Orijinal boyutta görüntü (BGR, uint8) ve
+            matte (H, W, uint8, 0-255)
+        """
+        print(f"🚀 {self.label} ile arkaplan kaldırılıyor (yerel işlem)...")
+        image = self._load(image_input)
+        key = self._cache_key(image_input)
+        matte = self._cached_matte(key, image)
+        if matte is not None:
+            return pil_to_bgr(image), matte
+
+        # ref_size'a (varsayılan 512) sığdır, 32'nin katlarına yuvarla ve normalize et
+        matte = self._run(prepare_input(image, self.ref_size))[0]
+        print("[OK] Arkaplan basariyla kaldirildi")
+
+        # Matte'yi orijinal boyuta geri getir, 0-255 aralığına çevir
+        matte = matte_to_original(matte, image.size, guide=np.asarray(image))
+        self._store_matte(key, matte)
+        return pil_to_bgr(image), matte
+
+    def remove_background_matte_batch(
+        self,
+        inputs: "Sequence[str | np.ndarray | Image.Image]",
+        max_batch: int = MAX_BATCH
+    ) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Birden çok portre için matte üret; aynı işlem boyutuna düşen görüntüler
+        tek bir ileri geçişte (en fazla max_batch adet) işlenir.
+
+        Görüntüler işlem boyutuna göre kovalara ayrılır; aynı fotoğraf
+        makinesinden gelen bir seansın tamamı genellikle tek kovadır. Farklı
+        boyutlar dolgu ile birleştirilmez: MODNet'in InstanceNorm
+        istatistikleri dolguyu da sayacağından matte değişirdi. Böylece her
+        matte, float toplama sırası dışında tek tek işlenmiş haliyle aynıdır.
+
+        Returns:
+            Girdi sırasıyla [(image BGR, matte uint8), ...]
+        """
+        print(f"🚀 {self.label} ile {len(inputs)} görüntünün arkaplanı kaldırılıyor (toplu)...")
+        images = [self._load(image_input) for image_input in inputs]
+        keys = [self._cache_key(image_input) for image_input in inputs]
+
+        results: List[Optional[Tuple[np.ndarray, np.ndarray]]] = [None] * len(images)
+        buckets: Dict[Tuple[int, int], List[int]] = {}
+        for index, image in enumerate(images):
+            matte = self._cached_matte(keys[index], image)
+            if matte is not None:
+                results[index] = (pil_to_bgr(image), matte)
+            else:
+                buckets.setdefault(inference_size(image.size, self.ref_size), []).append(index)
+
+        for size, indices in buckets.items():
+            for start in range(0, len(indices), max_batch):
+                chunk = indices[start:start + max_batch]
+                print(f"📦 {size[0]}x{size[1]} boyutunda {len(chunk)} görüntü tek geçişte")
+                batch = np.concatenate([prepare_input(images[i], self.ref_size) for i in chunk])
+                mattes = self._run(batch)
+                for i, matte in zip(chunk, mattes):
+                    matte = matte_to_original(matte, images[i].size, guide=np.asarray(images[i]))
+                    self._store_matte(keys[i], matte)
+                    results[i] = (pil_to_bgr(images[i]), matte)
+
+        print("[OK] Arkaplanlar basariyla kaldirildi")
+        return results
+
+    def remove_background_batch(
+        self,
+        inputs: "Sequence[str | np.ndarray | Image.Image]",
+        bg: Tuple[int, int, int] = (255, 255, 255),
+        max_batch: int = MAX_BATCH
+    ) -> List[np.ndarray]:
+        """
+        Birden çok portrenin arkaplanını toplu kaldır ve düz renge kompozit et.
+
+        Returns:
+            Girdi sırasıyla kompozit görüntüler (BGR, uint8)
+        """
+        return [composite(image, matte, bg)
+                for image, matte in self.remove_background_matte_batch(inputs, max_batch)]
+
+    def remove_background_image(
+        self,
+        image_input: "str | np.ndarray | Image.Image",
+        bg: Tuple[int, int, int] = (255, 255, 255)
+    ) -> np.ndarray:
+        """
+        Arkaplanı kaldır ve düz renkli arkaplana kompozit et (bellek içi).
+
+        Args:
+            image_input: Giriş dosyası yolu, BGR numpy dizisi veya PIL görüntüsü
+            bg: Arkaplan rengi (R, G, B) - varsayılan beyaz
+
+        Returns:
+            np.ndarray: Kompozit görüntü (BGR, uint8)
+        """
+        image, matte = self.remove_background_matte(image_input)
+        return composite(image, matte, bg)
+
+    def remove_background(
+        self,
+        input_path: str,
+        output_path: Optional[str] = None,
+        bg: Tuple[int, int, int] = (255, 255, 255)
+    ) -> str:
+        """
+        Arkaplanı kaldır, beyaz arkaplana kompozit et ve JPG kaydet.
+        Dosya tabanlı uyumluluk sarmalayıcısı - asıl iş remove_background_image'da.
+
+        Args:
+            input_path: Giriş görüntü dosyası yolu
+            output_path: Çıkış dosyası yolu (None ise otomatik oluşturulur)
+            bg: Arkaplan rengi (R, G, B) - varsayılan beyaz
+
+        Returns:
+            str: İşlenmiş görüntünün kaydedildiği dosya yolu
+        """
+        if not os.path.exists(input_path):
+            raise RuntimeError(f"Giriş dosyası bulunamadı: {input_path}")
+
+        result = self.remove_background_image(input_path, bg)
+
+        # Çıkış yolunu belirle (PNG seçilse bile JPG'e zorluyoruz)
+        output_path = jpg_output_path(input_path, output_path, "_no_bg")
+
+        try:
+            # Maksimum kalite ile kaydet
+            bgr_to_pil(result).save(
+                output_path,
+                format='JPEG',
+                quality=100,
+                subsampling=0,  # 4:4:4 chroma (max kalite)
+                optimize=False  # Optimizasyon yok (max kalite)
+            )
+            print(f"💾 Yüksek kalite ile kaydedildi: {output_path}")
+        except Exception as e:
+            raise RuntimeError(f"Çıktı kaydedilemedi: {e}")
+
+        return output_path
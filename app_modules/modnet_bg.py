@@ -1,7 +1,14 @@
 import os
 import io
+import asyncio
+import random
+import threading
+import time
+import numpy as np
 from PIL import Image
-from typing import Optional, Tuple
+from collections import deque
+from concurrent.futures import Future, as_completed
+from typing import Callable, Iterable, List, NamedTuple, Optional, Sequence, Tuple
 import requests
 import ssl
 import urllib3
@@ -14,6 +21,98 @@ urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 # Direkt import - AI servisine bağlan
 import replicate
+from replicate.exceptions import ModelError
+
+from .face_cascade import detect_faces
+from .image_io import bgr_to_pil, composite, jpg_output_path, load_rgb, pil_to_bgr
+from .matte_cache import get_matte_cache
+from .matting import matte_to_original
+from .photo_spec import PHOTO_SPECS, spec_geometry
+
+# Replicate MODNet modeli (sürüm özeti önbellek anahtarına da girer)
+REPLICATE_MODEL = "pollinations/modnet:da7d45f3b836795f945f221fc0b01a6d3ab7f5e163f13208948ad436001e2255"
+
+# Çalışma boyutu politikası: görüntü, kayıtlı formatların en büyük baş
+# yüksekliğini (çene-saç, 300 DPI'da piksel) büyütmeden karşılayacak boyuta
+# küçültülür. Baş yüksekliği yüz kutusundan tahmin edilir.
+HEAD_TO_FACE_RATIO = 1.3      # çene-saç / kaskad yüz kutusu yüksekliği (alt tahmin)
+UPLOAD_SAFETY = 1.15          # tahmin hatasına karşı pay
+UPLOAD_MIN_SIDE = 1024        # yüz algılamanın güvenilir kaldığı alt sınır
+# Gönderilen uzun kenar sınırı (model 512 px'te çalışır); matte çalışma boyutuna
+# kenar duyarlı büyütülür (matte_refine)
+UPLOAD_MAX_SIDE = 2048
+# Yüz boyutu tahmini için kullanılan önizleme
+FACE_PROXY_SIDE = 512
+# Çözülmeden olduğu gibi yüklenen dosya biçimleri
+PASSTHROUGH_FORMATS = ('JPEG', 'PNG', 'WEBP')
+# Son çağrıların istatistikleri (call_stats)
+STATS_HISTORY = 256
+
+# Geçici hatalarda tekrar deneme: üstel geri çekilme + rastgele sapma (saniye)
+MAX_RETRIES = 4
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 10.0
+
+# Aynı anda çalışan en fazla tahmin (ortam değişkeniyle değiştirilebilir)
+CONCURRENCY_ENV = "BIYOVES_REPLICATE_CONCURRENCY"
+DEFAULT_CONCURRENCY = 8
+
+
+class Upload(NamedTuple):
+    """Gönderilecek baytlar ve sonucun kompozit edileceği görüntü."""
+    buffer: io.BytesIO
+    base: Optional[Image.Image]   # None: Replicate'in döndürdüğü RGB kullanılır
+    size: Tuple[int, int]         # gönderilen görüntünün boyutu
+    original_bytes: int
+
+
+class CallStats(NamedTuple):
+    """Bir arkaplan kaldırma çağrısının ağ ve süre ölçümleri."""
+    upload_bytes: int
+    original_bytes: int
+    upload_size: Tuple[int, int]
+    download_bytes: int
+    seconds: float
+    cached: bool
+
+
+def spec_head_height_px(specs: Optional[Iterable] = None) -> int:
+    """Formatların en büyük baş yüksekliği (piksel, formatın DPI'ında)."""
+    specs = PHOTO_SPECS.values() if specs is None else specs
+    return max(spec_geometry(spec).head_height_px for spec in specs)
+
+
+def estimate_face_height(image: Image.Image) -> Optional[int]:
+    """Küçük önizlemede en büyük yüzün yüksekliği (orijinal piksel); yoksa None."""
+    scale = min(1.0, FACE_PROXY_SIDE / max(image.size))
+    proxy = image.convert('L')
+    if scale < 1.0:
+        proxy = proxy.resize((max(1, round(image.size[0] * scale)), max(1, round(image.size[1] * scale))),
+                             Image.Resampling.BILINEAR)
+    min_side = max(24, int(100 * scale))
+    faces = detect_faces(np.asarray(proxy), scaleFactor=1.1, minNeighbors=5, minSize=(min_side, min_side))
+    if len(faces) == 0:
+        return None
+    return int(max(faces, key=lambda f: f[2] * f[3])[3] / scale)
+
+
+def upload_side(size: Tuple[int, int], face_height: Optional[int], head_height_px: int) -> int:
+    """
+    Çıktının kullanabileceği en büyük uzun kenar. Baş, formatta
+    head_height_px'e ölçeklenir; bundan fazla piksel çıktıya ulaşmaz.
+    Yüz bulunamazsa orijinal boyut korunur.
+    """
+    long_side = max(size)
+    if not face_height:
+        return long_side
+    needed = long_side * head_height_px * UPLOAD_SAFETY / (face_height * HEAD_TO_FACE_RATIO)
+    return min(long_side, max(UPLOAD_MIN_SIDE, int(np.ceil(needed))))
+
+
+def _resize_long_side(image: Image.Image, side: int) -> Image.Image:
+    scale = side / max(image.size)
+    return image.resize((max(1, round(image.size[0] * scale)), max(1, round(image.size[1] * scale))),
+                        Image.Resampling.LANCZOS)
 
 
 class ModNetBGRemover:
@@ -22,7 +121,8 @@ class ModNetBGRemover:
     Girdi: yerel dosya yolu. Çıktı: beyaz arkaplanlı JPG dosya yolu.
     """
 
-    def __init__(self, ckpt_path: Optional[str] = None):
+    def __init__(self, ckpt_path: Optional[str] = None, concurrency: Optional[int] = None,
+                 specs: Optional[Iterable] = None):
         # API key'i doğrudan kod içinde tanımla - hazır exe için
         # Token parçalara bölünmüş (GitHub secret scanning'i atlatmak için)
         token_parts = ["r8_", "X1E5QZ8fqhRrdOUtedi0JnlKNgE3vgX2zRuSx"]
@@ -39,101 +139,350 @@ class ModNetBGRemover:
         # DNS çözümleme sorununu çöz (Windows için)
         os.environ["REPLICATE_API_BASE"] = "https://api.replicate.com"
         
-        print("✅ Replicate modülü hazır")
+        # Kalıcı istemciler: tahmin istekleri (httpx) ve çıktı indirme (requests)
+        # her fotoğrafta yeni TLS bağlantısı kurmaz
+        self.client = replicate.Client(api_token=self._replicate_token)
+        self.session = requests.Session()
+        # SSL doğrulamasını devre dışı bırak (Windows için)
+        self.session.verify = False
         
-    def remove_background(self, input_path: str, output_path: Optional[str] = None, bg: Tuple[int, int, int] = (255, 255, 255)) -> str:
-        """Replicate API ile arkaplanı kaldır, beyaz arkaplana kompozit et ve JPG kaydet."""
-        if not os.path.exists(input_path):
-            raise RuntimeError(f"Giriş dosyası bulunamadı: {input_path}")
+        # Eşzamanlı tahmin sınırı (remove_background_images / submit)
+        self.concurrency = concurrency or int(os.environ.get(CONCURRENCY_ENV, DEFAULT_CONCURRENCY))
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_lock = threading.Lock()
+        self._semaphore = asyncio.Semaphore(self.concurrency)
         
-        # Replicate lazy import edildi, kontrol gerekmez
+        # Yükleme boyutu bu formatlara göre seçilir (varsayılan: kayıtlı tüm formatlar)
+        self.head_height_px = spec_head_height_px(specs)
+        self.call_stats: "deque[CallStats]" = deque(maxlen=STATS_HISTORY)
+        
+        print("✅ Replicate modülü hazır")
+        
+    def _prepare_upload(self, image_input: "str | np.ndarray | Image.Image") -> Upload:
+        """
+        Gönderilecek baytları yükleme boyutu politikasına göre hazırla.
+
+        Uzun kenarı UPLOAD_MIN_SIDE'ı aşmayan JPEG/PNG/WebP dosyaları
+        çözülmeden olduğu gibi gönderilir. Diğerlerinde yüz yüksekliği
+        ölçülür ve görüntü, başın formatta büyütülmeden çizileceği çalışma
+        boyutuna (upload_side) LANCZOS ile küçültülür; sonuç bu boyutta
+        döner ve kompozit bu JPEG'siz pikseller üzerinde yapılır. Gönderilen
+        kopya ayrıca UPLOAD_MAX_SIDE ile sınırlanıp tek kez JPEG'e çevrilir;
+        matte yalnızca bu durumda çalışma boyutuna büyütülür. Küçültme
+        gerekmeyen diğer biçimler ve bellekteki görüntüler PNG gider.
+        """
+        original_bytes = 0
+        if isinstance(image_input, str):
+            original_bytes = os.path.getsize(image_input)
+            # Yalnızca başlık okunur (piksel çözülmez)
+            with Image.open(image_input) as img:
+                size, fmt = img.size, img.format
+            if max(size) <= UPLOAD_MIN_SIDE and fmt in PASSTHROUGH_FORMATS:
+                with open(image_input, 'rb') as f:
+                    return Upload(io.BytesIO(f.read()), None, size, original_bytes)
+        else:
+            fmt = None
+
+        image = load_rgb(image_input)
+        if not original_bytes:
+            original_bytes = image.size[0] * image.size[1] * 3
+        face_height = estimate_face_height(image) if max(image.size) > UPLOAD_MIN_SIDE else None
+
+        # Çalışma görüntüsü: çıktının kullanabileceği en büyük boyut (kompozit burada yapılır)
+        work_side = upload_side(image.size, face_height, self.head_height_px)
+        base = image if work_side >= max(image.size) else _resize_long_side(image, work_side)
+        send_side = min(max(base.size), UPLOAD_MAX_SIDE)
 
-        # 1) Önce görüntüyü doğrula
+        buffer = io.BytesIO()
+        if send_side >= max(image.size):
+            if fmt in PASSTHROUGH_FORMATS:
+                with open(image_input, 'rb') as f:
+                    return Upload(io.BytesIO(f.read()), None, image.size, original_bytes)
+            image.save(buffer, format='PNG')
+            return Upload(buffer, None, image.size, original_bytes)
+
+        sent = base if send_side >= max(base.size) else _resize_long_side(base, send_side)
+        sent.save(buffer, format='JPEG', quality=95, subsampling=0)
+        print(f"📉 Yükleme için küçültüldü: {image.size[0]}x{image.size[1]} -> gönderilen "
+              f"{sent.size[0]}x{sent.size[1]}, çalışma {base.size[0]}x{base.size[1]}"
+              f" ({f'yüz {face_height} px' if face_height else 'yüz bulunamadı'})")
+        return Upload(buffer, base, sent.size, original_bytes)
+
+    def _cache_model_id(self) -> str:
+        """Önbellek kimliği: model sürümü + yükleme politikası (boyut bundan türetilir)."""
+        return (f"{REPLICATE_MODEL}:head{self.head_height_px}:min{UPLOAD_MIN_SIDE}:max{UPLOAD_MAX_SIDE}"
+                f":safety{UPLOAD_SAFETY}:ratio{HEAD_TO_FACE_RATIO}")
+
+    @staticmethod
+    def _cached_upload(image_input: "str | np.ndarray | Image.Image", meta: dict) -> Upload:
+        """
+        Önbellek isabetinde kompozit için gereken Upload'u meta bilgisinden
+        kur: yüz algılama ve JPEG kodlama yapılmaz, görüntü yalnızca
+        kaydedilmiş çalışma boyutuna küçültülür.
+        """
+        size = tuple(meta["upload_size"])
+        work_size = meta.get("work_size")
+        if work_size is None:
+            return Upload(io.BytesIO(), None, size, meta.get("original_bytes", 0))
+        image = load_rgb(image_input)
+        work_size = tuple(work_size)
+        base = image if image.size == work_size else image.resize(work_size, Image.Resampling.LANCZOS)
+        return Upload(io.BytesIO(), base, size, meta.get("original_bytes", 0))
+
+    def _begin(self, image_input: "str | np.ndarray | Image.Image") -> Tuple[Upload, Optional[str], Optional[bytes]]:
+        """
+        Çağrı öncesi hazırlık: (yükleme, önbellek anahtarı | None,
+        önbellekteki sonuç | None). Önbellek, yükleme hazırlanmadan önce
+        yoklanır; anahtar giriş içeriği ile yükleme politikasından türetilir.
+        """
+        if isinstance(image_input, str) and not os.path.exists(image_input):
+            raise RuntimeError(f"Giriş dosyası bulunamadı: {image_input}")
+
+        # Aynı fotoğraf aynı politikayla işlendiyse Replicate çağrılmaz
+        cache = get_matte_cache()
+        cache_key = None
+        if cache is not None:
+            try:
+                cache_key = cache.key(image_input, self._cache_model_id())
+            except (OSError, TypeError):
+                pass
+        file_bytes = cache.get(cache_key) if cache_key else None
+        if file_bytes is not None:
+            meta = cache.meta(cache_key)
+            if meta is not None and "upload_size" in meta:
+                try:
+                    upload = self._cached_upload(image_input, meta)
+                except Exception as e:
+                    raise RuntimeError(f"Görüntü dosyası açılamadı veya okunamadı: {e}")
+                print("♻️ Sonuç önbellekten alındı (Replicate çağrılmadı)")
+                return upload, cache_key, file_bytes
+            file_bytes = None
+
+        # Önbellekte yoksa görüntüyü doğrula ve gönderilecek baytları hazırla
         try:
-            # Görüntüyü PIL ile kontrol et
-            with Image.open(input_path) as img:
-                # Geçici bir buffer'a kaydet
-                img_buffer = io.BytesIO()
-                img.save(img_buffer, format=img.format or 'PNG')
-                img_buffer.seek(0)
-                
-                # Replicate'a gönderim
-                input_payload = {
-                    "image": img_buffer
-                }
+            upload = self._prepare_upload(image_input)
         except Exception as e:
             raise RuntimeError(f"Görüntü dosyası açılamadı veya okunamadı: {e}")
-            
+        return upload, cache_key, None
+
+    @staticmethod
+    def _finish(file_bytes: bytes, upload: Upload, cache_key: Optional[str],
+                bg: Tuple[int, int, int]) -> np.ndarray:
+        """Replicate çıktısını önbelleğe yaz, düz renkli arkaplana kompozit et."""
+        if cache_key:
+            # Boyutlar, isabette yükleme yeniden hazırlanmadan kompozit yapılabilsin diye saklanır
+            get_matte_cache().put(cache_key, file_bytes, {
+                "model": REPLICATE_MODEL,
+                "upload_size": list(upload.size),
+                "work_size": list(upload.base.size) if upload.base is not None else None,
+                "original_bytes": upload.original_bytes,
+            })
+
+        # 2) PNG'i oku ve beyaz arkaplanla birleştir
         try:
-            # DNS çözümleme sorununu çözmek için retry mekanizması
-            import time
-            max_retries = 3
-            for attempt in range(max_retries):
-                try:
-                    output = replicate.run(
-                        "pollinations/modnet:da7d45f3b836795f945f221fc0b01a6d3ab7f5e163f13208948ad436001e2255",
-                        input=input_payload
-                    )
-                    break  # Başarılı olursa döngüden çık
-                except Exception as e:
-                    if attempt < max_retries - 1:
-                        print(f"🔄 DNS çözümleme hatası, {attempt + 1}/{max_retries} deneme...")
-                        time.sleep(1)  # 1 saniye bekle (daha hızlı)
-                        continue
-                    else:
-                        raise RuntimeError(f"Replicate çağrısı başarısız (DNS hatası): {e}")
+            with Image.open(io.BytesIO(file_bytes)) as im:
+                if upload.base is not None and im.mode == 'RGBA':
+                    # Kompozit, gönderilen (veya orijinal) JPEG'siz pikseller üzerinde
+                    # yapılır; matte yalnızca boyut farklıysa yeniden ölçeklenir
+                    alpha = np.asarray(im.split()[-1])
+                    if im.size != upload.base.size:
+                        alpha = matte_to_original(alpha.astype(np.float32) / 255, upload.base.size,
+                                                  guide=np.asarray(upload.base))
+                    return composite(pil_to_bgr(upload.base), alpha, bg)
+                if im.mode == 'RGBA':
+                    bg_img = Image.new('RGB', im.size, bg)
+                    bg_img.paste(im, mask=im.split()[-1])
+                    rgb = bg_img
+                else:
+                    rgb = im.convert('RGB')
         except Exception as e:
-            raise RuntimeError(f"Replicate çağrısı başarısız: {e}")
+            raise RuntimeError(f"Replicate çıktısı görüntü olarak açılamadı: {e}")
+
+        return pil_to_bgr(rgb)
+
+    def _record(self, upload: Upload, file_bytes: bytes, start: float, cached: bool) -> None:
+        """Çağrının gönderilen/alınan bayt ve uçtan uca süresini kaydet ve yazdır."""
+        stats = CallStats(
+            upload_bytes=0 if cached else len(upload.buffer.getbuffer()),
+            original_bytes=upload.original_bytes,
+            upload_size=upload.size,
+            download_bytes=0 if cached else len(file_bytes),
+            seconds=time.perf_counter() - start,
+            cached=cached,
+        )
+        self.call_stats.append(stats)
+        print(f"📊 Gönderilen {stats.upload_bytes / 1e6:.2f} MB (orijinal {stats.original_bytes / 1e6:.2f} MB, "
+              f"{stats.upload_size[0]}x{stats.upload_size[1]}), alınan {stats.download_bytes / 1e6:.2f} MB, "
+              f"süre {stats.seconds:.1f} s{' (önbellek)' if cached else ''}")
+
+    def remove_background_image(self, image_input: "str | np.ndarray | Image.Image", bg: Tuple[int, int, int] = (255, 255, 255)) -> np.ndarray:
+        """
+        Replicate API ile arkaplanı kaldır ve düz renkli arkaplana kompozit et
+        (bellek içi, BGR dizi döner). Büyük görüntülerde sonuç, yükleme
+        politikasının seçtiği boyuttadır (_prepare_upload).
+        """
+        start = time.perf_counter()
+        upload, cache_key, file_bytes = self._begin(image_input)
+        cached = file_bytes is not None
+        if cached:
+            cache_key = None
+        else:
+            file_bytes = self._run_replicate(upload.buffer)
+        result = self._finish(file_bytes, upload, cache_key, bg)
+        self._record(upload, file_bytes, start, cached)
+        return result
+
+    async def _remove_background_async(self, image_input: "str | np.ndarray | Image.Image",
+                                       bg: Tuple[int, int, int]) -> np.ndarray:
+        """
+        remove_background_image'ın asyncio sürümü (submit() ile kalıcı döngüde
+        çalışır). Tahmin oluşturma ve durum sorgulama olay döngüsünde, görüntü
+        hazırlama ve kompozit iş parçacığında yapılır; aynı anda en fazla
+        self.concurrency tahmin çalışır.
+        """
+        start = time.perf_counter()
+        upload, cache_key, file_bytes = await asyncio.to_thread(self._begin, image_input)
+        cached = file_bytes is not None
+        if cached:
+            cache_key = None
+        else:
+            async with self._semaphore:
+                file_bytes = await self._run_replicate_async(upload.buffer)
+        result = await asyncio.to_thread(self._finish, file_bytes, upload, cache_key, bg)
+        self._record(upload, file_bytes, start, cached)
+        return result
+
+    def _event_loop(self) -> asyncio.AbstractEventLoop:
+        """Eşzamanlı tahminler için arka plan iş parçacığında çalışan kalıcı olay döngüsü."""
+        with self._loop_lock:
+            if self._loop is None:
+                # replicate'ın async httpx istemcisi ilk kullanıldığı döngüye bağlanır,
+                # bu yüzden tüm tahminler aynı döngüde çalışır
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="ReplicateLoop", daemon=True).start()
+            return self._loop
+
+    def submit(self, image_input: "str | np.ndarray | Image.Image",
+               bg: Tuple[int, int, int] = (255, 255, 255)) -> "Future[np.ndarray]":
+        """Arkaplan kaldırmayı başlat, beklemeden Future döndür (arayüz iş parçacığı bloklanmaz)."""
+        return asyncio.run_coroutine_threadsafe(self._remove_background_async(image_input, bg),
+                                                self._event_loop())
+
+    def remove_background_images(
+        self,
+        inputs: "Sequence[str | np.ndarray | Image.Image]",
+        bg: Tuple[int, int, int] = (255, 255, 255),
+        on_result: Optional[Callable[[int, "np.ndarray | Exception"], None]] = None
+    ) -> List["np.ndarray | Exception"]:
+        """
+        Birden çok görüntüyü eşzamanlı işle (en fazla self.concurrency tahmin).
+
+        on_result(index, sonuç veya istisna) her görüntü bittiğinde, bitiş
+        sırasıyla çağrılır. Dönen liste girdi sırasındadır; hatalı
+        görüntülerin yerinde istisna bulunur.
+
+        N görüntünün süresi yaklaşık N x gecikme yerine gecikme x N / concurrency olur.
+        """
+        futures = {self.submit(image_input, bg): index for index, image_input in enumerate(inputs)}
+        results: List["np.ndarray | Exception"] = [None] * len(futures)
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                results[index] = future.result()
+            except Exception as e:
+                results[index] = e
+            if on_result:
+                on_result(index, results[index])
+        return results
+
+    def _run_replicate(self, img_buffer: io.BytesIO) -> bytes:
+        """Replicate modelini çalıştır, çıktı PNG'sinin baytlarını döndür."""
+        for attempt in range(MAX_RETRIES):
+            try:
+                img_buffer.seek(0)
+                output = self.client.run(REPLICATE_MODEL, input={"image": img_buffer})
+                break
+            except ModelError as e:
+                # Model hatası geçici değildir, tekrar denenmez
+                raise RuntimeError(f"Replicate çağrısı başarısız: {e}")
+            except Exception as e:
+                if attempt == MAX_RETRIES - 1:
+                    raise RuntimeError(f"Replicate çağrısı başarısız ({MAX_RETRIES} deneme): {e}")
+                time.sleep(self._retry_delay(attempt, e))
 
-        # Çıktı bir URL veya benzeri olabilir; SDK değişikliklerine karşı iki yolu da dene
-        file_url = None
-        file_bytes = None
         try:
-            # Yeni SDK: output bir file-like olabilir
-            if hasattr(output, "url") and callable(getattr(output, "url")):
-                file_url = output.url()
+            # Yeni SDK: output bir file-like olabilir (istemcinin bağlantı havuzundan okunur)
             if hasattr(output, "read") and callable(getattr(output, "read")):
-                file_bytes = output.read()
+                return output.read()
         except Exception:
             pass
+        return self._download(self._output_url(output))
 
-        if file_bytes is None:
-            # URL'den indir
-            if not file_url and isinstance(output, str):
-                file_url = output
-            if not file_url:
-                # Bazı durumlarda liste dönebilir
-                if isinstance(output, (list, tuple)) and len(output) > 0 and isinstance(output[0], str):
-                    file_url = output[0]
-            if not file_url:
-                raise RuntimeError("Replicate çıktısı çözümlenemedi.")
+    async def _run_replicate_async(self, img_buffer: io.BytesIO) -> bytes:
+        """_run_replicate'ın asyncio sürümü (client.async_run + FileOutput.aread)."""
+        for attempt in range(MAX_RETRIES):
             try:
-                # SSL doğrulamasını devre dışı bırak (Windows için)
-                resp = requests.get(file_url, timeout=60, verify=False)  # Daha uzun timeout
-                resp.raise_for_status()
-                file_bytes = resp.content
+                img_buffer.seek(0)
+                output = await self.client.async_run(REPLICATE_MODEL, input={"image": img_buffer})
+                break
+            except ModelError as e:
+                raise RuntimeError(f"Replicate çağrısı başarısız: {e}")
             except Exception as e:
-                raise RuntimeError(f"Replicate çıktısı indirilemedi: {e}")
+                if attempt == MAX_RETRIES - 1:
+                    raise RuntimeError(f"Replicate çağrısı başarısız ({MAX_RETRIES} deneme): {e}")
+                await asyncio.sleep(self._retry_delay(attempt, e))
 
-        # 2) PNG'i oku ve beyaz arkaplanla JPG'e çevir
         try:
-            with Image.open(io.BytesIO(file_bytes)) as im:
-                if im.mode == 'RGBA':
-                    bg_img = Image.new('RGB', im.size, (255, 255, 255))
-                    bg_img.paste(im, mask=im.split()[-1])
-                    rgb = bg_img
-                else:
-                    rgb = im.convert('RGB')
+            if hasattr(output, "aread") and callable(getattr(output, "aread")):
+                return await output.aread()
+        except Exception:
+            pass
+        return await asyncio.to_thread(self._download, self._output_url(output))
+
+    @staticmethod
+    def _retry_delay(attempt: int, error: Exception) -> float:
+        # Üstel geri çekilme + tam rastgele sapma (aynı anda düşen istemciler yığılmasın)
+        delay = random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt))
+        print(f"🔄 Replicate hatası, {delay:.1f} s sonra tekrar ({attempt + 1}/{MAX_RETRIES}): {error}")
+        return delay
+
+    @staticmethod
+    def _output_url(output) -> str:
+        """Çıktı bir URL, URL listesi veya url() veren nesne olabilir; SDK değişikliklerine karşı hepsini dene."""
+        file_url = None
+        try:
+            if hasattr(output, "url") and callable(getattr(output, "url")):
+                file_url = output.url()
+        except Exception:
+            pass
+        if not file_url and isinstance(output, str):
+            file_url = output
+        if not file_url:
+            # Bazı durumlarda liste dönebilir
+            if isinstance(output, (list, tuple)) and len(output) > 0 and isinstance(output[0], str):
+                file_url = output[0]
+        if not file_url:
+            raise RuntimeError("Replicate çıktısı çözümlenemedi.")
+        return file_url
+
+    def _download(self, file_url: str) -> bytes:
+        try:
+            # Kalıcı oturum: bağlantı (keep-alive) tekrar kullanılır
+            resp = self.session.get(file_url, timeout=60)
+            resp.raise_for_status()
+            return resp.content
         except Exception as e:
-            raise RuntimeError(f"Replicate çıktısı görüntü olarak açılamadı: {e}")
+            raise RuntimeError(f"Replicate çıktısı indirilemedi: {e}")
+
+    def remove_background(self, input_path: str, output_path: Optional[str] = None, bg: Tuple[int, int, int] = (255, 255, 255)) -> str:
+        """Replicate API ile arkaplanı kaldır, beyaz arkaplana kompozit et ve JPG kaydet."""
+        if not os.path.exists(input_path):
+            raise RuntimeError(f"Giriş dosyası bulunamadı: {input_path}")
 
-        if output_path is None:
-            base, _ = os.path.splitext(input_path)
-            output_path = f"{base}_no_bg.jpg"
+        rgb = bgr_to_pil(self.remove_background_image(input_path, bg))
 
         # PNG seçilse bile JPG'e zorluyoruz (uygulama beklentisi)
-        if output_path.lower().endswith('.png'):
-            output_path = output_path[:-4] + '.jpg'
+        output_path = jpg_output_path(input_path, output_path, "_no_bg")
 
         try:
             # Maksimum kalite ile kaydet - Replicate API'den gelen kaliteyi koru
@@ -1,15 +1,13 @@
 import os
 import sys
 import numpy as np
-from PIL import Image
-from typing import Optional, Tuple
-import cv2
+from typing import Optional
+
+from .matting import MattingBGRemover
 
 # PyTorch import
 try:
     import torch
-    import torch.nn as nn
-    import torchvision.transforms as transforms
 except ImportError:
     raise RuntimeError(
         "PyTorch gerekli ancak yüklü değil. Lütfen şu komutu çalıştırın:\n"
@@ -39,21 +37,45 @@ try:
 except ImportError as e:
     raise RuntimeError(f"MODNet modeli yüklenemedi. Hata: {e}")
 
+from .modnet_optimize import (
+    MattingInference,
+    file_sha256,
+    fold_batchnorms,
+    load_traced_model,
+    save_traced_model,
+    strip_module_prefix,
+    traced_cache_paths,
+)
+
+# Hassasiyet seçimi için ortam değişkeni ("fp32" / "int8")
+PRECISION_ENV = "BIYOVES_MODNET_PRECISION"
+
 
-class ModNetLocalBGRemover:
+class ModNetLocalBGRemover(MattingBGRemover):
     """
     MODNet tabanlı yerel (local) arkaplan kaldırıcı.
     PyTorch kullanarak bilgisayarda yerel olarak çalışır.
     Girdi: yerel dosya yolu. Çıktı: beyaz arkaplanlı JPG dosya yolu.
+    remove_background_matte() kompozit yapmadan (görüntü, matte) döndürür.
     """
 
-    def __init__(self, ckpt_path: Optional[str] = None):
+    def __init__(self, ckpt_path: Optional[str] = None, use_cache: bool = True,
+                 precision: Optional[str] = None):
         """
         MODNet Local başlat
         
         Args:
             ckpt_path: Model checkpoint dosyası yolu. None ise varsayılan kullanılır.
+            use_cache: İzlenmiş (TorchScript) model önbelleğini kullan/oluştur.
+            precision: "fp32" (varsayılan) veya "int8" (kalibre edilmiş nicemlenmiş
+                model, yalnızca CPU). None ise BIYOVES_MODNET_PRECISION ortam
+                değişkeni okunur. int8 modeli yoksa fp32'ye dönülür.
         """
+        if precision is None:
+            precision = os.environ.get(PRECISION_ENV, "fp32")
+        if precision not in ("fp32", "int8"):
+            raise ValueError(f"Bilinmeyen hassasiyet: {precision} (fp32 veya int8)")
+
         # GPU/CPU kontrol
         self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
         print(f"[INFO] ModNet Local cihaz: {self.device}")
@@ -72,139 +94,52 @@ class ModNetLocalBGRemover:
             )
         
         print(f"[INFO] Model dosyasi: {ckpt_path}")
-        
-        # Model oluştur
-        self.model = MODNet(backbone_pretrained=False)
-        self.model = nn.DataParallel(self.model)
+        # Checkpoint bir kez özetlenir; model kimliği ve önbellek adları aynı özeti kullanır
+        digest = file_sha256(ckpt_path)
+        self.model_id = f"modnet-torch:{digest[:16]}"
+        
+        # int8: kalibrasyon betiğinin kaydettiği nicemlenmiş model (CPU)
+        self.precision = "fp32"
+        if precision == "int8":
+            if self.device.type != 'cpu':
+                print("[WARN] int8 model yalnizca CPU'da calisir, fp32 kullanilacak")
+            else:
+                from .modnet_quantize import load_int8_model
+                self.model = load_int8_model(ckpt_path, digest=digest)
+                if self.model is not None:
+                    self.precision = "int8"
+                    return
+        
+        # Önce izlenmiş (TorchScript) model önbelleği: MODNet kurulumu ve
+        # rastgele başlatma tamamen atlanır
+        cache_paths = traced_cache_paths(ckpt_path, self.device, digest) if use_cache else []
+        self.model = load_traced_model(cache_paths, self.device)
+        if self.model is None:
+            self.model = self._build_model(ckpt_path)
+            if use_cache:
+                self.model = save_traced_model(self.model, cache_paths, self.device) or self.model
+    
+    def _build_model(self, ckpt_path: str) -> "torch.nn.Module":
+        """MODNet'i kur, checkpoint'i yükle, BatchNorm'ları katla."""
+        # Model oluştur (çıkarım için DataParallel sarmalayıcısı kullanılmaz)
+        model = MODNet(backbone_pretrained=False)
         
         # Checkpoint yukle
         try:
             checkpoint = torch.load(ckpt_path, map_location=self.device)
-            self.model.load_state_dict(checkpoint)
+            model.load_state_dict(strip_module_prefix(checkpoint))
             print("[OK] ModNet Local model yuklendi")
         except Exception as e:
             raise RuntimeError(f"Model checkpoint yuklenemedi: {e}")
         
-        # Model evaluation moduna al
-        self.model.eval()
-        self.model.to(self.device)
-        
-        # Goruntu transform
-        self.transform = transforms.Compose([
-            transforms.ToTensor(),
-            transforms.Normalize((0.5, 0.5, 0.5), (0.5, 0.5, 0.5))
-        ])
+        # Model evaluation moduna al, BatchNorm'ları konvolüsyonlara katla
+        model.eval()
+        fold_batchnorms(model)
+        model.to(self.device)
+        return MattingInference(model).eval()
     
-    def remove_background(
-        self, 
-        input_path: str, 
-        output_path: Optional[str] = None, 
-        bg: Tuple[int, int, int] = (255, 255, 255)
-    ) -> str:
-        """
-        MODNet Local ile arkaplanı kaldır, beyaz arkaplana kompozit et ve JPG kaydet.
-        
-        Args:
-            input_path: Giriş görüntü dosyası yolu
-            output_path: Çıkış dosyası yolu (None ise otomatik oluşturulur)
-            bg: Arkaplan rengi (R, G, B) - varsayılan beyaz
-            
-        Returns:
-            str: İşlenmiş görüntünün kaydedildiği dosya yolu
-        """
-        if not os.path.exists(input_path):
-            raise RuntimeError(f"Giriş dosyası bulunamadı: {input_path}")
-        
-        print("🚀 ModNet Local ile arkaplan kaldırılıyor (yerel işlem)...")
-        
-        # Görüntüyü yükle
-        try:
-            image = Image.open(input_path).convert('RGB')
-            original_size = image.size  # (width, height)
-            print(f"📐 Orijinal boyut: {original_size[0]}x{original_size[1]}")
-        except Exception as e:
-            raise RuntimeError(f"Görüntü dosyası açılamadı: {e}")
-        
-        # Görüntü boyutunu 512'nin katlarına yuvarla (MODNet için optimal)
-        ref_size = 512
-        
-        # En-boy oranını koru
-        if max(original_size) > ref_size:
-            scale = ref_size / max(original_size)
-            new_size = (int(original_size[0] * scale), int(original_size[1] * scale))
-        else:
-            new_size = original_size
-        
-        # 32'nin katlarına yuvarla (MODNet gereksinimi)
-        new_size = (
-            ((new_size[0] // 32) * 32),
-            ((new_size[1] // 32) * 32)
-        )
-        
-        # Resize
-        if new_size != original_size:
-            image_resized = image.resize(new_size, Image.Resampling.LANCZOS)
-            print(f"📏 İşlem boyutu: {new_size[0]}x{new_size[1]}")
-        else:
-            image_resized = image
-        
-        # Transform ve tensor'a çevir
-        image_tensor = self.transform(image_resized)
-        image_tensor = image_tensor.unsqueeze(0).to(self.device)
-        
-        # Inference
-        try:
-            with torch.no_grad():
-                _, _, matte = self.model(image_tensor, inference=True)
-                matte = matte[0, 0].cpu().numpy()  # (H, W)
-        except Exception as e:
-            raise RuntimeError(f"Model inference hatası: {e}")
-        
-        print("[OK] Arkaplan basariyla kaldirildi")
-        
-        # Matte'yi orijinal boyuta geri getir
-        if new_size != original_size:
-            matte = cv2.resize(
-                matte, 
-                (original_size[0], original_size[1]), 
-                interpolation=cv2.INTER_LINEAR
-            )
-        
-        # Numpy array'e çevir
-        image_np = np.array(image)
-        
-        # Alpha kanalını 0-255 aralığına getir
-        matte = (matte * 255).astype(np.uint8)
-        
-        # RGBA görüntü oluştur
-        rgba = np.dstack((image_np, matte))
-        rgba_image = Image.fromarray(rgba, mode='RGBA')
-        
-        # Beyaz arkaplan ekle
-        bg_image = Image.new('RGB', rgba_image.size, bg)
-        bg_image.paste(rgba_image, mask=rgba_image.split()[-1])
-        
-        # Çıkış yolunu belirle
-        if output_path is None:
-            base, _ = os.path.splitext(input_path)
-            output_path = f"{base}_no_bg.jpg"
-        
-        # PNG seçilse bile JPG'e zorluyoruz
-        if output_path.lower().endswith('.png'):
-            output_path = output_path[:-4] + '.jpg'
-        
-        try:
-            # Maksimum kalite ile kaydet
-            bg_image.save(
-                output_path, 
-                format='JPEG', 
-                quality=100,
-                subsampling=0,  # 4:4:4 chroma (max kalite)
-                optimize=False  # Optimizasyon yok (max kalite)
-            )
-            print(f"💾 Yüksek kalite ile kaydedildi: {output_path}")
-        except Exception as e:
-            raise RuntimeError(f"Çıktı kaydedilemedi: {e}")
-        
-        return output_path
-
+    def _infer_batch(self, batch: np.ndarray) -> np.ndarray:
+        """(N, 3, H, W) girdi için (N, H, W) matte."""
+        with torch.inference_mode():
+            matte = self.model(torch.from_numpy(batch).to(self.device))
+            return matte[:, 0].cpu().numpy()
@@ -0,0 +1,80 @@
+import os
+import sys
+import numpy as np
+from typing import Optional
+
+from .matte_cache import input_digest
+from .matting import MattingBGRemover
+
+# ONNX Runtime import (PyTorch gerekmez)
+try:
+    import onnxruntime as ort
+except ImportError:
+    raise RuntimeError(
+        "ONNX Runtime gerekli ancak yüklü değil. Lütfen şu komutu çalıştırın:\n"
+        "pip install onnxruntime"
+    )
+
+ONNX_MODEL_NAME = "modnet_photographic_portrait_matting.onnx"
+
+
+def find_onnx_model() -> Optional[str]:
+    """
+    Dışa aktarılmış ONNX modelini checkpoint'in yanında ara.
+    Bulunamazsa None döner (scripts/export_modnet_onnx.py ile üretilir).
+    """
+    if getattr(sys, 'frozen', False):
+        # PyInstaller exe için
+        base_dir = sys._MEIPASS
+    else:
+        base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+    model_path = os.path.join(base_dir, 'MODNet', 'pretrained', ONNX_MODEL_NAME)
+    return model_path if os.path.exists(model_path) else None
+
+
+class ModNetOnnxBGRemover(MattingBGRemover):
+    """
+    MODNet tabanlı yerel arkaplan kaldırıcı, ONNX Runtime (CPU) ile.
+    ModNetLocalBGRemover ile aynı sözleşme; PyTorch/torchvision yüklemez.
+    Girdi: yerel dosya yolu. Çıktı: beyaz arkaplanlı JPG dosya yolu.
+    remove_background_matte() kompozit yapmadan (görüntü, matte) döndürür.
+    """
+
+    label = "ModNet ONNX"
+
+    def __init__(self, onnx_path: Optional[str] = None):
+        """
+        MODNet ONNX başlat
+
+        Args:
+            onnx_path: ONNX model dosyası yolu. None ise checkpoint'in yanındaki kullanılır.
+        """
+        if onnx_path is None:
+            onnx_path = find_onnx_model()
+        if onnx_path is None or not os.path.exists(onnx_path):
+            raise RuntimeError(
+                f"MODNet ONNX modeli bulunamadi: {onnx_path or ONNX_MODEL_NAME}\n"
+                "Lutfen once 'python scripts/export_modnet_onnx.py' calistirin."
+            )
+
+        print(f"[INFO] Model dosyasi: {onnx_path}")
+        self.model_id = f"modnet-onnx:{input_digest(onnx_path)[:16]}"
+
+        # Grafik optimizasyonları (BatchNorm katlama, Conv+ReLU birleştirme) ORT'de yapılır
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+
+        try:
+            self.session = ort.InferenceSession(
+                onnx_path, sess_options=options, providers=['CPUExecutionProvider']
+            )
+            print("[OK] ModNet ONNX model yuklendi")
+        except Exception as e:
+            raise RuntimeError(f"ONNX modeli yuklenemedi: {e}")
+
+        self.input_name = self.session.get_inputs()[0].name
+
+    def _infer_batch(self, batch: np.ndarray) -> np.ndarray:
+        """(N, 3, H, W) girdi için (N, H, W) matte."""
+        return self.session.run(None, {self.input_name: batch})[0][:, 0]
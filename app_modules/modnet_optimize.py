@@ -0,0 +1,211 @@
+"""
+MODNet'i CPU çıkarımı için hazırlayan yardımcılar.
+
+Eğitim checkpoint'i nn.DataParallel ile kaydedildiğinden anahtarlar
+'module.' önekiyle gelir; model yine de sarmalayıcı olmadan yüklenebilir.
+Eval modunda BatchNorm sabit bir kanal başı ölçek + kaydırmadır, bu yüzden
+önündeki konvolüsyonun ağırlık ve bias'ına katlanabilir:
+
+- MobileNetV2 omurgasındaki her Conv2d + BatchNorm2d çifti tek Conv2d olur.
+- IBNorm'un BatchNorm yarısı (ilk C/2 kanal) konvolüsyonun o çıkış
+  kanallarına katlanır; InstanceNorm yarısı girdiye bağlı olduğu için
+  katlanamaz ve yalnızca kalan kanallara yerinde uygulanır. Böylece
+  dilimleme + contiguous kopyaları + torch.cat ortadan kalkar.
+
+Matte sayısal olarak aynı kalır (yalnızca float yuvarlama farkı).
+
+Hazırlanan model TorchScript olarak izlenip (trace + freeze) checkpoint'in
+yanına önbelleğe alınır; sonraki açılışlarda MODNet Python'da kurulmaz,
+rastgele başlatma ve katlama tekrarlanmaz, doğrudan yüklenir.
+"""
+
+import functools
+import hashlib
+import os
+import tempfile
+import warnings
+from typing import Dict, List, Optional
+
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+from torch.nn.utils.fusion import fuse_conv_bn_eval
+
+
+def strip_module_prefix(state_dict: Dict[str, torch.Tensor]) -> Dict[str, torch.Tensor]:
+    """nn.DataParallel checkpoint anahtarlarındaki 'module.' önekini kaldır."""
+    prefix = 'module.'
+    return {
+        (key[len(prefix):] if key.startswith(prefix) else key): value
+        for key, value in state_dict.items()
+    }
+
+
+class PartialInstanceNorm(nn.Module):
+    """
+    IBNorm'un BatchNorm yarısı konvolüsyona katlandıktan sonra kalan kısım:
+    yalnızca `start` ve sonrasındaki kanallara (affine olmayan) InstanceNorm
+    uygular, ilk kanallara dokunmaz. Yerinde çalışır; yalnızca çıkarım içindir.
+    """
+
+    def __init__(self, start: int, eps: float = 1e-5):
+        super().__init__()
+        self.start = start
+        self.eps = eps
+
+    def forward(self, x):
+        x[:, self.start:] = F.instance_norm(x[:, self.start:], eps=self.eps)
+        return x
+
+
+def _fold_ibnorm(conv: nn.Conv2d, ibnorm: nn.Module) -> nn.Conv2d:
+    """IBNorm'un BatchNorm yarısını `conv`un ilk çıkış kanallarına katla."""
+    bn = ibnorm.bnorm
+    channels = ibnorm.bnorm_channels
+
+    fused = nn.Conv2d(
+        conv.in_channels, conv.out_channels, conv.kernel_size,
+        stride=conv.stride, padding=conv.padding, dilation=conv.dilation,
+        groups=conv.groups, bias=True,
+    ).to(conv.weight.device, conv.weight.dtype)
+
+    weight = conv.weight.detach().clone()
+    bias = conv.bias.detach().clone() if conv.bias is not None else conv.weight.new_zeros(conv.out_channels)
+
+    scale = bn.weight.detach() / torch.sqrt(bn.running_var + bn.eps)
+    weight[:channels] *= scale.view(-1, 1, 1, 1)
+    bias[:channels] = (bias[:channels] - bn.running_mean) * scale + bn.bias.detach()
+
+    fused.weight.data.copy_(weight)
+    fused.bias.data.copy_(bias)
+    return fused
+
+
+def fold_batchnorms(model: nn.Module) -> nn.Module:
+    """
+    Eval modundaki MODNet'te tüm BatchNorm'ları önceki konvolüsyona katla.
+    Model yerinde değiştirilir ve döndürülür; yalnızca çıkarım için kullanın.
+    """
+    model.eval()
+    for module in list(model.modules()):
+        if not isinstance(module, nn.Sequential):
+            continue
+        layers = list(module)
+        changed = False
+        for i in range(len(layers) - 1):
+            conv, norm = layers[i], layers[i + 1]
+            if not isinstance(conv, nn.Conv2d):
+                continue
+            if isinstance(norm, nn.BatchNorm2d):
+                # Omurga: Conv2d + BatchNorm2d (+ ReLU6)
+                layers[i] = fuse_conv_bn_eval(conv, norm)
+                layers[i + 1] = nn.Identity()
+                changed = True
+            elif hasattr(norm, 'bnorm') and hasattr(norm, 'inorm'):
+                # MODNet dalları: Conv2d + IBNorm (+ ReLU)
+                layers[i] = _fold_ibnorm(conv, norm)
+                layers[i + 1] = PartialInstanceNorm(norm.bnorm_channels, norm.inorm.eps)
+                changed = True
+        if changed:
+            # Katlanan normalizasyonların yerine kalan Identity'leri çıkar
+            kept = [layer for layer in layers if not isinstance(layer, nn.Identity)]
+            for name in list(module._modules):
+                del module._modules[name]
+            for index, layer in enumerate(kept):
+                module.add_module(str(index), layer)
+    return model
+
+
+class MattingInference(nn.Module):
+    """Yalnızca çıkarım matte'ini (1, 1, H, W) döndüren ince sarmalayıcı."""
+
+    def __init__(self, model: nn.Module):
+        super().__init__()
+        self.model = model
+
+    def forward(self, image):
+        return self.model(image, True)[2]
+
+
+# Katlama/izleme mantığı değişirse eski önbellek dosyalarını geçersiz kılmak için artırın
+TRACE_CACHE_VERSION = 1
+
+
+def file_sha256(path: str) -> str:
+    """
+    Dosyanın sha256 özeti. Süreç içinde yol + değiştirilme zamanı + boyut
+    başına bir kez hesaplanır (model kimliği, izleme ve int8 önbellek adları
+    aynı checkpoint'i tekrar okumaz).
+    """
+    stat = os.stat(path)
+    return _file_sha256(os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+
+@functools.lru_cache(maxsize=16)
+def _file_sha256(path: str, mtime_ns: int, size: int) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def traced_cache_paths(ckpt_path: str, device: torch.device, digest: Optional[str] = None) -> List[str]:
+    """
+    İzlenmiş model için aday önbellek yolları: önce checkpoint'in yanı,
+    sonra geçici klasör. Ad checkpoint özeti (digest; verilmezse
+    hesaplanır), torch sürümü ve cihaz türünü içerir; checkpoint veya torch
+    değişince yeni dosya üretilir.
+    """
+    stem = os.path.splitext(os.path.basename(ckpt_path))[0]
+    version = torch.__version__.replace('+', '_')
+    digest = digest or file_sha256(ckpt_path)
+    name = f"{stem}.{digest[:16]}.torch{version}.{device.type}.v{TRACE_CACHE_VERSION}.pt"
+    return [
+        os.path.join(os.path.dirname(os.path.abspath(ckpt_path)), name),
+        os.path.join(tempfile.gettempdir(), "biyoves_modnet", name),
+    ]
+
+
+def load_traced_model(cache_paths: List[str], device: torch.device) -> Optional[torch.jit.ScriptModule]:
+    """Önbellekteki izlenmiş modeli yükle; yoksa veya okunamazsa None."""
+    for path in cache_paths:
+        if not os.path.exists(path):
+            continue
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', FutureWarning)
+                model = torch.jit.load(path, map_location=device)
+            print(f"[OK] Izlenmis model onbellekten yuklendi: {path}")
+            return model
+        except Exception as e:
+            print(f"[WARN] Izlenmis model okunamadi ({path}): {e}")
+    return None
+
+
+def save_traced_model(model: nn.Module, cache_paths: List[str], device: torch.device) -> Optional[torch.jit.ScriptModule]:
+    """
+    MattingInference modelini izle (trace + freeze) ve ilk yazılabilir
+    önbellek yoluna kaydet. İzlenen modeli döndürür; izleme başarısız
+    olursa None (çağıran eager modelle devam eder).
+    """
+    example = torch.zeros(1, 3, 512, 512, device=device)
+    try:
+        with warnings.catch_warnings(), torch.no_grad():
+            warnings.simplefilter('ignore', FutureWarning)
+            traced = torch.jit.freeze(torch.jit.trace(model.eval(), example))
+    except Exception as e:
+        print(f"[WARN] Model izlenemedi, eager model kullanilacak: {e}")
+        return None
+
+    for path in cache_paths:
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            traced.save(tmp_path)
+            os.replace(tmp_path, path)
+            print(f"[OK] Izlenmis model onbellege kaydedildi: {path}")
+            break
+        except OSError as e:
+            print(f"[WARN] Onbellege yazilamadi ({path}): {e}")
+    return traced
@@ -0,0 +1,95 @@
+"""
+MODNet'in int8 (statik, kalibrasyonlu) CPU çıkarım varyantı.
+
+Konvolüsyonlar (MobileNetV2 omurgası ve dal konvolüsyonları) FX grafik
+modu statik nicemleme ile int8'e çevrilir; aktivasyon ölçekleri örnek
+portreler üzerinde kalibre edilir. InstanceNorm, torch.cat, interpolate ve
+sigmoid float kalır. Dinamik nicemleme PyTorch'ta yalnızca Linear/LSTM'i kapsar,
+MODNet'in hesabı ise konvolüsyonlarda olduğundan statik yol seçildi.
+
+Kalibre edilen model TorchScript olarak checkpoint'in yanına kaydedilir
+(scripts/calibrate_modnet_int8.py); ModNetLocalBGRemover(precision="int8")
+bu dosyayı yükler.
+"""
+
+import copy
+import os
+import warnings
+from typing import Iterable, Optional
+
+import torch
+import torch.nn as nn
+
+from .modnet_optimize import MattingInference, file_sha256
+
+# Windows/Linux x86 dizüstüler için FBGEMM tabanlı arka uç
+QUANT_BACKEND = 'x86'
+
+
+def int8_model_path(ckpt_path: str, digest: Optional[str] = None) -> str:
+    """Checkpoint'e bağlı int8 model dosyası (checkpoint değişince ad da değişir)."""
+    stem = os.path.splitext(os.path.basename(ckpt_path))[0]
+    name = f"{stem}.{(digest or file_sha256(ckpt_path))[:16]}.int8.pt"
+    return os.path.join(os.path.dirname(os.path.abspath(ckpt_path)), name)
+
+
+def quantize_modnet(model: nn.Module, calibration_inputs: Iterable[torch.Tensor],
+                    backend: str = QUANT_BACKEND) -> torch.jit.ScriptModule:
+    """
+    Eval modundaki (katlanmamış) MODNet'i int8'e çevir ve izlenmiş modeli döndür.
+
+    calibration_inputs: prepare_input() çıktısı gibi (1, 3, H, W) [-1, 1] tensörler.
+    Girdi modeli değiştirilmez.
+    """
+    from torch.ao.quantization import get_default_qconfig_mapping
+    from torch.ao.quantization.quantize_fx import convert_fx, prepare_fx
+    from models.modnet import SEBlock
+
+    torch.backends.quantized.engine = backend
+    wrapper = MattingInference(copy.deepcopy(model)).eval()
+    example = torch.zeros(1, 3, 512, 512)
+
+    with warnings.catch_warnings():
+        # torch.ao.quantization kullanımdan kaldırma uyarıları
+        warnings.simplefilter('ignore')
+        # torch.cat float kalır: quantized cat tüm girdilerin aynı ölçeği
+        # paylaşmasını ister, MODNet dallarında bu büyük hata üretir
+        qconfig_mapping = get_default_qconfig_mapping(backend).set_object_type(torch.cat, None)
+        # SEBlock x.size() açtığı için FX ile izlenemez, float modül olarak kalır
+        prepared = prepare_fx(
+            wrapper, qconfig_mapping, (example,),
+            prepare_custom_config={'non_traceable_module_class': [SEBlock]},
+        )
+
+        count = 0
+        with torch.no_grad():
+            for image in calibration_inputs:
+                prepared(image)
+                count += 1
+        if count == 0:
+            raise ValueError("Kalibrasyon için en az bir görüntü gerekli")
+        print(f"[OK] {count} görüntü ile kalibre edildi")
+
+        quantized = convert_fx(prepared)
+        with torch.no_grad():
+            return torch.jit.freeze(torch.jit.trace(quantized, example))
+
+
+def load_int8_model(ckpt_path: str, backend: str = QUANT_BACKEND,
+                    digest: Optional[str] = None) -> Optional[torch.jit.ScriptModule]:
+    """Kalibre edilmiş int8 modeli yükle; yoksa veya okunamazsa None."""
+    path = int8_model_path(ckpt_path, digest)
+    if not os.path.exists(path):
+        print(f"[WARN] int8 model bulunamadi: {path}\n"
+              "       Once 'python scripts/calibrate_modnet_int8.py <portre klasoru>' calistirin.")
+        return None
+    try:
+        torch.backends.quantized.engine = backend
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', FutureWarning)
+            model = torch.jit.load(path, map_location='cpu')
+        print(f"[OK] int8 model yuklendi: {path}")
+        return model
+    except Exception as e:
+        print(f"[WARN] int8 model okunamadi ({path}): {e}")
+        return None
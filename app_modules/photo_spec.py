@@ -0,0 +1,86 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import NamedTuple
+
+DEFAULT_DPI = 300
+
+def mm_to_pixels(mm, dpi=DEFAULT_DPI):
+    """Convert millimeters to pixels at given DPI"""
+    return int((mm / 25.4) * dpi)
+
+def cm_to_pixels(cm, dpi=DEFAULT_DPI):
+    """Convert centimeters to pixels at given DPI"""
+    return int((cm / 2.54) * dpi)
+
+@dataclass(frozen=True)
+class PhotoSpec:
+    """Physical description of an ID photo format.
+
+    head_height_mm is the chin-to-top-of-hair distance the head is scaled
+    to, top_margin_mm the gap between the canvas top and the head top.
+    New national passport/visa formats only need a new instance passed to
+    register_photo_spec().
+    """
+    name: str
+    label: str
+    canvas_width_cm: float
+    canvas_height_cm: float
+    head_height_mm: float
+    top_margin_mm: float
+    dpi: int = DEFAULT_DPI
+
+class SpecGeometry(NamedTuple):
+    """Pixel geometry of a PhotoSpec at one DPI."""
+    dpi: int
+    canvas_width_px: int
+    canvas_height_px: int
+    head_height_px: int
+    top_margin_px: int
+
+@lru_cache(maxsize=None)
+def spec_geometry(spec, dpi=None):
+    """Pixel table for `spec` at `dpi` (spec.dpi by default), cached per (spec, dpi)."""
+    dpi = spec.dpi if dpi is None else dpi
+    return SpecGeometry(
+        dpi=dpi,
+        canvas_width_px=cm_to_pixels(spec.canvas_width_cm, dpi),
+        canvas_height_px=cm_to_pixels(spec.canvas_height_cm, dpi),
+        head_height_px=mm_to_pixels(spec.head_height_mm, dpi),
+        top_margin_px=mm_to_pixels(spec.top_margin_mm, dpi),
+    )
+
+# Biyometrik: 5 x 6 cm, çene-saç 43 mm
+BIYOMETRIK = PhotoSpec(
+    name="biyometrik",
+    label="biometric",
+    canvas_width_cm=5.0,
+    canvas_height_cm=6.0,
+    head_height_mm=43.0,
+    top_margin_mm=5.0,
+)
+
+# Vesikalık: 4.5 x 6 cm, çene-saç 33 mm
+VESIKALIK = PhotoSpec(
+    name="vesikalik",
+    label="vesikalık",
+    canvas_width_cm=4.5,
+    canvas_height_cm=6.0,
+    head_height_mm=33.0,
+    top_margin_mm=5.0,
+)
+
+PHOTO_SPECS = {
+    BIYOMETRIK.name: BIYOMETRIK,
+    VESIKALIK.name: VESIKALIK,
+}
+
+def register_photo_spec(spec):
+    """Add (or replace) a format in the registry."""
+    PHOTO_SPECS[spec.name] = spec
+    return spec
+
+def get_photo_spec(name):
+    try:
+        return PHOTO_SPECS[name]
+    except KeyError:
+        raise ValueError(f"Bilinmeyen fotoğraf formatı: {name}. Mevcut: {sorted(PHOTO_SPECS)}")
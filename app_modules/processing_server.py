@@ -0,0 +1,221 @@
+"""
+Birden çok tezgah bilgisayarının tek bir güçlü makineyi paylaşması için
+yerel HTTP işlem sunucusu.
+
+Model ve yüz algılama modeli açılışta bir kez yüklenir ve sıcak tutulur.
+Gelen istekler bir kuyruğa girer; MatteBatcher kısa bir süre (varsayılan
+20 ms) bekleyip o anda kuyrukta olan görüntüleri tek bir
+remove_background_matte_batch() çağrısında işler. Yüz analizi ve yerleşim
+istek iş parçacığında yapılır.
+
+Uç noktalar:
+    GET  /health                       -> {"status": "ok", "backend": ..., "queued": ...}
+    POST /matte                        -> gövde: görüntü dosyası; yanıt: PNG matte (gri)
+    POST /process?type=&layout=&retouch=
+                                       -> gövde: görüntü dosyası; yanıt: sayfa JPEG
+
+Masaüstü uygulaması /matte'yi RemoteBGRemover ile kullanır (app_modules/remote_bg.py).
+
+    python -m app_modules.processing_server --host 0.0.0.0 --port 8765
+"""
+
+import argparse
+import io
+import json
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from .batch import create_bg_remover, render_pages
+from .duzen import encode_layout
+from .face_cascade import warm_face_cascades
+from .matting import MAX_BATCH
+
+DEFAULT_PORT = 8765
+# İlk istekten sonra toplu işleme için diğer istekleri bekleme süresi
+BATCH_WAIT_S = 0.02
+# Tek istekte kabul edilen en büyük görüntü dosyası
+MAX_UPLOAD_BYTES = 50 * 1024 * 1024
+# Kuyrukta bekleyen bir isteğin en uzun süresi
+REQUEST_TIMEOUT_S = 300
+
+PAGE_TYPES = ("vesikalik", "biyometrik", "10x15")
+
+
+class MatteBatcher:
+    """
+    Matte isteklerini kuyruktan toplayıp tek ileri geçişte işleyen iş parçacığı.
+    Model yalnızca bu iş parçacığından çağrılır.
+    """
+
+    def __init__(self, bg_remover, max_batch: int = MAX_BATCH, max_wait: float = BATCH_WAIT_S):
+        self.bg_remover = bg_remover
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._queue: "queue.Queue[Tuple[Image.Image, Future]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._loop, name="MatteBatcher", daemon=True)
+        self._thread.start()
+
+    @property
+    def queued(self) -> int:
+        return self._queue.qsize()
+
+    def submit(self, image: Image.Image) -> "Future[Tuple[np.ndarray, np.ndarray]]":
+        """Görüntüyü kuyruğa ekle; sonuç (görüntü BGR, matte uint8)."""
+        future: Future = Future()
+        self._queue.put((image, future))
+        return future
+
+    def _collect(self) -> List[Tuple[Image.Image, Future]]:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _loop(self) -> None:
+        while True:
+            batch = self._collect()
+            try:
+                results = self.bg_remover.remove_background_matte_batch(
+                    [image for image, _ in batch], max_batch=self.max_batch)
+            except Exception:
+                # Hatalı görüntüyü ayırmak için tek tek dene
+                for image, future in batch:
+                    try:
+                        future.set_result(self.bg_remover.remove_background_matte(image))
+                    except Exception as e:
+                        future.set_exception(e)
+                continue
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+
+
+class ProcessingRequestHandler(BaseHTTPRequestHandler):
+    server_version = "BiyoVes/1.0"
+
+    @property
+    def batcher(self) -> MatteBatcher:
+        return self.server.batcher
+
+    def log_message(self, format, *args):
+        print(f"[HTTP] {self.address_string()} {format % args}")
+
+    def _send(self, status: int, body: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status: int, payload: dict) -> None:
+        self._send(status, json.dumps(payload, ensure_ascii=False).encode("utf-8"), "application/json")
+
+    def _read_image(self) -> Optional[Image.Image]:
+        length = int(self.headers.get("Content-Length") or 0)
+        if length <= 0:
+            self._send_json(400, {"error": "Görüntü verisi yok"})
+            return None
+        if length > MAX_UPLOAD_BYTES:
+            self._send_json(413, {"error": f"Görüntü çok büyük (en fazla {MAX_UPLOAD_BYTES // (1024 * 1024)} MB)"})
+            return None
+        data = self.rfile.read(length)
+        try:
+            # Dosya yolundan okumayla aynı çözme (PIL, EXIF yönü uygulanmaz)
+            with Image.open(io.BytesIO(data)) as image:
+                return image.convert("RGB")
+        except Exception as e:
+            self._send_json(400, {"error": f"Görüntü çözülemedi: {e}"})
+            return None
+
+    def do_GET(self):
+        if urlparse(self.path).path != "/health":
+            self._send_json(404, {"error": "Bulunamadı"})
+            return
+        self._send_json(200, {"status": "ok", "backend": getattr(self.batcher.bg_remover, "label", ""),
+                              "queued": self.batcher.queued})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path not in ("/matte", "/process"):
+            self._send_json(404, {"error": "Bulunamadı"})
+            return
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        page_type = params.get("type", "vesikalik")
+        layout_choice = params.get("layout", "4lu")
+        if page_type not in PAGE_TYPES or layout_choice not in ("4lu", "2li"):
+            self._send_json(400, {"error": "Geçersiz type/layout"})
+            return
+
+        image = self._read_image()
+        if image is None:
+            return
+        try:
+            image_bgr, matte = self.batcher.submit(image).result(timeout=REQUEST_TIMEOUT_S)
+        except Exception as e:
+            self._send_json(500, {"error": f"Arkaplan kaldırılamadı: {e}"})
+            return
+
+        if url.path == "/matte":
+            _, png = cv2.imencode(".png", matte)
+            self._send(200, png.tobytes(), "image/png")
+            return
+
+        retouch = params.get("retouch", "0") in ("1", "true")
+        try:
+            (_, page), = render_pages(image_bgr, matte, [(page_type, layout_choice)], retouch)
+        except ValueError as e:
+            # Yüz bulunamadı vb.
+            self._send_json(422, {"error": str(e)})
+            return
+        except Exception as e:
+            self._send_json(500, {"error": str(e)})
+            return
+        self._send(200, encode_layout(page), "image/jpeg")
+
+
+class ProcessingServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, batcher: MatteBatcher):
+        super().__init__(address, ProcessingRequestHandler)
+        self.batcher = batcher
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1", help="Ağdan erişim için 0.0.0.0")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH)
+    parser.add_argument("--batch-wait-ms", type=float, default=BATCH_WAIT_S * 1000)
+    args = parser.parse_args()
+
+    bg_remover = create_bg_remover("local")
+    warm_face_cascades()
+    batcher = MatteBatcher(bg_remover, args.max_batch, args.batch_wait_ms / 1000)
+    server = ProcessingServer((args.host, args.port), batcher)
+    print(f"[OK] BiyoVes işlem sunucusu hazır: http://{args.host}:{args.port} ({bg_remover.label})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
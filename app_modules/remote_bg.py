@@ -0,0 +1,108 @@
+"""
+Yerel işlem sunucusunu (app_modules/processing_server.py) kullanan
+arkaplan kaldırıcı.
+
+Görüntü sunucuya gönderilir, yalnızca matte geri alınır; kompozit, yüz
+analizi ve yerleşim bu bilgisayarda yapılır. Böylece sonuç ModNet Local ile
+aynıdır ve baş üstü matte'den bulunur.
+"""
+
+import io
+import os
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+import requests
+from PIL import Image
+
+from .image_io import composite, load_rgb, pil_to_bgr
+
+# Sunucu kuyruğu dolu olabilir; matte isteği için bekleme süresi (saniye)
+REQUEST_TIMEOUT_SECONDS = 120
+
+
+def processing_server_url() -> str:
+    """Yapılandırılmış sunucu adresi (BIYOVES_SERVER_URL veya server_config); yoksa boş."""
+    try:
+        from .server_config import PROCESSING_SERVER_URL
+    except (ImportError, AttributeError):
+        PROCESSING_SERVER_URL = ""
+    return os.environ.get("BIYOVES_SERVER_URL", PROCESSING_SERVER_URL).rstrip("/")
+
+
+class RemoteBGRemover:
+    """
+    BiyoVes işlem sunucusu üzerinden arkaplan kaldırıcı.
+    MattingBGRemover ile aynı sözleşme: remove_background_matte() kompozit
+    yapmadan (görüntü, matte) döndürür.
+    """
+
+    def __init__(self, server_url: Optional[str] = None, timeout: float = REQUEST_TIMEOUT_SECONDS):
+        self.server_url = (server_url or processing_server_url()).rstrip("/")
+        if not self.server_url:
+            raise RuntimeError("İşlem sunucusu adresi yapılandırılmamış (BIYOVES_SERVER_URL)")
+        self.timeout = timeout
+        self.session = requests.Session()
+
+        try:
+            health = self.session.get(f"{self.server_url}/health", timeout=5)
+            health.raise_for_status()
+            backend = health.json().get("backend", "")
+        except Exception as e:
+            raise RuntimeError(f"İşlem sunucusuna bağlanılamadı ({self.server_url}): {e}")
+        self.label = f"BiyoVes Sunucu ({backend})" if backend else "BiyoVes Sunucu"
+        print(f"[OK] İşlem sunucusu hazır: {self.server_url} {backend}")
+
+    @staticmethod
+    def _encode(image_input: "str | np.ndarray | Image.Image") -> bytes:
+        """Dosya ise olduğu gibi gönderilir; dizi/PIL kayıpsız PNG'ye çevrilir."""
+        if isinstance(image_input, str):
+            if not os.path.exists(image_input):
+                raise RuntimeError(f"Giriş dosyası bulunamadı: {image_input}")
+            with open(image_input, "rb") as f:
+                return f.read()
+        buffer = io.BytesIO()
+        load_rgb(image_input).save(buffer, format="PNG", compress_level=1)
+        return buffer.getvalue()
+
+    def remove_background_matte(
+        self,
+        image_input: "str | np.ndarray | Image.Image"
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Matte'yi sunucuda üret.
+
+        Returns:
+            (image, matte): Orijinal boyutta görüntü (BGR, uint8) ve
+            matte (H, W, uint8, 0-255)
+        """
+        print(f"🚀 {self.label} ile arkaplan kaldırılıyor...")
+        try:
+            response = self.session.post(f"{self.server_url}/matte", data=self._encode(image_input),
+                                         headers={"Content-Type": "application/octet-stream"},
+                                         timeout=self.timeout)
+        except requests.RequestException as e:
+            raise RuntimeError(f"İşlem sunucusuna ulaşılamadı: {e}")
+        if response.status_code != 200:
+            try:
+                message = response.json().get("error", response.text)
+            except ValueError:
+                message = response.text
+            raise RuntimeError(f"İşlem sunucusu hatası ({response.status_code}): {message}")
+
+        matte = cv2.imdecode(np.frombuffer(response.content, np.uint8), cv2.IMREAD_GRAYSCALE)
+        image = pil_to_bgr(load_rgb(image_input))
+        if matte is None or matte.shape != image.shape[:2]:
+            raise RuntimeError("İşlem sunucusundan geçersiz matte alındı")
+        print("[OK] Arkaplan basariyla kaldirildi")
+        return image, matte
+
+    def remove_background_image(
+        self,
+        image_input: "str | np.ndarray | Image.Image",
+        bg: Tuple[int, int, int] = (255, 255, 255)
+    ) -> np.ndarray:
+        """Arkaplanı kaldır ve düz renkli arkaplana kompozit et (BGR dizi döner)."""
+        image, matte = self.remove_background_matte(image_input)
+        return composite(image, matte, bg)
@@ -0,0 +1,66 @@
+"""
+ModNet API yükleme boyutu politikası (ModNetBGRemover._prepare_upload) ölçümü.
+
+Replicate çağrılmaz. Her fotoğraf için orijinal dosya boyutu, gönderilecek
+bayt ve çözünürlük, sonucun döneceği çalışma çözünürlüğü ve hazırlık
+süresi yazılır. Ardından çalışma görüntüsünde yüz analizi yapılıp formatın
+baş yüksekliğine ölçek katsayısı hesaplanır: katsayı <= 1 ise çıktı için
+büyütme gerekmez, yani küçültme kalite kaybı getirmez.
+
+    python benchmarks/bench_api_upload.py foto1.jpg foto2.jpg
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+os.environ["BIYOVES_MATTE_CACHE_MB"] = "0"
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from PIL import Image  # noqa: E402
+
+from app_modules.centering import analyze_face  # noqa: E402
+from app_modules.image_io import pil_to_bgr  # noqa: E402
+from app_modules.modnet_bg import ModNetBGRemover  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('paths', nargs='+')
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        remover = ModNetBGRemover()
+
+    print(f"Baş yüksekliği hedefi: {remover.head_height_px} px")
+    print(f"{'dosya':<18} {'orijinal':>18} {'gönderilen':>18} {'çalışma':>10} {'hazırlık':>9} {'ölçek':>6}")
+    for path in args.paths:
+        with Image.open(path) as img:
+            original_size = img.size
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            upload = remover._prepare_upload(path)
+            prep_s = time.perf_counter() - start
+            if upload.base is not None:
+                image = pil_to_bgr(upload.base)
+            else:
+                with Image.open(io.BytesIO(upload.buffer.getvalue())) as sent:
+                    image = pil_to_bgr(sent.convert('RGB'))
+            try:
+                analysis = analyze_face(image)
+                x, y, w, h = analysis.face
+                scale = f"{remover.head_height_px / abs(y + h - analysis.head_top[1]):.2f}"
+            except ValueError:
+                scale = "-"
+        sent_bytes = len(upload.buffer.getbuffer())
+        work_size = f"{image.shape[1]}x{image.shape[0]}"
+        print(f"{os.path.basename(path):<18} {os.path.getsize(path) / 1e6:6.2f} MB {original_size[0]:>4}x{original_size[1]:<4} "
+              f"{sent_bytes / 1e6:6.2f} MB {upload.size[0]:>4}x{upload.size[1]:<4} {work_size:>10} "
+              f"{prep_s * 1000:6.0f} ms {scale:>6}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+"""
+Merkezleme adımında "tüm görüntüyü ölçekle, sonra kırp" (full), "önce
+kırp, sonra yalnızca kırpılan bölgeyi ölçekle" (warp_crop) ve ikisi
+arasında pencere oranına göre seçen scaled_crop (auto) karşılaştırması.
+
+Her görüntü ve ölçek için her yöntem ayrı bir alt süreçte çalıştırılır;
+tepe RSS (ru_maxrss), adımın kendi tepe bellek ayırımı (tracemalloc),
+süre ve full çıktısına göre piksel farkı raporlanır. İki rejimi görmek
+için hem büyük (24 MP) hem orta (6 MP) boyutlu görüntü ve hem küçültme
+hem büyütme ölçekleri verin; pencere oranı küçükse warp, büyükse (ör.
+6 MP, 0.25) full daha hızlıdır.
+
+    python benchmarks/bench_crop_scale.py foto_24mp.jpg foto_6mp.jpg --scale 0.25 0.9 1.5
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app_modules.centering import scaled_crop, warp_crop
+
+CANVAS_WIDTH_PX = 591
+CANVAS_HEIGHT_PX = 709
+
+
+def canvas_rect(new_width, new_height):
+    """Ölçeklenmiş görüntünün ortasından tuval boyutunda bir pencere."""
+    x1 = max(0, new_width // 2 - CANVAS_WIDTH_PX // 2)
+    y1 = max(0, new_height // 3 - CANVAS_HEIGHT_PX // 3)
+    return x1, y1, min(new_width, x1 + CANVAS_WIDTH_PX), min(new_height, y1 + CANVAS_HEIGHT_PX)
+
+
+def peak_rss_mb():
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux: KB, macOS: byte
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def worker(method, path, scale, out_path):
+    image = cv2.imread(path)
+    base_rss = peak_rss_mb()
+    new_size = (int(image.shape[1] * scale), int(image.shape[0] * scale))
+    x1, y1, x2, y2 = canvas_rect(*new_size)
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    if method == 'full':
+        scaled = cv2.resize(image, new_size, interpolation=cv2.INTER_LANCZOS4)
+        region = scaled[y1:y2, x1:x2].copy()
+    elif method == 'warp':
+        region = warp_crop(image, new_size, (x1, y1, x2, y2))
+    else:
+        region = scaled_crop(image, new_size, (x1, y1, x2, y2))
+    elapsed = time.perf_counter() - start
+    step_peak_mb = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+    tracemalloc.stop()
+
+    np.save(out_path, region)
+    window = (x2 - x1) * (y2 - y1) / float(new_size[0] * new_size[1])
+    print(json.dumps({'seconds': elapsed, 'peak_rss_mb': peak_rss_mb(), 'image_rss_mb': base_rss,
+                      'step_peak_mb': step_peak_mb, 'window': window,
+                      'size': [image.shape[1], image.shape[0]]}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('paths', nargs='+')
+    parser.add_argument('--scale', type=float, nargs='+', default=[0.25, 0.9, 1.5],
+                        help='Merkezlemenin hesapladığı ölçek faktörleri')
+    parser.add_argument('--worker', choices=['full', 'warp', 'auto'], help=argparse.SUPPRESS)
+    parser.add_argument('--out', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args.worker, args.paths[0], args.scale[0], args.out)
+        return
+
+    import tempfile
+    labels = (('full', 'tümünü ölçekle'), ('warp', 'kırp + ölçekle'), ('auto', 'scaled_crop'))
+    for path in args.paths:
+        for scale in args.scale:
+            results = {}
+            with tempfile.TemporaryDirectory() as tmp:
+                for method, _ in labels:
+                    out = os.path.join(tmp, f'{method}.npy')
+                    proc = subprocess.run(
+                        [sys.executable, __file__, path, '--scale', str(scale), '--worker', method, '--out', out],
+                        check=True, capture_output=True, text=True,
+                    )
+                    results[method] = json.loads(proc.stdout.strip().splitlines()[-1])
+                    results[method]['region'] = np.load(out)
+
+            width, height = results['full']['size']
+            print(f"\n{os.path.basename(path)} {width}x{height} ({width * height / 1e6:.0f} MP), ölçek {scale:g}, "
+                  f"pencere ölçeklenmiş görüntünün %{results['full']['window'] * 100:.0f}'i")
+            for method, label in labels:
+                r = results[method]
+                diff = np.abs(results['full']['region'].astype(np.int16) - r['region'].astype(np.int16))
+                print(f"  {label:<15} süre={r['seconds'] * 1000:8.1f} ms  adım tepe bellek={r['step_peak_mb']:7.1f} MB  "
+                      f"tepe RSS={r['peak_rss_mb']:7.1f} MB (görüntüyle {r['image_rss_mb']:.1f} MB)  "
+                      f"fark maks={int(diff.max())} >2 oranı={(diff > 2).mean():.1e}")
+
+
+if __name__ == '__main__':
+    main()
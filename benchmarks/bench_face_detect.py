@@ -0,0 +1,141 @@
+"""
+Tam çözünürlüklü yüz algılama ile proxy (küçültülmüş) algılamanın
+doğruluk ve süre karşılaştırması.
+
+    python benchmarks/bench_face_detect.py foto1.jpg foto2.jpg ...
+    python benchmarks/bench_face_detect.py klasor/ --max-side 1024
+
+Her görüntü için en büyük yüz kutusunun IoU değeri, köşe sapması ve iki
+yolun süresi yazdırılır.
+
+Ayrıca (--small-face) her görüntüden büyük bir sahne kurulur: görüntü uzun
+kenarı --scene-side olacak şekilde büyütülür ve köşesine yüzü yaklaşık
+--small-face px olan küçük bir kopyası yapıştırılır. Küçük yüz minSize'a
+yakın olduğundan proxy üzerinde cascade penceresinin altına düşmemelidir;
+iki yolun küçük yüzü bulup bulmadığı yazdırılır.
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+import cv2
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app_modules.face_cascade import _iou, detect_faces, detect_faces_proxy, warm_face_cascades
+
+IMAGE_EXTS = ('.png', '.jpg', '.jpeg', '.bmp', '.tif', '.tiff')
+
+
+def collect_images(paths):
+    images = []
+    for path in paths:
+        if os.path.isdir(path):
+            images.extend(sorted(p for p in glob.glob(os.path.join(path, '*')) if p.lower().endswith(IMAGE_EXTS)))
+        else:
+            images.append(path)
+    return images
+
+
+def largest(faces):
+    if len(faces) == 0:
+        return None
+    return tuple(int(v) for v in max(faces, key=lambda f: f[2] * f[3]))
+
+
+def timed(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+def small_face_scene(image, face, face_px, scene_side):
+    """(sahne, küçük yüzün beklenen kutusu) veya küçük kopya sığmazsa None."""
+    height, width = image.shape[:2]
+    big = scene_side / float(max(height, width))
+    scene = cv2.resize(image, (int(round(width * big)), int(round(height * big))), interpolation=cv2.INTER_CUBIC)
+    small = face_px / float(face[2])
+    copy = cv2.resize(image, (int(round(width * small)), int(round(height * small))), interpolation=cv2.INTER_AREA)
+    if copy.shape[0] > scene.shape[0] or copy.shape[1] > scene.shape[1]:
+        return None
+    scene[:copy.shape[0], :copy.shape[1]] = copy
+    expected = tuple(int(round(v * small)) for v in face)
+    return scene, expected
+
+
+def found_box(faces, expected):
+    """Beklenen kutuyla IoU'su 0.5'i geçen algılama var mı."""
+    return any(_iou(tuple(int(v) for v in f), expected) > 0.5 for f in faces)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('paths', nargs='+', help='Görüntü dosyaları veya klasörler')
+    parser.add_argument('--max-side', type=int, default=1024, help='Proxy görüntünün uzun kenarı (px)')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--small-face', type=int, default=120,
+                        help='Küçük yüz sahnesinde yüz genişliği (px, 0: kapalı)')
+    parser.add_argument('--scene-side', type=int, default=6000, help='Küçük yüz sahnesinin uzun kenarı (px)')
+    args = parser.parse_args()
+
+    warm_face_cascades()
+    total_full = total_proxy = 0.0
+    ious = []
+    small_found = {"tam": 0, "proxy": 0, "sahne": 0}
+    for path in collect_images(args.paths):
+        image = cv2.imread(path)
+        if image is None:
+            print(f"{path}: okunamadı, atlandı")
+            continue
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+        full, full_s = timed(lambda: detect_faces(gray, scaleFactor=1.1, minNeighbors=5, minSize=(100, 100)), args.repeat)
+        proxy, proxy_s = timed(lambda: detect_faces_proxy(gray, max_side=args.max_side, scaleFactor=1.1,
+                                                          minNeighbors=5, minSize=(100, 100)), args.repeat)
+        total_full += full_s
+        total_proxy += proxy_s
+
+        full_box, proxy_box = largest(full), largest(proxy)
+        if full_box is None or proxy_box is None:
+            print(f"{os.path.basename(path)}: tam={full_box} proxy={proxy_box}")
+            continue
+        iou = _iou(full_box, proxy_box)
+        ious.append(iou)
+        max_dev = max(abs(a - b) for a, b in zip(full_box, proxy_box))
+        print(f"{os.path.basename(path)} {image.shape[1]}x{image.shape[0]}: "
+              f"tam={full_s * 1000:8.1f} ms  proxy={proxy_s * 1000:7.1f} ms  "
+              f"IoU={iou:.3f}  maks. sapma={max_dev} px")
+
+        scene = small_face_scene(image, full_box, args.small_face, args.scene_side) if args.small_face else None
+        if scene is None:
+            continue
+        scene, expected = scene
+        scene_gray = cv2.cvtColor(scene, cv2.COLOR_BGR2GRAY)
+        scene_full = detect_faces(scene_gray, scaleFactor=1.1, minNeighbors=5, minSize=(100, 100))
+        scene_proxy = detect_faces_proxy(scene_gray, max_side=args.max_side, scaleFactor=1.1,
+                                         minNeighbors=5, minSize=(100, 100))
+        full_ok, proxy_ok = found_box(scene_full, expected), found_box(scene_proxy, expected)
+        small_found["sahne"] += 1
+        small_found["tam"] += full_ok
+        small_found["proxy"] += proxy_ok
+        print(f"  küçük yüz {expected[2]} px, sahne {scene.shape[1]}x{scene.shape[0]}: "
+              f"tam={'bulundu' if full_ok else 'YOK'}  proxy={'bulundu' if proxy_ok else 'YOK'}")
+
+    if ious:
+        print(f"\nOrtalama IoU: {sum(ious) / len(ious):.3f}  "
+              f"toplam süre tam={total_full:.2f} s proxy={total_proxy:.2f} s "
+              f"({total_full / max(total_proxy, 1e-9):.1f}x)")
+    if small_found["sahne"]:
+        print(f"Küçük yüz ({args.small_face} px): tam {small_found['tam']}/{small_found['sahne']}  "
+              f"proxy {small_found['proxy']}/{small_found['sahne']}")
+
+
+if __name__ == '__main__':
+    main()
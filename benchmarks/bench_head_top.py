@@ -0,0 +1,145 @@
+"""
+detect_head_top kenar taraması için doğrulama ve zamanlama betiği.
+
+Sentetik Canny kenar haritaları üzerinde vektörize bulucuyu eski piksel
+piksel döngüyle karşılaştırır (koordinatlar birebir aynı olmalı) ve iki
+yöntemin süresini raporlar. Görüntü verilirse, yalnızca arama penceresinde
+yapılan Canny (roi_canny) tam görüntü Canny'si ile karşılaştırılır.
+
+    python benchmarks/bench_head_top.py
+    python benchmarks/bench_head_top.py foto1.jpg foto2.jpg
+"""
+
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app_modules.centering import find_head_top_in_edges, roi_canny
+
+
+def reference_head_top(search_region, search_x1, search_y1, face_center_x, face_w):
+    """Eski detect_head_top içindeki iç içe döngü (karşılaştırma için)."""
+    head_top_candidates = []
+    for y in range(search_region.shape[0]):
+        for x in range(search_region.shape[1]):
+            if search_region[y, x] > 0:
+                orig_x = search_x1 + x
+                orig_y = search_y1 + y
+                if abs(orig_x - face_center_x) < face_w * 0.6:
+                    head_top_candidates.append((orig_x, orig_y))
+
+    if not head_top_candidates:
+        return None
+
+    head_top_y = min(head_top_candidates, key=lambda p: p[1])[1]
+    top_points = [p for p in head_top_candidates if p[1] <= head_top_y + 10]
+    head_top_x = int(sum(p[0] for p in top_points) / len(top_points))
+    return head_top_x, head_top_y
+
+
+def synthetic_edges(rng, height, width, density):
+    """Rastgele gürültü + bir baş yayı içeren 0/255 kenar haritası."""
+    edges = np.zeros((height, width), dtype=np.uint8)
+    edges[rng.random((height, width)) < density] = 255
+    cx, cy = width // 2 + rng.integers(-width // 8, width // 8 + 1), height // 2
+    radius = max(1, min(width, height) // 3)
+    xs = np.arange(width)
+    inside = np.abs(xs - cx) < radius
+    ys = cy - np.sqrt(np.maximum(radius ** 2 - (xs - cx) ** 2, 0)).astype(int)
+    edges[ys[inside].clip(0, height - 1), xs[inside]] = 255
+    return edges
+
+
+def check_equivalence(cases=300, seed=1234):
+    rng = np.random.default_rng(seed)
+    for i in range(cases):
+        height = int(rng.integers(1, 120))
+        width = int(rng.integers(1, 120))
+        density = float(rng.choice([0.0, 0.0005, 0.01, 0.2]))
+        edges = synthetic_edges(rng, height, width, density)
+        if rng.random() < 0.1:
+            edges[:] = 0
+        search_x1 = int(rng.integers(0, 50))
+        search_y1 = int(rng.integers(0, 50))
+        face_w = int(rng.integers(1, 2 * width + 2))
+        face_center_x = search_x1 + int(rng.integers(-10, width + 10))
+
+        expected = reference_head_top(edges, search_x1, search_y1, face_center_x, face_w)
+        actual = find_head_top_in_edges(edges, search_x1, search_y1, face_center_x, face_w * 0.6)
+        if expected != actual:
+            raise AssertionError(
+                f"Durum {i}: beklenen {expected}, bulunan {actual} "
+                f"(boyut={width}x{height}, x1={search_x1}, y1={search_y1}, "
+                f"cx={face_center_x}, w={face_w})"
+            )
+    print(f"[OK] {cases} sentetik kenar haritasında koordinatlar birebir aynı")
+
+
+def bench(height, width, density, repeat=3):
+    rng = np.random.default_rng(0)
+    edges = synthetic_edges(rng, height, width, density)
+    face_w = int(width / 1.2)
+    face_center_x = width // 2
+
+    start = time.perf_counter()
+    expected = reference_head_top(edges, 0, 0, face_center_x, face_w)
+    loop_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        actual = find_head_top_in_edges(edges, 0, 0, face_center_x, face_w * 0.6)
+    vec_s = (time.perf_counter() - start) / repeat
+
+    assert expected == actual, (expected, actual)
+    print(f"{width:>5}x{height:<5} yoğunluk={density:<6} döngü={loop_s * 1000:9.1f} ms  "
+          f"numpy={vec_s * 1000:7.2f} ms  hızlanma={loop_s / max(vec_s, 1e-9):7.0f}x")
+
+
+def bench_roi_canny(path, windows=200, seed=7):
+    image = cv2.imread(path)
+    if image is None:
+        print(f"{path}: okunamadı, atlandı")
+        return
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    height, width = gray.shape
+
+    start = time.perf_counter()
+    full = cv2.Canny(cv2.GaussianBlur(gray, (5, 5), 0), 50, 150, apertureSize=3)
+    full_s = time.perf_counter() - start
+
+    rng = np.random.default_rng(seed)
+    mismatched = total = 0
+    roi_s = 0.0
+    for _ in range(windows):
+        # Yüz kutusundan türeyen arama penceresi boyutlarına yakın pencereler
+        win_w = int(rng.integers(width // 10, width // 3 + 2))
+        win_h = int(rng.integers(height // 10, height // 3 + 2))
+        x1 = int(rng.integers(0, width - win_w + 1))
+        y1 = int(rng.integers(0, height - win_h + 1))
+        start = time.perf_counter()
+        edges = roi_canny(gray, x1, y1, x1 + win_w, y1 + win_h)
+        roi_s += time.perf_counter() - start
+        mismatched += int((edges != full[y1:y1 + win_h, x1:x1 + win_w]).sum())
+        total += edges.size
+
+    print(f"{os.path.basename(path)} {width}x{height}: tam Canny={full_s * 1000:.1f} ms  "
+          f"ROI Canny ort.={roi_s / windows * 1000:.2f} ms  "
+          f"farklı piksel={mismatched}/{total} ({mismatched / max(total, 1):.2e})")
+
+
+def main():
+    check_equivalence()
+    # 24 MP bir karede yüz ~1500 px: arama bölgesi ~1800x1650
+    for height, width in [(400, 360), (1000, 900), (1650, 1800)]:
+        bench(height, width, density=0.05)
+    for path in sys.argv[1:]:
+        bench_roi_canny(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Otomatik dağıtıcı (app_modules/hybrid_bg.py) benzetimi.
+
+Yerel model gerçek olarak çalışır; API, --api-latency saniye bekleyip
+yerel matte ile kompozit döndüren eşzamanlı bir benzetimle temsil edilir
+(Replicate kredisi harcanmaz). Aynı N görüntü yalnızca yerel ve otomatik
+olarak işlenir; --api-fail-rate ile API hataları ve yerele aktarım denenir.
+Matte önbelleği ölçüm boyunca kapatılır.
+
+    python benchmarks/bench_hybrid.py foto.jpg --count 24 --api-latency 4
+    python benchmarks/bench_hybrid.py foto.jpg --onnx model.onnx --api-fail-rate 0.5
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+os.environ["BIYOVES_MATTE_CACHE_MB"] = "0"
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app_modules.hybrid_bg import HybridBGRemover  # noqa: E402
+from app_modules.image_io import composite, load_rgb, pil_to_bgr  # noqa: E402
+
+
+class SimulatedAPI:
+    """submit() sözleşmesini taklit eden, sabit gecikmeli API benzetimi."""
+
+    def __init__(self, latency, fail_rate, concurrency):
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.concurrency = concurrency
+        self.calls = 0
+        self._pool = ThreadPoolExecutor(concurrency)
+
+    def _run(self, image_input, bg):
+        self.calls += 1
+        time.sleep(self.latency * random.uniform(0.8, 1.2))
+        if random.random() < self.fail_rate:
+            raise RuntimeError("benzetilmiş API hatası")
+        return pil_to_bgr(load_rgb(image_input))
+
+    def submit(self, image_input, bg=(255, 255, 255)):
+        return self._pool.submit(self._run, image_input, bg)
+
+
+def build_local(args):
+    if args.onnx:
+        from app_modules.modnet_onnx import ModNetOnnxBGRemover
+        return ModNetOnnxBGRemover(args.onnx)
+    from app_modules.modnet_local import ModNetLocalBGRemover
+    return ModNetLocalBGRemover(args.ckpt)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('path')
+    parser.add_argument('--ckpt')
+    parser.add_argument('--onnx')
+    parser.add_argument('--count', type=int, default=24)
+    parser.add_argument('--api-latency', type=float, default=4.0)
+    parser.add_argument('--api-concurrency', type=int, default=8)
+    parser.add_argument('--api-fail-rate', type=float, default=0.0)
+    args = parser.parse_args()
+    random.seed(0)
+
+    inputs = [args.path] * args.count
+    with contextlib.redirect_stdout(io.StringIO()):
+        local = build_local(args)
+        local.remove_background_matte(args.path)  # ısınma
+
+        start = time.perf_counter()
+        local.remove_background_matte_batch(inputs)
+        local_s = time.perf_counter() - start
+
+        api = SimulatedAPI(args.api_latency, args.api_fail_rate, args.api_concurrency)
+        hybrid = HybridBGRemover(local, api)
+        start = time.perf_counter()
+        results = hybrid.remove_backgrounds(inputs)
+        hybrid_s = time.perf_counter() - start
+
+    failed = sum(isinstance(r, Exception) for r in results)
+    from_local = sum(1 for r in results if isinstance(r, tuple) and r[1] is not None)
+    # Yerelde üretilen kompozitin doğrudan yerel sonuçla aynı olduğunu doğrula
+    image, matte = next(r for r in results if isinstance(r, tuple) and r[1] is not None)
+    ref_image, ref_matte = local.remove_background_matte(args.path)
+    same = (composite(image, matte) == composite(ref_image, ref_matte)).all()
+
+    print(f"{args.count} görüntü, API benzetimi {args.api_latency:g} s x {args.api_concurrency} eşzamanlı, "
+          f"hata oranı {args.api_fail_rate:g}")
+    print(f"  yalnız yerel : {local_s:6.1f} s  {args.count / local_s:5.2f} görüntü/s")
+    print(f"  otomatik     : {hybrid_s:6.1f} s  {args.count / hybrid_s:5.2f} görüntü/s  "
+          f"(yerel {from_local}, API {args.count - from_local - failed}, hata {failed}, API çağrısı {api.calls})")
+    print(f"  tahmini gecikme: yerel {hybrid.local_latency.value:.2f} s, API {hybrid.api_latency.value:.2f} s; "
+          f"yerel sonuç aynı: {'evet' if same else 'HAYIR'}")
+
+
+if __name__ == '__main__':
+    main()
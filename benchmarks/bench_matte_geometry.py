@@ -0,0 +1,192 @@
+"""
+Baş üstü tespiti: matte izdüşümü (analyze_matte) ile Canny kenar yöntemi
+(detect_head_top) karşılaştırması.
+
+Sentetik portrelerde (dokulu saç, saç telleri, yumuşak matte kenarı,
+arkaplan artığı) gerçek baş üstü bilindiği için iki yöntemin hatası ve
+süresi raporlanır; yatay ortalama için matte silüet merkezi
+(horizontal_center) ile yüz kutusu merkezinin hatası da yazılır. Ölçülen matte gerçek alfadan değil, bozulmuş bir
+kopyasından gelir (model çözünürlüğüne inip çıkma, eşik kayması, kesilmiş
+saç, arkaplan lekeleri); böylece sonuç kendini doğrulamaz. Kenar yöntemi,
+uygulamadaki gibi arkaplanı kaldırılmış (beyaza kompozit edilmiş) görüntü
+üzerinde çalışır.
+
+Gerçek fotoğraflar ve bir MODNet checkpoint'i verilirse matte yerel
+modelle üretilir; doğru cevap bilinmediğinden iki yöntemin farkı yazılır.
+
+    python benchmarks/bench_matte_geometry.py
+    python benchmarks/bench_matte_geometry.py --ckpt MODNet/pretrained/modnet.ckpt foto1.jpg
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app_modules.centering import FaceAnalysis, analyze_face, detect_head_top, horizontal_center
+from app_modules.image_io import composite
+from app_modules.matte_geometry import analyze_matte
+
+
+def degrade_matte(rng, alpha, head):
+    """
+    Model çıktısını taklit eden matte (uint8): gerçek alfa model boyutuna
+    (uzun kenar 512) küçültülüp büyütülür, eşik rastgele kaydırılır, baş
+    üstünde saçın bir kısmı kesilir ve arkaplana lekeler eklenir.
+    """
+    height, width = alpha.shape
+    cx, top, rx = head
+    scale = 512 / max(height, width)
+    small = cv2.resize(alpha, (max(1, round(width * scale)), max(1, round(height * scale))),
+                       interpolation=cv2.INTER_AREA)
+    degraded = cv2.resize(small, (width, height), interpolation=cv2.INTER_LINEAR)
+
+    # Eşik kayması: kontrast ve ofset farkı konturu birkaç piksel oynatır
+    gain, bias = rng.uniform(0.8, 1.6), rng.uniform(-0.12, 0.12)
+    degraded = np.clip((degraded - 0.5) * gain + 0.5 + bias, 0, 1)
+
+    # Kesilmiş saç: baş üstünden rastgele genişlikte bir başlık silinir
+    if rng.random() < 0.5:
+        cut = int(rx * rng.uniform(0.02, 0.08) * 2)
+        half = int(rx * rng.uniform(0.2, 0.6))
+        cv2.rectangle(degraded, (cx - half, 0), (cx + half, top + cut), 0.0, -1)
+
+    # Arkaplan lekeleri (baş üstü sütunlarında da olabilir)
+    for _ in range(int(rng.integers(0, 4))):
+        x, y = int(rng.integers(0, width)), int(rng.integers(0, max(1, top)))
+        radius = max(1, int(width * rng.uniform(0.001, 0.004)))
+        cv2.circle(degraded, (x, y), radius, float(rng.uniform(0.3, 0.9)), -1)
+    return (degraded * 255).astype(np.uint8)
+
+
+def synthetic_portrait(rng, height, width):
+    """(görüntü BGR, matte uint8, yüz kutusu, gerçek baş üstü (x, y), omuz y)"""
+    # Düşük frekanslı renkli arkaplan + yüksek kontrastlı "oda" dikdörtgenleri
+    small = rng.integers(0, 256, (8, 6, 3), dtype=np.uint8)
+    image = cv2.resize(small, (width, height), interpolation=cv2.INTER_CUBIC)
+    for _ in range(12):
+        x, y = int(rng.integers(0, width)), int(rng.integers(0, height))
+        cv2.rectangle(image, (x, y), (x + width // 6, y + height // 8),
+                      tuple(int(c) for c in rng.integers(0, 256, 3)), -1)
+
+    cx = width // 2 + int(rng.integers(-width // 10, width // 10 + 1))
+    rx, ry = int(width * rng.uniform(0.11, 0.15)), int(height * rng.uniform(0.13, 0.17))
+    cy = int(height * rng.uniform(0.32, 0.40))
+    mask = np.zeros((height, width), dtype=np.uint8)
+
+    # Baş, boyun, omuzlar
+    cv2.ellipse(mask, (cx, cy), (rx, ry), 0, 0, 360, 255, -1)
+    neck_top, shoulder_y = cy + int(ry * 0.8), cy + int(ry * 1.35)
+    cv2.rectangle(mask, (cx - rx // 2, neck_top), (cx + rx // 2, shoulder_y), 255, -1)
+    shoulders = np.array([[cx - rx * 3, height], [cx - rx * 2, shoulder_y],
+                          [cx + rx * 2, shoulder_y], [cx + rx * 3, height]], dtype=np.int32)
+    cv2.fillPoly(mask, [shoulders], 255)
+
+    # Kişi dokusu: saç (üst yarı) koyu ve dokulu, yüz açık
+    person = np.empty_like(image)
+    person[:] = (60, 80, 120)
+    person[:cy] = (25, 30, 40)
+    noise = rng.integers(-40, 41, (height, width, 1), dtype=np.int16)
+    person = np.clip(person.astype(np.int16) + noise, 0, 255).astype(np.uint8)
+
+    alpha = cv2.GaussianBlur(mask.astype(np.float32) / 255.0, (0, 0), max(1.0, width / 1500))
+    # Baş üstünden kalkan yarı saydam saç telleri (matte'de eşik altında)
+    strands = np.zeros((height, width), dtype=np.uint8)
+    for _ in range(int(rng.integers(3, 9))):
+        x0 = cx + int(rng.integers(-rx // 2, rx // 2 + 1))
+        y0 = cy - ry + 2
+        x1, y1 = x0 + int(rng.integers(-rx // 3, rx // 3 + 1)), y0 - int(ry * rng.uniform(0.08, 0.25))
+        cv2.line(strands, (x0, y0), (x1, y1), 255, max(1, width // 800))
+    alpha = np.maximum(alpha, (strands > 0) * 0.35)
+
+    # Görüntü gerçek alfayla oluşturulur, ölçüm ise bozulmuş matte'yle yapılır
+    a = alpha[:, :, None]
+    source = (person * a + image * (1 - a)).astype(np.uint8)
+    matte = degrade_matte(rng, alpha, (cx, cy - ry, rx))
+
+    # Haar kutusu yüzün tam ortasında durmaz: yatay kayma eklenir
+    shift = int(rng.integers(-rx // 8, rx // 8 + 1))
+    face = (cx - int(rx * 0.75) + shift, cy - int(ry * 0.35), int(rx * 1.5), int(ry * 1.15))
+    return source, matte, face, (cx, cy - ry), shoulder_y
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return result, (time.perf_counter() - start) / repeat
+
+
+def bench_synthetic(height, width, cases, seed=3, repeat=3):
+    rng = np.random.default_rng(seed)
+    errors = {'matte': [], 'edge': []}
+    times = {'matte': 0.0, 'edge': 0.0}
+    shoulder_errors = []
+    center_errors = {'matte': [], 'face': []}
+    for _ in range(cases):
+        source, matte, face, (true_x, true_y), shoulder_y = synthetic_portrait(rng, height, width)
+        removed = composite(source, matte)
+        gray = cv2.cvtColor(removed, cv2.COLOR_BGR2GRAY)
+
+        geometry, matte_s = timed(lambda: analyze_matte(matte, face=face), repeat)
+        edge_top, edge_s = timed(lambda: detect_head_top(removed, *face, gray=gray), repeat)
+
+        errors['matte'].append(abs(geometry.head_top[1] - true_y))
+        errors['edge'].append(abs(edge_top[1] - true_y))
+        times['matte'] += matte_s
+        times['edge'] += edge_s
+        if geometry.shoulder_y is not None:
+            shoulder_errors.append(abs(geometry.shoulder_y - shoulder_y))
+        analysis = FaceAnalysis(face=face, head_top=geometry.head_top, matte_geometry=geometry)
+        center_errors['matte'].append(abs(horizontal_center(analysis) - true_x))
+        center_errors['face'].append(abs(face[0] + face[2] // 2 - true_x))
+
+    print(f"{width}x{height} ({cases} portre)")
+    for method, label in (('matte', 'matte izdüşümü'), ('edge', 'Canny kenar')):
+        err = np.array(errors[method])
+        print(f"  {label:<15} süre={times[method] / cases * 1000:7.2f} ms  "
+              f"baş üstü y hatası ort={err.mean():6.1f} px  maks={err.max():5d} px")
+    print(f"  yatay merkez x hatası ort: matte={np.mean(center_errors['matte']):.1f} px  "
+          f"yüz kutusu={np.mean(center_errors['face']):.1f} px")
+    if shoulder_errors:
+        print(f"  omuz çizgisi y hatası ort={np.mean(shoulder_errors):.1f} px "
+              f"({len(shoulder_errors)}/{cases} portrede bulundu)")
+
+
+def bench_real(paths, ckpt):
+    from app_modules.modnet_local import ModNetLocalBGRemover
+    remover = ModNetLocalBGRemover(ckpt)
+    for path in paths:
+        original, matte = remover.remove_background_matte(path)
+        removed = composite(original, matte)
+        edge, edge_s = timed(lambda: analyze_face(removed), 1)
+        with_matte, matte_s = timed(lambda: analyze_face(removed, matte=matte), 1)
+        dx = with_matte.head_top[0] - edge.head_top[0]
+        dy = with_matte.head_top[1] - edge.head_top[1]
+        print(f"{os.path.basename(path)}: kenar={edge.head_top} ({edge_s * 1000:.1f} ms)  "
+              f"matte={with_matte.head_top} ({matte_s * 1000:.1f} ms)  fark=({dx}, {dy})  "
+              f"omuz y={with_matte.matte_geometry.shoulder_y if with_matte.matte_geometry else None}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('paths', nargs='*')
+    parser.add_argument('--ckpt', help='Gerçek fotoğraflar için MODNet checkpoint yolu')
+    parser.add_argument('--cases', type=int, default=20)
+    args = parser.parse_args()
+
+    for height, width in [(1500, 1000), (3000, 2000), (6000, 4000)]:
+        bench_synthetic(height, width, args.cases if height < 6000 else max(1, args.cases // 4))
+    if args.paths:
+        if not args.ckpt:
+            parser.error('Gerçek fotoğraflar için --ckpt gerekli')
+        bench_real(args.paths, args.ckpt)
+
+
+if __name__ == '__main__':
+    main()
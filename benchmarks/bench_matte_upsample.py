@@ -0,0 +1,112 @@
+"""
+Matte büyütme yöntemleri (app_modules/matte_refine.py): süre ve kalite.
+
+Gerçek alfa bilinen sentetik bir portre üretilir. Gövde ve baş yumuşak
+kenarlı, saç 1-3 px kalınlığında yüzlerce ince teldir; arkaplan dokuludur.
+Modelin ideal çıktısı, gerçek alfanın işlem boyutuna (512) küçültülmesiyle
+taklit edilir. Böylece yalnızca büyütme aşamasının hatası ölçülür. Her
+çözünürlükte (varsayılan 12 ve 24 MP) linear / guided / color için medyan
+süre ile tüm görüntüde ve kenar bandında (0 < alfa < 1, genişletilmiş)
+ortalama mutlak hata yazılır.
+
+    python benchmarks/bench_matte_upsample.py
+    python benchmarks/bench_matte_upsample.py --mp 12 24 --repeat 5
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app_modules.matte_refine import guided_upsample  # noqa: E402
+from app_modules.matting import inference_size, matte_to_original  # noqa: E402
+
+METHODS = {
+    "linear": lambda matte, image: cv2.resize(matte, (image.shape[1], image.shape[0]),
+                                              interpolation=cv2.INTER_LINEAR),
+    "guided": lambda matte, image: guided_upsample(matte, image),
+    "color": lambda matte, image: guided_upsample(matte, image, color=True),
+}
+
+
+def synthetic_portrait(width, height, seed=0):
+    """(görüntü RGB uint8, gerçek alfa float32) — dikey portre, ince saç telleri."""
+    rng = np.random.default_rng(seed)
+    yy, xx = np.mgrid[0:height, 0:width].astype(np.float32)
+
+    # Dokulu arkaplan: yumuşak renk geçişi + düşük frekanslı gürültü
+    noise = cv2.resize(rng.random((24, 16), dtype=np.float32), (width, height), interpolation=cv2.INTER_CUBIC)
+    background = np.stack([150 + 60 * noise, 160 + 40 * (yy / height), 140 + 50 * (xx / width)], axis=-1)
+
+    # Alfa: baş (elips) + omuzlar, kenarlar yumuşak
+    alpha = np.zeros((height, width), np.float32)
+    cx, head_cy = width / 2, height * 0.38
+    cv2.ellipse(alpha, (int(cx), int(head_cy)), (int(width * 0.2), int(height * 0.2)), 0, 0, 360, 1.0, -1,
+                cv2.LINE_AA)
+    cv2.ellipse(alpha, (int(cx), height), (int(width * 0.48), int(height * 0.38)), 0, 180, 360, 1.0, -1,
+                cv2.LINE_AA)
+    alpha = cv2.GaussianBlur(alpha, (0, 0), max(1.0, width / 2000))
+
+    # Saç telleri: başın üst yarısından dışarı taşan ince eğriler
+    hair = np.zeros_like(alpha)
+    thickness_scale = max(1, round(width / 3000))
+    for _ in range(600):
+        angle = rng.uniform(np.pi * 1.05, np.pi * 1.95)
+        r0 = rng.uniform(0.7, 0.95)
+        x = cx + np.cos(angle) * width * 0.2 * r0
+        y = head_cy + np.sin(angle) * height * 0.2 * r0
+        length = rng.uniform(0.05, 0.14) * height
+        curve = rng.uniform(-0.6, 0.6)
+        points = []
+        for t in np.linspace(0, 1, 24):
+            a = angle + curve * t
+            points.append((x + np.cos(a) * length * t, y + np.sin(a) * length * t))
+        cv2.polylines(hair, [np.round(np.array(points) * 16).astype(np.int32)], False,
+                      rng.uniform(0.6, 1.0), rng.integers(1, 3) * thickness_scale, cv2.LINE_AA, shift=4)
+    alpha = np.maximum(alpha, hair)
+
+    foreground = np.empty_like(background)
+    foreground[..., 0] = 60 + 40 * noise
+    foreground[..., 1] = 45 + 20 * noise
+    foreground[..., 2] = 35
+    image = alpha[..., None] * foreground + (1 - alpha[..., None]) * background
+    return np.clip(image, 0, 255).astype(np.uint8), alpha
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--mp', type=float, nargs='+', default=[12, 24])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'MP':>4} {'boyut':>10} {'yöntem':>7} {'süre':>9} {'MAE':>8} {'bant MAE':>9}")
+    for mp in args.mp:
+        # 2:3 dikey portre
+        width = int(round((mp * 1e6 * 2 / 3) ** 0.5))
+        height = int(round(width * 1.5))
+        image, alpha = synthetic_portrait(width, height)
+        small = cv2.resize(alpha, inference_size((width, height)), interpolation=cv2.INTER_AREA)
+        band = (alpha > 0.01) & (alpha < 0.99)
+        band = cv2.dilate(band.astype(np.uint8), np.ones((9, 9), np.uint8)).astype(bool)
+
+        for name, method in METHODS.items():
+            times = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                upsampled = method(small, image)
+                matte = matte_to_original(upsampled, (width, height)) if name == "linear" else \
+                    (upsampled * 255).astype(np.uint8)
+                times.append(time.perf_counter() - start)
+            error = np.abs(matte.astype(np.float32) / 255 - alpha)
+            print(f"{mp:>4g} {width}x{height:<5} {name:>7} {statistics.median(times) * 1000:6.0f} ms "
+                  f"{error.mean() * 1000:7.2f}‰ {error[band].mean() * 1000:8.1f}‰")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""
+Toplu matting (remove_background_matte_batch) ile tek tek çağrının
+görüntü/saniye karşılaştırması.
+
+Aynı boyutta N portre (verilen fotoğraftan hafif parlaklık farklarıyla
+türetilir) önce tek tek, sonra farklı yığın boyutlarıyla işlenir. Çok
+çekirdekli CPU'da iş parçacığı sayısı --threads ile ayarlanabilir. Toplu
+ve tekli matte'lerin farkı da yazılır.
+
+    python benchmarks/bench_matting_batch.py foto.jpg --count 8 --threads 4
+    python benchmarks/bench_matting_batch.py foto.jpg --backend onnx --onnx model.onnx
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+def build_remover(args):
+    with contextlib.redirect_stdout(io.StringIO()):
+        if args.backend == 'onnx':
+            from app_modules.modnet_onnx import ModNetOnnxBGRemover
+            return ModNetOnnxBGRemover(args.onnx)
+        from app_modules.modnet_local import ModNetLocalBGRemover
+        return ModNetLocalBGRemover(args.ckpt)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('path')
+    parser.add_argument('--backend', choices=['torch', 'onnx'], default='torch')
+    parser.add_argument('--ckpt')
+    parser.add_argument('--onnx')
+    parser.add_argument('--count', type=int, default=8)
+    parser.add_argument('--batches', type=int, nargs='+', default=[2, 4, 8])
+    parser.add_argument('--threads', type=int)
+    args = parser.parse_args()
+
+    if args.threads:
+        import torch
+        torch.set_num_threads(args.threads)
+
+    image = cv2.imread(args.path)
+    if image is None:
+        sys.exit(f"{args.path} okunamadı")
+    images = [cv2.convertScaleAbs(image, alpha=1.0, beta=(i % 5) * 4 - 8) for i in range(args.count)]
+    remover = build_remover(args)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        remover.remove_background_matte(images[0])  # ısınma
+        start = time.perf_counter()
+        single = [remover.remove_background_matte(img)[1] for img in images]
+        single_s = time.perf_counter() - start
+
+    print(f"{args.backend}, {args.count} portre {image.shape[1]}x{image.shape[0]}")
+    print(f"tek tek          {args.count / single_s:6.2f} görüntü/s")
+    for max_batch in args.batches:
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            batched = remover.remove_background_matte_batch(images, max_batch=max_batch)
+            batch_s = time.perf_counter() - start
+        diff = max(int(np.abs(a.astype(np.int16) - m.astype(np.int16)).max()) for a, (_, m) in zip(single, batched))
+        print(f"yığın={max_batch:<3}        {args.count / batch_s:6.2f} görüntü/s  ({single_s / batch_s:.2f}x, "
+              f"maks. matte farkı {diff} seviye)")
+
+
+if __name__ == '__main__':
+    main()
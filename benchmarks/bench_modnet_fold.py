@@ -0,0 +1,112 @@
+"""
+MODNet çıkarım modeli: eski kurulum (nn.DataParallel + eager BatchNorm/IBNorm,
+torch.no_grad) ile katlanmış kurulumun (DataParallel yok, BatchNorm'lar
+konvolüsyona katlanmış, torch.inference_mode) karşılaştırması.
+
+Aynı girdi için iki modelin matte'i karşılaştırılır (float maks. fark ve
+uint8'e çevrildikten sonra farklı piksel sayısı), ardından 512 px'te
+gecikme ölçülür. Checkpoint verilmezse veya okunamazsa BatchNorm
+istatistikleri rastgele doldurulmuş rastgele ağırlıklar kullanılır.
+
+    python benchmarks/bench_modnet_fold.py --ckpt MODNet/pretrained/modnet_photographic_portrait_matting.ckpt
+    python benchmarks/bench_modnet_fold.py --size 512 384 --repeat 10
+"""
+
+import argparse
+import copy
+import os
+import statistics
+import sys
+import time
+
+import torch
+import torch.nn as nn
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import app_modules.modnet_local  # noqa: F401  (MODNet/src yolunu ekler)
+from app_modules.modnet_optimize import fold_batchnorms, strip_module_prefix
+from models.modnet import MODNet
+
+
+def load_state(ckpt):
+    if ckpt:
+        try:
+            return strip_module_prefix(torch.load(ckpt, map_location='cpu')), os.path.basename(ckpt)
+        except Exception as e:
+            print(f"Checkpoint okunamadı ({str(e).splitlines()[0]}); rastgele ağırlıklar kullanılıyor")
+    torch.manual_seed(0)
+    model = MODNet(backbone_pretrained=False)
+    for module in model.modules():
+        if isinstance(module, nn.BatchNorm2d):
+            module.running_mean.uniform_(-0.5, 0.5)
+            module.running_var.uniform_(0.5, 2.0)
+            module.weight.data.uniform_(0.5, 1.5)
+            module.bias.data.uniform_(-0.2, 0.2)
+    return model.state_dict(), 'rastgele ağırlıklar'
+
+
+def build_reference(state):
+    model = nn.DataParallel(MODNet(backbone_pretrained=False))
+    model.load_state_dict({f'module.{k}': v for k, v in state.items()})
+    return model.eval()
+
+
+def build_folded(state):
+    model = MODNet(backbone_pretrained=False)
+    model.load_state_dict(copy.deepcopy(state))
+    model.eval()
+    return fold_batchnorms(model)
+
+
+def run(model, image, grad_context):
+    with grad_context():
+        return model(image, inference=True)[2]
+
+
+def latency(model, image, grad_context, repeat):
+    run(model, image, grad_context)  # ısınma
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run(model, image, grad_context)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--ckpt')
+    parser.add_argument('--size', type=int, nargs=2, default=(512, 512), metavar=('W', 'H'))
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--threads', type=int, help='torch.set_num_threads')
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    state, source = load_state(args.ckpt)
+    reference = build_reference(state)
+    folded = build_folded(state)
+
+    width, height = args.size
+    torch.manual_seed(1)
+    image = torch.rand(1, 3, height, width) * 2 - 1
+
+    expected = run(reference, image, torch.no_grad)
+    actual = run(folded, image, torch.inference_mode)
+    max_diff = (expected - actual).abs().max().item()
+    levels = ((expected * 255).to(torch.uint8).int() - (actual * 255).to(torch.uint8).int()).abs()
+    changed = int((levels > 0).sum())
+    print(f"{source}, {width}x{height}, {torch.get_num_threads()} iş parçacığı")
+    print(f"Matte farkı: float maks={max_diff:.2e}, uint8'de farklı piksel={changed}/{expected.numel()} "
+          f"(maks {int(levels.max())} seviye)")
+
+    before = latency(reference, image, torch.no_grad, args.repeat)
+    after = latency(folded, image, torch.inference_mode, args.repeat)
+    print(f"DataParallel + eager BN : {before * 1000:8.1f} ms")
+    print(f"Katlanmış + inference   : {after * 1000:8.1f} ms  ({before / after:.2f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""
+MODNet int8 varyantı ile fp32'nin matte kalitesi ve hız karşılaştırması.
+
+Her test portresi için iki arka ucun orijinal boyuttaki matte'leri
+karşılaştırılır: SAD (alfa [0, 1] mutlak farkların toplamı / 1000, matting
+literatüründeki birim) ve MSE. Ayrıca model çağrısının ve uçtan uca
+remove_background_matte'nin medyan süresi raporlanır. Test klasörü
+kalibrasyon klasöründen farklı olmalıdır.
+
+    python scripts/calibrate_modnet_int8.py kalibrasyon/
+    python benchmarks/bench_modnet_int8.py test_portreleri/ --threads 4
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import sys
+import time
+import warnings
+
+import numpy as np
+import torch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app_modules.image_io import load_rgb
+from app_modules.matting import prepare_input
+from app_modules.modnet_local import ModNetLocalBGRemover
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.webp')
+
+
+def median_time(fn, repeat):
+    fn()  # ısınma
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('folder')
+    parser.add_argument('--ckpt', help='MODNet checkpoint (varsayılan: uygulamanın kullandığı)')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--threads', type=int, help='torch.set_num_threads')
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+    warnings.simplefilter('ignore')
+
+    names = sorted(n for n in os.listdir(args.folder) if n.lower().endswith(IMAGE_EXTENSIONS))
+    if not names:
+        parser.error(f"{args.folder} içinde görüntü bulunamadı")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        fp32 = ModNetLocalBGRemover(args.ckpt, precision='fp32')
+        int8 = ModNetLocalBGRemover(args.ckpt, precision='int8')
+    if int8.precision != 'int8':
+        sys.exit("int8 model bulunamadı; önce scripts/calibrate_modnet_int8.py çalıştırın")
+
+    print(f"{len(names)} portre, {torch.get_num_threads()} iş parçacığı")
+    print(f"{'dosya':<28}{'SAD':>9}{'MSE':>11}{'fp32 model':>12}{'int8 model':>12}{'fp32 uçtan uca':>16}{'int8 uçtan uca':>16}")
+    rows = []
+    for name in names:
+        image = load_rgb(os.path.join(args.folder, name))
+        with contextlib.redirect_stdout(io.StringIO()):
+            tensor = torch.from_numpy(prepare_input(image))
+            _, matte_fp32 = fp32.remove_background_matte(image)
+            _, matte_int8 = int8.remove_background_matte(image)
+            times = []
+            for remover in (fp32, int8):
+                with torch.inference_mode():
+                    times.append(median_time(lambda: remover.model(tensor), args.repeat))
+            for remover in (fp32, int8):
+                times.append(median_time(lambda: remover.remove_background_matte(image), args.repeat))
+
+        diff = np.abs(matte_fp32.astype(np.float32) - matte_int8.astype(np.float32)) / 255.0
+        sad, mse = diff.sum() / 1000.0, float((diff ** 2).mean())
+        rows.append((sad, mse, *times))
+        print(f"{name[:27]:<28}{sad:9.2f}{mse:11.2e}" + ''.join(f"{t * 1000:10.0f}ms" if i < 2 else f"{t * 1000:14.0f}ms"
+                                                           for i, t in enumerate(times)))
+
+    mean = np.mean(rows, axis=0)
+    print(f"{'ortalama':<28}{mean[0]:9.2f}{mean[1]:11.2e}" + ''.join(
+        f"{t * 1000:10.0f}ms" if i < 2 else f"{t * 1000:14.0f}ms" for i, t in enumerate(mean[2:])))
+    print(f"Model hızlanması: {mean[2] / mean[3]:.2f}x  uçtan uca: {mean[4] / mean[5]:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""
+ModNetLocalBGRemover açılış süresi: önbelleksiz kurulum (MODNet'i Python'da
+kur, kaiming başlatma, checkpoint yükle, BatchNorm katla), önbelleği
+oluşturan ilk açılış ve izlenmiş (TorchScript) model önbelleğinden açılış.
+
+Her ölçüm temiz bir alt süreçte yapılır; torch importu ayrıca raporlanır.
+Checkpoint geçici bir klasöre kopyalanır, önbellek dosyası orada oluşur ve
+sonunda silinir. İlk çıkarımın süresi ve önbellekli / önbelleksiz matte
+farkı da yazılır.
+
+    python benchmarks/bench_modnet_startup.py --ckpt MODNet/pretrained/modnet_photographic_portrait_matting.ckpt
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+def worker(ckpt, use_cache, out_path):
+    start = time.perf_counter()
+    import torch
+    torch_s = time.perf_counter() - start
+
+    sys.path.insert(0, ROOT)
+    with contextlib.redirect_stdout(io.StringIO()):
+        from app_modules.modnet_local import ModNetLocalBGRemover
+        import_s = time.perf_counter() - start - torch_s
+
+        start = time.perf_counter()
+        remover = ModNetLocalBGRemover(ckpt, use_cache=use_cache)
+        init_s = time.perf_counter() - start
+
+        torch.manual_seed(0)
+        image = torch.rand(1, 3, 512, 384) * 2 - 1
+        start = time.perf_counter()
+        with torch.inference_mode():
+            matte = remover.model(image)
+        first_s = time.perf_counter() - start
+    torch.save(matte, out_path)
+    print(json.dumps({'torch_s': torch_s, 'import_s': import_s, 'init_s': init_s, 'first_s': first_s}))
+
+
+def run(ckpt, mode, out_path):
+    command = [sys.executable, __file__, '--ckpt', ckpt, '--worker', mode, '--out', out_path]
+    proc = subprocess.run(command, check=True, capture_output=True, text=True)
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--ckpt', required=True)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--worker', choices=['eager', 'cached'], help=argparse.SUPPRESS)
+    parser.add_argument('--out', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args.ckpt, args.worker == 'cached', args.out)
+        return
+
+    import torch
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ckpt = os.path.join(tmp, os.path.basename(args.ckpt))
+        shutil.copy(args.ckpt, ckpt)
+        eager = [run(ckpt, 'eager', os.path.join(tmp, 'eager.pt')) for _ in range(args.repeat)]
+        build = run(ckpt, 'cached', os.path.join(tmp, 'build.pt'))
+        cached = [run(ckpt, 'cached', os.path.join(tmp, 'cached.pt')) for _ in range(args.repeat)]
+        diff = (torch.load(os.path.join(tmp, 'eager.pt')) - torch.load(os.path.join(tmp, 'cached.pt'))).abs().max()
+        cache_files = [name for name in os.listdir(tmp) if name.endswith('.pt') and name.count('.') > 2]
+
+    def row(label, results):
+        median = {key: statistics.median(r[key] for r in results) for key in results[0]}
+        print(f"{label:<26} torch import={median['torch_s']:5.2f} s  modül importu={median['import_s']:5.2f} s  "
+              f"model kurulumu={median['init_s']:5.2f} s  ilk çıkarım={median['first_s'] * 1000:7.1f} ms")
+
+    row('Önbelleksiz', eager)
+    row('İlk açılış (önbellek yaz)', [build])
+    row('Önbellekten', cached)
+    print(f"Önbellek dosyası: {cache_files[0] if cache_files else '-'}")
+    print(f"Matte farkı (önbellekli / önbelleksiz): {float(diff):.2e}")
+
+
+if __name__ == '__main__':
+    main()
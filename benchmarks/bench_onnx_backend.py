@@ -0,0 +1,121 @@
+"""
+Yerel matting arka uçları: PyTorch (ModNetLocalBGRemover) ile ONNX Runtime
+(ModNetOnnxBGRemover) karşılaştırması.
+
+Her arka uç temiz bir alt süreçte çalışır: başlatma süresi (modül importu +
+model yükleme), başlatma sonrası ve çıkarım sonrası RSS, görüntü başına
+medyan gecikme ölçülür; iki arka ucun matte'leri karşılaştırılır.
+
+    python scripts/export_modnet_onnx.py
+    python benchmarks/bench_onnx_backend.py foto.jpg
+    python benchmarks/bench_onnx_backend.py foto.jpg --ckpt model.ckpt --onnx model.onnx
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+def current_rss_mb():
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def worker(backend, path, model, repeat, out_path):
+    import contextlib
+    import io
+
+    sys.path.insert(0, ROOT)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        if backend == 'torch':
+            from app_modules.modnet_local import ModNetLocalBGRemover
+            remover = ModNetLocalBGRemover(model)
+        else:
+            from app_modules.modnet_onnx import ModNetOnnxBGRemover
+            remover = ModNetOnnxBGRemover(model)
+    startup = time.perf_counter() - start
+    startup_rss = current_rss_mb()
+
+    import numpy as np
+    from app_modules.image_io import load_rgb
+    image = load_rgb(path)
+
+    times = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat + 1):
+            start = time.perf_counter()
+            _, matte = remover.remove_background_matte(image)
+            times.append(time.perf_counter() - start)
+    np.save(out_path, matte)
+    print(json.dumps({
+        'startup_s': startup,
+        'startup_rss_mb': startup_rss,
+        'rss_mb': current_rss_mb(),
+        'first_s': times[0],
+        'median_s': statistics.median(times[1:]),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('path')
+    parser.add_argument('--ckpt', help='PyTorch checkpoint (varsayılan: uygulamanın kullandığı)')
+    parser.add_argument('--onnx', help='ONNX modeli (varsayılan: checkpoint yanında)')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--worker', choices=['torch', 'onnx'], help=argparse.SUPPRESS)
+    parser.add_argument('--model', help=argparse.SUPPRESS)
+    parser.add_argument('--out', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args.worker, args.path, args.model, args.repeat, args.out)
+        return
+
+    import numpy as np
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for backend, model in (('torch', args.ckpt), ('onnx', args.onnx)):
+            out = os.path.join(tmp, f'{backend}.npy')
+            command = [sys.executable, __file__, args.path, '--worker', backend,
+                       '--repeat', str(args.repeat), '--out', out]
+            if model:
+                command += ['--model', model]
+            proc = subprocess.run(command, capture_output=True, text=True)
+            if proc.returncode != 0:
+                print(f"{backend}: çalıştırılamadı\n{proc.stderr.strip().splitlines()[-1]}")
+                continue
+            results[backend] = json.loads(proc.stdout.strip().splitlines()[-1])
+            results[backend]['matte'] = np.load(out)
+
+    for backend, label in (('torch', 'PyTorch'), ('onnx', 'ONNX Runtime')):
+        if backend not in results:
+            continue
+        r = results[backend]
+        print(f"{label:<13} başlatma={r['startup_s']:6.2f} s  RSS başlatma={r['startup_rss_mb']:7.1f} MB  "
+              f"RSS çıkarım sonrası={r['rss_mb']:7.1f} MB  ilk={r['first_s'] * 1000:7.1f} ms  "
+              f"medyan={r['median_s'] * 1000:7.1f} ms")
+
+    if len(results) == 2:
+        diff = np.abs(results['torch']['matte'].astype(np.int16) - results['onnx']['matte'].astype(np.int16))
+        print(f"Matte farkı (uint8): maks={int(diff.max())}  farklı piksel oranı={(diff > 0).mean():.2e}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""
+İşlem sunucusu (app_modules/processing_server.py) yük testi.
+
+Sunucu aynı süreçte, boş bir portta başlatılır; --clients kadar eşzamanlı
+istemci toplam --requests adet /matte (veya --process ile /process)
+isteği gönderir. Medyan / p95 gecikme, saniyedeki istek ve ortalama
+toplu işleme boyutu yazılır. İlk yanıtın matte'si aynı modelle yerel
+olarak üretilen matte ile karşılaştırılır.
+
+    python benchmarks/bench_processing_server.py foto.jpg --clients 4
+    python benchmarks/bench_processing_server.py foto.jpg --onnx model.onnx --batch-wait-ms 0
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+import requests
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app_modules.processing_server import MatteBatcher, ProcessingServer  # noqa: E402
+
+
+class CountingBatcher(MatteBatcher):
+    """Toplu işleme boyutlarını kaydeden MatteBatcher."""
+
+    def __init__(self, *args, **kwargs):
+        self.sizes = []
+        super().__init__(*args, **kwargs)
+
+    def _collect(self):
+        batch = super()._collect()
+        self.sizes.append(len(batch))
+        return batch
+
+
+def build_remover(args):
+    if args.onnx:
+        from app_modules.modnet_onnx import ModNetOnnxBGRemover
+        return ModNetOnnxBGRemover(args.onnx)
+    from app_modules.modnet_local import ModNetLocalBGRemover
+    return ModNetLocalBGRemover(args.ckpt)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('path')
+    parser.add_argument('--ckpt')
+    parser.add_argument('--onnx')
+    parser.add_argument('--clients', type=int, default=4)
+    parser.add_argument('--requests', type=int, default=16)
+    parser.add_argument('--batch-wait-ms', type=float, default=20)
+    parser.add_argument('--max-batch', type=int, default=4)
+    parser.add_argument('--process', action='store_true', help='/matte yerine /process (vesikalık sayfa)')
+    args = parser.parse_args()
+
+    with open(args.path, 'rb') as f:
+        data = f.read()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        remover = build_remover(args)
+        _, expected = remover.remove_background_matte(args.path)
+        batcher = CountingBatcher(remover, args.max_batch, args.batch_wait_ms / 1000)
+        server = ProcessingServer(('127.0.0.1', 0), batcher)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/{'process' if args.process else 'matte'}"
+
+    session = threading.local()
+
+    def request(_):
+        if not hasattr(session, 'value'):
+            session.value = requests.Session()
+        start = time.perf_counter()
+        response = session.value.post(url, data=data, timeout=600)
+        response.raise_for_status()
+        return time.perf_counter() - start, response.content
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        request(0)  # ısınma
+        batcher.sizes.clear()
+        start = time.perf_counter()
+        with ThreadPoolExecutor(args.clients) as pool:
+            results = list(pool.map(request, range(args.requests)))
+        elapsed = time.perf_counter() - start
+    server.shutdown()
+
+    latencies = sorted(latency for latency, _ in results)
+    p95 = latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))]
+    print(f"{args.clients} istemci, {args.requests} istek, toplama bekleme {args.batch_wait_ms:g} ms")
+    print(f"  {args.requests / elapsed:.2f} istek/s  medyan {statistics.median(latencies) * 1000:.0f} ms  "
+          f"p95 {p95 * 1000:.0f} ms  ortalama toplu boyut {statistics.mean(batcher.sizes):.2f}")
+    if not args.process:
+        matte = cv2.imdecode(np.frombuffer(results[0][1], np.uint8), cv2.IMREAD_GRAYSCALE)
+        diff = int(np.abs(matte.astype(np.int16) - expected.astype(np.int16)).max())
+        print(f"  sunucu / yerel matte maks. farkı: {diff} seviye")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""
+İşlem boyutu (ref_size) başına süre ve kalite tablosu.
+
+Her boyut için fotoğraflar matte önbelleği kapalıyken işlenir. Tabloda
+medyan süre ile en büyük boyuttaki (--reference) matte'ye göre kenar
+bandındaki ortalama mutlak fark yer alır. Baş üstü konumunun farkı da
+biyometrik çıktıdaki piksel karşılığıyla yazılır. Sonunda politikanın
+(select_ref_size) formatlara ve ölçülen hıza göre seçtiği boyutlar listelenir.
+
+    python benchmarks/bench_ref_size.py foto1.jpg foto2.jpg --onnx model.onnx
+    python benchmarks/bench_ref_size.py foto.jpg --sizes 256 384 512 640 --budget-ms 300
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import sys
+import time
+
+os.environ["BIYOVES_MATTE_CACHE_MB"] = "0"
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import cv2  # noqa: E402
+import numpy as np  # noqa: E402
+
+from app_modules.centering import analyze_face  # noqa: E402
+from app_modules.matting import select_ref_size  # noqa: E402
+from app_modules.photo_spec import BIYOMETRIK, VESIKALIK, spec_geometry  # noqa: E402
+
+
+def build_remover(args):
+    if args.onnx:
+        from app_modules.modnet_onnx import ModNetOnnxBGRemover
+        return ModNetOnnxBGRemover(args.onnx)
+    from app_modules.modnet_local import ModNetLocalBGRemover
+    return ModNetLocalBGRemover(args.ckpt)
+
+
+def head_top_y(image, matte):
+    """(baş üstü y, çene y) veya yüz bulunamazsa None."""
+    try:
+        analysis = analyze_face(image, matte=matte)
+    except ValueError:
+        return None
+    x, y, w, h = analysis.face
+    return analysis.head_top[1], y + h
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('paths', nargs='+')
+    parser.add_argument('--ckpt')
+    parser.add_argument('--onnx')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[256, 320, 384, 416, 448, 512, 640])
+    parser.add_argument('--reference', type=int, default=768)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--budget-ms', type=float, nargs='*', default=[100, 250, 500])
+    args = parser.parse_args()
+
+    head_px = spec_geometry(BIYOMETRIK).head_height_px
+    with contextlib.redirect_stdout(io.StringIO()):
+        remover = build_remover(args)
+        remover.remove_background_matte(args.paths[0])  # ısınma
+
+        references = {}
+        remover.ref_size = args.reference
+        for path in args.paths:
+            image, matte = remover.remove_background_matte(path)
+            references[path] = (image, matte, head_top_y(image, matte))
+
+        rows = []
+        for size in sorted(set(args.sizes) | {args.reference}):
+            remover.ref_size = size
+            times, band_errors, head_errors = [], [], []
+            for path in args.paths:
+                image, reference, reference_head = references[path]
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    _, matte = remover.remove_background_matte(path)
+                    times.append(time.perf_counter() - start)
+                ref = reference.astype(np.float32) / 255
+                band = cv2.dilate(((ref > 0.02) & (ref < 0.98)).astype(np.uint8), np.ones((9, 9), np.uint8)) > 0
+                if band.any():
+                    band_errors.append(float(np.abs(matte.astype(np.float32) / 255 - ref)[band].mean()))
+                head = head_top_y(image, matte)
+                if head and reference_head:
+                    # Baş üstü farkı, biyometrik çıktıdaki ölçeğe çevrilir
+                    scale = head_px / max(1, reference_head[1] - reference_head[0])
+                    head_errors.append(abs(head[0] - reference_head[0]) * scale)
+            rows.append((size, statistics.median(times), remover.seconds_per_mpx,
+                         statistics.mean(band_errors) if band_errors else None,
+                         statistics.mean(head_errors) if head_errors else None))
+
+    print(f"{len(args.paths)} fotoğraf, referans {args.reference}, {getattr(remover, 'label', '')}")
+    print(f"{'ref_size':>8} {'süre':>9} {'s/MP':>7} {'bant farkı':>11} {'baş üstü farkı':>15}")
+    for size, seconds, speed, band_error, head_error in rows:
+        band_text = f"{band_error * 1000:9.1f}‰" if band_error is not None else f"{'-':>10}"
+        head_text = f"{head_error:11.1f} px" if head_error is not None else f"{'-':>14}"
+        print(f"{size:>8} {seconds * 1000:6.0f} ms {speed:7.2f} {band_text} {head_text}")
+
+    speed = remover.seconds_per_mpx
+    print("\nPolitika (select_ref_size):")
+    print(f"  vesikalık: {select_ref_size([VESIKALIK])}  biyometrik: {select_ref_size([BIYOMETRIK])}  "
+          f"ikisi: {select_ref_size([VESIKALIK, BIYOMETRIK])}")
+    for budget_ms in args.budget_ms:
+        print(f"  bütçe {budget_ms:g} ms, ölçülen {speed:.2f} s/MP: "
+              f"{select_ref_size([BIYOMETRIK], budget_ms / 1000, speed)}")
+
+
+if __name__ == '__main__':
+    main()
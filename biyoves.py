@@ -0,0 +1,181 @@
+"""
+BiyoVes komut satırı: masaüstü uygulamasıyla aynı işlem hattı, arayüzsüz.
+
+Girişler dosya, klasör veya glob deseni olabilir (Windows kabuğu desenleri
+açmadığı için burada açılır). Her fotoğraf için aşama süreleri (arkaplan
+kaldırma, kompozit, yüz analizi, ölçekleme, yerleşim, rötuş, kaydetme)
+JSON olarak stdout'a (veya --json dosyasına) yazılır; işlem günlükleri
+stderr'e gider. Her çıktı, arayüzde olduğu gibi bir kullanım hakkı düşer.
+
+    python biyoves.py foto.jpg
+    python biyoves.py "seans/*.jpg" --type ikisi --layout 2li --retouch -o cikti/
+    python biyoves.py seans/ --bg api --json sure.json
+    python biyoves.py seans/ --workers 4      # süreç havuzuyla toplu işlem
+"""
+
+import argparse
+import contextlib
+import glob
+import json
+import os
+import sys
+import time
+
+from app_modules.batch import (
+    collect_images,
+    configure_resolution,
+    create_bg_remover,
+    output_path,
+    pending_images,
+    render_outputs,
+    run_batch,
+    stage_timer,
+)
+from app_modules.user_credits import credits_manager
+
+TYPE_TARGETS = {
+    "vesikalik": ["vesikalik"],
+    "biyometrik": ["biyometrik"],
+    "10x15": ["10x15"],
+    "ikisi": ["vesikalik", "biyometrik"],
+}
+
+
+def expand_inputs(patterns):
+    """Dosya, klasör ve glob desenlerini sıralı, tekrarsız giriş listesine çevir."""
+    sources = []
+    for pattern in patterns:
+        if glob.has_magic(pattern):
+            sources.extend(sorted(glob.glob(pattern)))
+        else:
+            sources.append(pattern)
+    return list(dict.fromkeys(collect_images(sources)))
+
+
+def charge_credits(count):
+    """count hak düş; yetmezse düşülenleri geri ver ve False döndür."""
+    charged = 0
+    while charged < count and credits_manager.use_credit():
+        charged += 1
+    if charged < count:
+        credits_manager.add_credits(charged)
+        return False
+    return True
+
+
+def remove_background(bg_remover, path, timings):
+    """(görüntü, matte | None); matte yoksa görüntü zaten kompozittir."""
+    with stage_timer(timings, "bg_removal"):
+        if hasattr(bg_remover, "remove_backgrounds"):
+            result = bg_remover.remove_backgrounds([path])[0]
+            if isinstance(result, Exception):
+                raise result
+            return result
+        if hasattr(bg_remover, "remove_background_matte"):
+            return bg_remover.remove_background_matte(path)
+        image = bg_remover.remove_background_image(path)
+        if image is None:
+            raise RuntimeError("Arkaplan kaldırılamadı")
+        return image, None
+
+
+def process_sequential(bg_remover, paths, targets, args):
+    """Fotoğrafları sırayla işle, her biri için aşama sürelerini döndür."""
+    records = []
+    for path in paths:
+        record = {"input": path, "outputs": [], "stages": {}, "error": None}
+        start = time.perf_counter()
+        if not charge_credits(len(targets)):
+            record["error"] = "Yetersiz kullanım hakkı"
+            records.append(record)
+            break
+        try:
+            image, matte = remove_background(bg_remover, path, record["stages"])
+            record["outputs"] = render_outputs(path, image, matte, targets, args.retouch,
+                                               args.output_dir, timings=record["stages"])
+        except Exception as e:
+            credits_manager.add_credits(len(targets))
+            record["error"] = str(e)
+        record["total_s"] = time.perf_counter() - start
+        records.append(record)
+    return records
+
+
+def process_pool(bg_remover, paths, targets, args):
+    """run_batch ile toplu işle (aşama süreleri süreçlere dağıldığı için yalnızca sonuçlar)."""
+    if not charge_credits(len(paths) * len(targets)):
+        return [{"input": path, "outputs": [], "stages": {}, "error": "Yetersiz kullanım hakkı"}
+                for path in paths]
+    result = run_batch(bg_remover, paths, targets, args.retouch, args.output_dir,
+                       workers=args.workers, skip_existing=False)
+    credits_manager.add_credits(len(result.failed) * len(targets))
+    errors = dict(result.failed)
+    return [{"input": path, "error": errors.get(path),
+             "outputs": [] if path in errors else [output_path(path, s, l, args.output_dir) for s, l in targets]}
+            for path in paths]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="biyoves", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("inputs", nargs="+", help="Fotoğraf dosyaları, klasörler veya glob desenleri")
+    parser.add_argument("--type", choices=sorted(TYPE_TARGETS), default="vesikalik",
+                        help="Çıktı türü (ikisi: vesikalık + biyometrik)")
+    parser.add_argument("--layout", choices=["4lu", "2li"], default="4lu")
+    parser.add_argument("--bg", choices=["local", "api", "auto"], default="local",
+                        help="Arkaplan kaldırma yöntemi (auto: yerel + API birlikte)")
+    parser.add_argument("--retouch", action="store_true", help="Doğal rötuş uygula")
+    parser.add_argument("-o", "--output-dir", help="Çıkış klasörü (varsayılan: girişlerin yanı)")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="Süreç havuzu boyutu; 0 ise sırayla işlenir ve aşama süreleri raporlanır")
+    parser.add_argument("--overwrite", action="store_true", help="Var olan çıktıları yeniden üret")
+    parser.add_argument("--json", help="Zaman raporunu bu dosyaya yaz (varsayılan: stdout)")
+    args = parser.parse_args(argv)
+
+    targets = [(selection, args.layout) for selection in TYPE_TARGETS[args.type]]
+    paths = expand_inputs(args.inputs)
+    if not paths:
+        parser.error("İşlenecek fotoğraf bulunamadı")
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    report = {"bg_method": args.bg, "type": args.type, "layout": args.layout, "retouch": args.retouch}
+    start = time.perf_counter()
+    # İşlem hattının günlükleri stderr'e, JSON raporu stdout'a
+    with contextlib.redirect_stdout(sys.stderr):
+        skipped = []
+        if not args.overwrite:
+            paths, skipped = pending_images(paths, targets, args.output_dir)
+        model_start = time.perf_counter()
+        bg_remover = create_bg_remover(args.bg)
+        configure_resolution(bg_remover, targets)
+        report["model_load_s"] = time.perf_counter() - model_start
+        report["ref_size"] = getattr(bg_remover, "ref_size", None)
+        if args.workers > 0:
+            records = process_pool(bg_remover, paths, targets, args)
+        else:
+            records = process_sequential(bg_remover, paths, targets, args)
+
+    total_s = time.perf_counter() - start - report["model_load_s"]
+    succeeded = sum(1 for record in records if record["error"] is None)
+    report.update({
+        "files": records,
+        "skipped": skipped,
+        "succeeded": succeeded,
+        "failed": len(records) - succeeded,
+        "total_s": total_s,
+        "images_per_s": succeeded / total_s if total_s > 0 else None,
+        "remaining_credits": credits_manager.get_remaining_credits(),
+    })
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+    return 0 if succeeded == len(records) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
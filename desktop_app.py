@@ -2,63 +2,76 @@ import os
 import sys
 import webbrowser
 import threading
+import multiprocessing
 import traceback
-import tempfile
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-import cv2
-import numpy as np
 
 # Assume these local modules are in a sub-directory named 'app_modules'
 # and are compatible with the rest of the application.
 from app_modules.modnet_bg import ModNetBGRemover
+from app_modules.remote_bg import RemoteBGRemover, processing_server_url
+from app_modules.hybrid_bg import HybridBGRemover
+
+# ModNet ONNX - dışa aktarılmış model ve onnxruntime varsa PyTorch hiç yüklenmez
+MODNET_ONNX_AVAILABLE = False
+ModNetOnnxBGRemover = None
+
+try:
+    from app_modules.modnet_onnx import ModNetOnnxBGRemover, find_onnx_model
+    MODNET_ONNX_AVAILABLE = find_onnx_model() is not None
+    if MODNET_ONNX_AVAILABLE:
+        print("[OK] ModNet ONNX modeli bulundu, yerel işlem ONNX Runtime ile yapılacak")
+except Exception as e:
+    print(f"[INFO] ModNet ONNX kullanilamiyor: {e}")
 
 # ModNet Local - PyTorch yoksa yüklenmez
 MODNET_LOCAL_AVAILABLE = False
 ModNetLocalBGRemover = None
 MODNET_LOCAL_ERROR = None
 
-try:
-    print("[DEBUG] ModNet Local yuklenmeye calisiliyor...")
-    
-    # Önce PyTorch kontrolü
-    try:
-        import torch
-        print(f"[OK] PyTorch yuklu: {torch.__version__}")
-    except ImportError as e:
-        raise RuntimeError(f"PyTorch yuklu degil: {e}")
-    
-    # NumPy kontrolü
+def load_modnet_local():
+    """PyTorch arka ucunu import et (ONNX kullanılamıyorsa çağrılır)."""
+    global MODNET_LOCAL_AVAILABLE, ModNetLocalBGRemover, MODNET_LOCAL_ERROR
     try:
-        import numpy as np
-        print(f"[OK] NumPy yuklu: {np.__version__}")
-    except ImportError as e:
-        raise RuntimeError(f"NumPy yuklu degil: {e}")
-    
-    # ModNet Local import - model loader kullanacak
-    from app_modules.modnet_local import ModNetLocalBGRemover
-    print("[OK] ModNet Local modulu basariyla yuklendi")
-    MODNET_LOCAL_AVAILABLE = True
-    
-except Exception as e:
-    print(f"[ERROR] ModNet Local yuklenemedi: {e}")
-    print(f"   Hata turu: {type(e).__name__}")
-    print("   Sadece ModNet API kullanilabilir.")
-    import traceback
-    traceback.print_exc()
-    ModNetLocalBGRemover = None
-    MODNET_LOCAL_AVAILABLE = False
-    MODNET_LOCAL_ERROR = str(e)
-
-from app_modules.center_biyo import create_smart_biometric_photo as create_biyometrik
-from app_modules.center_vesika import create_smart_vesikalik_photo as create_vesikalik
-from app_modules.duzen import (
-    create_image_layout,
-    create_image_layout_vesikalik,
-    create_image_layout_2lu_biyometrik,
-    create_image_layout_2lu_vesikalik,
-)
-from app_modules.enhance import natural_enhance_image
+        print("[DEBUG] ModNet Local yuklenmeye calisiliyor...")
+        
+        # Önce PyTorch kontrolü
+        try:
+            import torch
+            print(f"[OK] PyTorch yuklu: {torch.__version__}")
+        except ImportError as e:
+            raise RuntimeError(f"PyTorch yuklu degil: {e}")
+        
+        # NumPy kontrolü
+        try:
+            import numpy as np
+            print(f"[OK] NumPy yuklu: {np.__version__}")
+        except ImportError as e:
+            raise RuntimeError(f"NumPy yuklu degil: {e}")
+        
+        # ModNet Local import - model loader kullanacak
+        from app_modules.modnet_local import ModNetLocalBGRemover
+        print("[OK] ModNet Local modulu basariyla yuklendi")
+        MODNET_LOCAL_AVAILABLE = True
+        
+    except Exception as e:
+        print(f"[ERROR] ModNet Local yuklenemedi: {e}")
+        print(f"   Hata turu: {type(e).__name__}")
+        print("   Sadece ModNet API kullanilabilir.")
+        import traceback
+        traceback.print_exc()
+        ModNetLocalBGRemover = None
+        MODNET_LOCAL_AVAILABLE = False
+        MODNET_LOCAL_ERROR = str(e)
+
+if not MODNET_ONNX_AVAILABLE:
+    load_modnet_local()
+
+from app_modules.duzen import save_layout
+from app_modules.batch import (collect_images, configure_resolution, output_path, pending_images, render_pages,
+                               run_batch)
+from app_modules.face_cascade import warm_face_cascades
 from app_modules.user_credits import credits_manager
 
 class ModelLoaderWorker:
@@ -69,15 +82,40 @@ class ModelLoaderWorker:
     def run(self):
         try:
             self.callback("progress", "AI servisleri başlatılıyor...")
+
+            # Yüz algılama modelini önceden yükle (ilk işlemde XML ayrıştırılmasın)
+            self.callback("progress", "Yüz algılama modeli yükleniyor...")
+            try:
+                warm_face_cascades()
+            except Exception as e:
+                print(f"⚠️ Yüz algılama modeli önceden yüklenemedi: {e}")
+
             print("ModNet servisleri kontrol ediliyor...")
             
-            # ModNet API başlat
-            self.callback("progress", "ModNet API başlatılıyor...")
-            modnet_api = ModNetBGRemover()
+            # "Online" yöntemi: yapılandırılmışsa yerel işlem sunucusu, yoksa ModNet API
+            modnet_api = None
+            if processing_server_url():
+                try:
+                    self.callback("progress", "İşlem sunucusuna bağlanılıyor...")
+                    modnet_api = RemoteBGRemover()
+                except Exception as e:
+                    print(f"❌ İşlem sunucusu kullanılamıyor, ModNet API'ye dönülüyor: {e}")
+            if modnet_api is None:
+                self.callback("progress", "ModNet API başlatılıyor...")
+                modnet_api = ModNetBGRemover()
             
-            # ModNet Local başlat (PyTorch varsa)
+            # ModNet Local başlat (önce ONNX Runtime, yoksa PyTorch)
             modnet_local = None
-            if MODNET_LOCAL_AVAILABLE and ModNetLocalBGRemover:
+            if MODNET_ONNX_AVAILABLE:
+                try:
+                    self.callback("progress", "ModNet Local (ONNX) başlatılıyor...")
+                    modnet_local = ModNetOnnxBGRemover()
+                    print("✅ ModNet Local (ONNX) başarıyla başlatıldı")
+                except Exception as e:
+                    print(f"❌ ModNet ONNX başlatılamadı: {e}")
+                    # PyTorch arka ucuna dön
+                    load_modnet_local()
+            if modnet_local is None and MODNET_LOCAL_AVAILABLE and ModNetLocalBGRemover:
                 try:
                     self.callback("progress", "ModNet Local başlatılıyor...")
                     print("🔄 ModNet Local instance oluşturuluyor...")
@@ -88,13 +126,15 @@ class ModelLoaderWorker:
                     print(f"   Hata türü: {type(e).__name__}")
                     import traceback
                     traceback.print_exc()
-            else:
+            elif modnet_local is None:
                 if MODNET_LOCAL_ERROR:
                     print(f"⚠️ ModNet Local kullanılamıyor: {MODNET_LOCAL_ERROR}")
                 else:
                     print("⚠️ ModNet Local kullanılamıyor (PyTorch yüklü değil)")
             
-            self.callback("finished", {"api": modnet_api, "local": modnet_local})
+            # Otomatik: ikisi de varsa görüntüler tahmini en hızlı arka uca dağıtılır
+            modnet_auto = HybridBGRemover(modnet_local, modnet_api) if modnet_local else None
+            self.callback("finished", {"api": modnet_api, "local": modnet_local, "auto": modnet_auto})
             print("✅ AI servisleri başarıyla başlatıldı")
             print(f"🔍 Debug - modnet_api: {modnet_api}")
             print(f"🔍 Debug - modnet_local: {modnet_local}")
@@ -107,142 +147,138 @@ class ModelLoaderWorker:
             self.callback("error", error_msg)
 
 class ProcessingWorker:
-    """Worker to process the image in a separate thread."""
-    def __init__(self, app_instance, callback):
+    """Worker to process the image in a separate thread.
+
+    One worker produces every requested output from a single background
+    removal and face analysis; each output costs one credit.
+    """
+    def __init__(self, app_instance, callback, targets=None):
         self.app = app_instance
         self.callback = callback
+        # [(tür, yerleşim), ...] - None ise arayüzdeki seçim kullanılır
+        self.targets = targets
 
     def run(self):
-        credits_manager.use_credit()
+        targets = self.targets or self.app.get_targets()
+        charged = 0
+        for _ in targets:
+            if credits_manager.use_credit():
+                charged += 1
+        produced = []
         try:
-            self._process_pipeline()
+            if charged < len(targets):
+                raise RuntimeError(f"Yetersiz kullanım hakkı: {len(targets)} çıktı için {charged} hak var")
+            self._process_pipeline(targets, produced)
         except Exception as e:
             traceback.print_exc()
-            credits_manager.add_credits(1)
+            refund = charged - len(produced)
+            if refund > 0:
+                credits_manager.add_credits(refund)
             error_message = f"İşleme sırasında hata oluştu:\n{e}\n\nKrediniz geri verildi."
+            if produced:
+                error_message += f"\nTamamlanan çıktılar: {', '.join(os.path.basename(p) for p in produced)}"
             self.callback("error", error_message)
 
-    def _process_pipeline(self) -> None:
+    def _process_pipeline(self, targets, produced) -> None:
         if not self.app.bg_removers:
             raise RuntimeError("AI servisleri hazır değil")
 
-        selection_text = self.app.type_var.get()
-        selection = "10x15" if "10x15" in selection_text else selection_text.lower()
-        
-        layout_choice = "4lu" if self.app.layout_var.get() == "4lu" else "2li"
         in_path = self.app.image_path
-        base_dir, filename = os.path.split(in_path)
-        name, _ = os.path.splitext(filename)
-        
+
         # Seçilen arkaplan kaldırma yöntemini kullan
         bg_method = self.app.bg_method_var.get()
         if bg_method == "local" and self.app.bg_removers.get("local"):
             self.callback("progress", "Arkaplan kaldırılıyor (Local - Hızlı)...")
             bg_remover = self.app.bg_removers["local"]
+        elif bg_method == "auto" and self.app.bg_removers.get("auto"):
+            self.callback("progress", "Arkaplan kaldırılıyor (Otomatik)...")
+            bg_remover = self.app.bg_removers["auto"]
         else:
             self.callback("progress", "Arkaplan kaldırılıyor (API)...")
             bg_remover = self.app.bg_removers["api"]
         
-        no_bg_path = bg_remover.remove_background(in_path)
-        if no_bg_path is None: raise RuntimeError("Arkaplan kaldırılamadı")
-
-        self.callback("progress", "Yüz merkezleniyor...")
-        img_bgr = cv2.imread(no_bg_path, cv2.IMREAD_COLOR)
-        if img_bgr is None: raise RuntimeError("İşlenen görüntü okunamadı")
-
-        final_output_path = None
-        
-        try:
-            if selection == "10x15":
-                self.callback("progress", "10x15 cm fotoğraf hazırlanıyor...")
-                fd, temp_path = tempfile.mkstemp(suffix=".jpg"); os.close(fd)
-                create_vesikalik(no_bg_path, temp_path)
-                cropped_bgr = cv2.imread(temp_path); os.remove(temp_path)
-                if cropped_bgr is None: raise RuntimeError("Kırpılmış görüntü oluşturulamadı")
-                
-                h, w = cropped_bgr.shape[:2]
-                aspect_ratio = w / h
-                available_width = self.app.TARGET_WIDTH_10x15
-                available_height = self.app.TARGET_HEIGHT_10x15 - self.app.TOP_MARGIN_10x15
-                target_aspect = available_width / available_height
-                
-                if aspect_ratio > target_aspect:
-                    new_height = available_height
-                    new_width = int(new_height * aspect_ratio)
-                    resized = cv2.resize(cropped_bgr, (new_width, new_height), interpolation=cv2.INTER_LANCZOS4)
-                    start_crop_x = (resized.shape[1] - available_width) // 2
-                    resized = resized[:, start_crop_x:start_crop_x + available_width]
-                else:
-                    new_width = available_width
-                    new_height = int(new_width / aspect_ratio)
-                    resized = cv2.resize(cropped_bgr, (new_width, new_height), interpolation=cv2.INTER_LANCZOS4)
-                    start_crop_y = (resized.shape[0] - available_height) // 2
-                    resized = resized[start_crop_y:start_crop_y + available_height, :]
-                
-                resized = cv2.resize(resized, (available_width, available_height), interpolation=cv2.INTER_LANCZOS4)
-                
-                final_image = np.full((self.app.TARGET_HEIGHT_10x15, self.app.TARGET_WIDTH_10x15, 3), 255, dtype=np.uint8)
-                final_image[self.app.TOP_MARGIN_10x15:self.app.TOP_MARGIN_10x15+available_height, 0:available_width] = resized
-                
-                final_output_path = os.path.join(base_dir, f"{name}_10x15cm.jpg")
-                cv2.imwrite(final_output_path, final_image, [cv2.IMWRITE_JPEG_QUALITY, 100])
-                
-            elif selection == "biyometrik":
-                fd, temp_path = tempfile.mkstemp(suffix=".jpg"); os.close(fd)
-                create_biyometrik(no_bg_path, temp_path)
-                cropped_bgr = cv2.imread(temp_path); os.remove(temp_path)
-                if cropped_bgr is None: raise RuntimeError("Kırpılmış görüntü oluşturulamadı")
-                
-                if layout_choice == "4lu":
-                    self.callback("progress", "4'lü biyometrik sayfa oluşturuluyor...")
-                    final_output_path = os.path.join(base_dir, f"{name}_10x15_biyometrik.jpg")
-                    create_image_layout(cropped_bgr, final_output_path)
-                else:
-                    self.callback("progress", "2'li biyometrik şerit oluşturuluyor...")
-                    final_output_path = os.path.join(base_dir, f"{name}_5x15_biyometrik.jpg")
-                    create_image_layout_2lu_biyometrik(cropped_bgr, final_output_path)
-            else: # Vesikalık
-                fd, temp_path = tempfile.mkstemp(suffix=".jpg"); os.close(fd)
-                create_vesikalik(no_bg_path, temp_path)
-                cropped_bgr = cv2.imread(temp_path); os.remove(temp_path)
-                if cropped_bgr is None: raise RuntimeError("Kırpılmış görüntü oluşturulamadı")
-
-                if layout_choice == "4lu":
-                    self.callback("progress", "4'lü vesikalık sayfa oluşturuluyor...")
-                    final_output_path = os.path.join(base_dir, f"{name}_10x15_vesikalik.jpg")
-                    create_image_layout_vesikalik(cropped_bgr, final_output_path)
-                else:
-                    self.callback("progress", "2'li vesikalık şerit oluşturuluyor...")
-                    final_output_path = os.path.join(base_dir, f"{name}_5x15_vesikalik.jpg")
-                    create_image_layout_2lu_vesikalik(cropped_bgr, final_output_path)
+        # Yerel modelde işlem boyutu seçilen ölçülere göre (vesikalıkta daha küçük)
+        configure_resolution(bg_remover, targets)
+
+        # Tüm aşamalar bellekte çalışır; diske yalnızca son çıktılar yazılır.
+        # Matte veren kaldırıcıda kompozit ve baş üstü render_pages'te matte'den yapılır.
+        matte = None
+        if hasattr(bg_remover, "remove_backgrounds"):
+            result = bg_remover.remove_backgrounds([in_path])[0]
+            if isinstance(result, Exception):
+                raise result
+            img_bgr, matte = result
+        elif hasattr(bg_remover, "remove_background_matte"):
+            img_bgr, matte = bg_remover.remove_background_matte(in_path)
+        else:
+            img_bgr = bg_remover.remove_background_image(in_path)
+        if img_bgr is None: raise RuntimeError("Arkaplan kaldırılamadı")
 
-            if self.app.enable_retouch:
-                self.callback("progress", "Doğal rötuş uygulanıyor...")
-                enhanced_path = natural_enhance_image(final_output_path)
-                if enhanced_path != final_output_path and os.path.exists(enhanced_path):
-                    os.remove(final_output_path)
-                    os.rename(enhanced_path, final_output_path)
-        
-        finally:
-            if no_bg_path and os.path.exists(no_bg_path):
-                try: os.remove(no_bg_path)
-                except Exception as e: print(f"Geçici dosya silinemedi {no_bg_path}: {e}")
+        retouch = self.app.enable_retouch.get()
+        self.callback("progress", "Yüz merkezleniyor ve çıktılar hazırlanıyor"
+                                  f"{' (doğal rötuşla)' if retouch else ''}...")
 
-        self.callback("progress", f"Kaydedildi: {os.path.basename(final_output_path)}")
+        # Toplu işlem ve komut satırıyla aynı yol: yüz analizi bir kez, format başına bir ölçekleme
+        for (selection, layout_choice), page in render_pages(img_bgr, matte, targets, retouch=retouch):
+            final_output_path = output_path(in_path, selection, layout_choice)
+            save_layout(page, final_output_path)
+            produced.append(final_output_path)
+            self.callback("progress", f"Kaydedildi: {os.path.basename(final_output_path)}")
         
         remaining_credits = credits_manager.get_remaining_credits()
         credits_message = f"\n\nKalan kullanım hakkı: {remaining_credits}"
         if remaining_credits == 0:
             credits_message += "\n⚠️ Ücretsiz haklarınız bitti! Lütfen bakiye ekleyin."
         
-        self.callback("finished", final_output_path, credits_message)
+        self.callback("finished", produced, credits_message)
 
-class MainWindow:
-    # Constants
-    TARGET_WIDTH_10x15 = 1181
-    TARGET_HEIGHT_10x15 = 1772
-    TOP_MARGIN_10x15 = 118
+class BatchProcessingWorker:
+    """Worker to process every photo of a folder in a separate thread.
 
+    Credits are charged for the outputs of the files that still need
+    processing; outputs of failed files are refunded at the end.
+    """
+    def __init__(self, app_instance, callback, paths, targets):
+        self.app = app_instance
+        self.callback = callback
+        self.paths = paths
+        self.targets = targets
+
+    def run(self):
+        bg_method = self.app.bg_method_var.get()
+        if bg_method in ("local", "auto") and self.app.bg_removers.get(bg_method):
+            bg_remover = self.app.bg_removers[bg_method]
+        else:
+            bg_remover = self.app.bg_removers["api"]
+
+        pending, _ = pending_images(self.paths, self.targets)
+        needed = len(pending) * len(self.targets)
+        charged = 0
+        for _ in range(needed):
+            if not credits_manager.use_credit():
+                break
+            charged += 1
+        try:
+            if charged < needed:
+                raise RuntimeError(f"Yetersiz kullanım hakkı: {needed} çıktı için {charged} hak var")
+            result = run_batch(
+                bg_remover, self.paths, self.targets,
+                retouch=self.app.enable_retouch.get(),
+                callback=lambda event, text, done, total: self.callback(event, f"[{done}/{total}] {text}"),
+            )
+        except Exception as e:
+            traceback.print_exc()
+            if charged > 0:
+                credits_manager.add_credits(charged)
+            self.callback("error", f"Toplu işlem sırasında hata oluştu:\n{e}\n\nKrediniz geri verildi.")
+            return
+
+        refund = charged - len(result.produced)
+        if refund > 0:
+            credits_manager.add_credits(refund)
+        self.callback("batch_finished", result)
+
+class MainWindow:
     def __init__(self):
         self.root = tk.Tk()
         self.root.title("BiyoVes - Vesikalık & Biyometrik")
@@ -252,6 +288,7 @@ class MainWindow:
         
         # Variables
         self.image_path = None
+        self.batch_paths = None  # Klasör seçildiyse içindeki fotoğraflar
         self.enable_retouch = tk.BooleanVar()
         self.bg_removers = None  # Dictionary: {"api": ModNetAPI, "local": ModNetLocal}
         self.type_var = tk.StringVar(value="Vesikalık")
@@ -283,6 +320,12 @@ class MainWindow:
                                    bg="#424242", fg="#E0E0E0", font=("Arial", 14))
         self.file_button.pack(side="left")
         
+        # Klasördeki tüm fotoğraflar için toplu işlem
+        self.folder_button = tk.Button(file_btn_frame, text="Klasör Seç...", 
+                                     command=self.choose_folder, state="disabled",
+                                     bg="#424242", fg="#E0E0E0", font=("Arial", 14))
+        self.folder_button.pack(side="left", padx=(10, 0))
+        
         self.file_info_label = tk.Label(file_btn_frame, text="Henüz dosya seçilmedi.", 
                                        fg="#9E9E9E", bg="#323232", font=("Arial", 14, "italic"))
         self.file_info_label.pack(side="left", padx=10)
@@ -319,6 +362,13 @@ class MainWindow:
                                       command=self._on_type_change)
         self.tek_radio.pack(side="left", padx=10)
         
+        # Aynı fotoğraftan tek arkaplan kaldırma ile iki format
+        self.ikisi_radio = tk.Radiobutton(type_frame, text="Vesikalık + Biyometrik", variable=self.type_var, 
+                                        value="Vesikalık + Biyometrik", state="disabled", bg="#323232", 
+                                        fg="#BDBDBD", font=("Arial", 14),
+                                        command=self._on_type_change)
+        self.ikisi_radio.pack(side="left", padx=10)
+        
         # Background removal method selection
         bg_method_frame = tk.Frame(settings_frame, bg="#323232")
         bg_method_frame.pack(fill="x", padx=10, pady=5)
@@ -338,6 +388,12 @@ class MainWindow:
                                          font=("Arial", 14))
         self.local_radio.pack(side="left", padx=10)
         
+        self.auto_radio = tk.Radiobutton(bg_method_frame, text="Otomatik", 
+                                         variable=self.bg_method_var, value="auto", 
+                                         state="disabled", bg="#323232", fg="#BDBDBD", 
+                                         font=("Arial", 14))
+        self.auto_radio.pack(side="left", padx=10)
+        
         # Layout selection
         self.layout_frame = tk.Frame(settings_frame, bg="#323232")
         self.layout_frame.pack(fill="x", padx=10, pady=5)
@@ -470,6 +526,18 @@ class MainWindow:
             self.set_status("API hatası. Uygulamayı yeniden başlatın.")
             self._enable_all_controls(True)
 
+    def get_targets(self):
+        """Arayüz seçimine göre üretilecek çıktılar: [(tür, yerleşim), ...]"""
+        selection_text = self.type_var.get()
+        layout_choice = "4lu" if self.layout_var.get() == "4lu" else "2li"
+        if "10x15" in selection_text:
+            return [("10x15", layout_choice)]
+        if selection_text == "Vesikalık + Biyometrik":
+            return [("vesikalik", layout_choice), ("biyometrik", layout_choice)]
+        if selection_text == "Biyometrik":
+            return [("biyometrik", layout_choice)]
+        return [("vesikalik", layout_choice)]
+
     def _on_type_change(self):
         """Tür seçimi değiştiğinde yerleşim seçeneklerini güncelle"""
         selected_type = self.type_var.get()
@@ -488,13 +556,17 @@ class MainWindow:
     def _enable_all_controls(self, enabled: bool):
         state = "normal" if enabled else "disabled"
         self.file_button.config(state=state)
+        self.folder_button.config(state=state)
         self.process_button.config(state=state)
         self.retouch_checkbox.config(state=state)
         self.vesikalik_radio.config(state=state)
         self.biyometrik_radio.config(state=state)
         self.tek_radio.config(state=state)
+        self.ikisi_radio.config(state=state)
         self.api_radio.config(state=state)
         self.local_radio.config(state=state)
+        has_auto = bool(self.bg_removers and self.bg_removers.get("auto"))
+        self.auto_radio.config(state=state if has_auto else "disabled")
         self.fourlu_radio.config(state=state)
         self.twoli_radio.config(state=state)
 
@@ -505,9 +577,25 @@ class MainWindow:
         )
         if path:
             self.image_path = path
+            self.batch_paths = None
             self.file_info_label.config(text=os.path.basename(path))
 
+    def choose_folder(self):
+        folder = filedialog.askdirectory(title="Fotoğraf Klasörü Seç")
+        if not folder:
+            return
+        paths = collect_images(folder)
+        if not paths:
+            messagebox.showwarning("Uyarı", "Klasörde desteklenen fotoğraf bulunamadı.")
+            return
+        self.batch_paths = paths
+        self.image_path = None
+        self.file_info_label.config(text=f"{os.path.basename(folder)} ({len(paths)} fotoğraf)")
+
     def process_image(self):
+        if self.batch_paths:
+            self.process_folder()
+            return
         if not self.image_path:
             messagebox.showwarning("Uyarı", "Lütfen önce bir fotoğraf seçin.")
             return
@@ -519,6 +607,12 @@ class MainWindow:
                                  "Ücretsiz haklarınız bitti. Devam etmek için 'Bakiye Ekle' butonuna tıklayın.")
             self._update_credits_display()
             return
+        needed = len(self.get_targets())
+        if credits_manager.get_remaining_credits() < needed:
+            messagebox.showwarning("Yetersiz Kullanım Hakkı", 
+                                 f"Bu işlem {needed} çıktı üretir ve {needed} hak gerektirir.")
+            self._update_credits_display()
+            return
         
         self.set_status("İşlem başlatılıyor...")
         self.process_button.config(state="disabled", text="İşleniyor...")
@@ -530,14 +624,54 @@ class MainWindow:
         thread = threading.Thread(target=processing_worker, daemon=True)
         thread.start()
 
+    def process_folder(self):
+        if not self.bg_removers:
+            messagebox.showwarning("Uyarı", "AI servisleri henüz hazır değil, lütfen bekleyin.")
+            return
+        targets = self.get_targets()
+        pending, skipped = pending_images(self.batch_paths, targets)
+        if not pending:
+            messagebox.showinfo("Toplu İşlem", "Klasördeki tüm fotoğrafların çıktıları zaten mevcut.")
+            return
+        needed = len(pending) * len(targets)
+        if credits_manager.get_remaining_credits() < needed:
+            messagebox.showwarning("Yetersiz Kullanım Hakkı", 
+                                 f"{len(pending)} fotoğraf {needed} çıktı üretir ve {needed} hak gerektirir.")
+            self._update_credits_display()
+            return
+
+        self.set_status(f"Toplu işlem başlatılıyor ({len(pending)} fotoğraf, {len(skipped)} atlandı)...")
+        self.process_button.config(state="disabled", text="İşleniyor...")
+
+        def batch_worker():
+            worker = BatchProcessingWorker(self, self._on_processing_callback, self.batch_paths, targets)
+            worker.run()
+        
+        thread = threading.Thread(target=batch_worker, daemon=True)
+        thread.start()
+
     def _on_processing_callback(self, event_type, *args):
         if event_type == "progress":
             self.set_status(args[0])
         elif event_type == "finished":
             self._update_credits_display()
             self.process_button.config(state="normal", text="Fotoğrafı İşle")
+            paths = args[0]
+            file_names = ", ".join(os.path.basename(p) for p in paths)
             messagebox.showinfo("İşlem Tamamlandı",
-                f"Fotoğraf başarıyla işlendi ve kaydedildi!\n\nDosya: {os.path.basename(args[0])}\nKonum: {os.path.dirname(args[0])}{args[1] if len(args) > 1 else ''}")
+                f"Fotoğraf başarıyla işlendi ve kaydedildi!\n\nDosya: {file_names}\nKonum: {os.path.dirname(paths[0])}{args[1] if len(args) > 1 else ''}")
+        elif event_type == "batch_finished":
+            self._update_credits_display()
+            self.process_button.config(state="normal", text="Fotoğrafı İşle")
+            result = args[0]
+            done = len(self.batch_paths) - len(result.skipped) - len(result.failed)
+            message = (f"Başarılı: {done}\nAtlanan (çıktısı mevcut): {len(result.skipped)}\n"
+                       f"Hatalı: {len(result.failed)}")
+            if result.failed:
+                message += "\n\n" + "\n".join(f"{os.path.basename(p)}: {e}" for p, e in result.failed[:10])
+                message += "\n\nHatalı fotoğrafların hakkı geri verildi."
+            self.set_status(f"Toplu işlem bitti: {done} başarılı, {len(result.failed)} hatalı")
+            messagebox.showinfo("Toplu İşlem Tamamlandı", message)
         elif event_type == "error":
             self._update_credits_display()
             self.process_button.config(state="normal", text="Fotoğrafı İşle")
@@ -548,6 +682,8 @@ class MainWindow:
         self.root.mainloop()
 
 def main():
+    # Toplu işlemdeki süreç havuzu PyInstaller exe'sinde de çalışsın
+    multiprocessing.freeze_support()
     # Debug modu - console çıktısını görmek için
     if len(sys.argv) > 1 and sys.argv[1] == "--debug":
         print("🔍 Debug modu aktif - console çıktısı görünür")
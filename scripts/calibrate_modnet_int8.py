@@ -0,0 +1,72 @@
+"""
+MODNet int8 (statik nicemleme) modelini örnek portrelerle kalibre eder.
+
+Klasördeki portreler uygulamadaki ön işlemeden (512 px, 32'nin katı,
+[-1, 1]) geçirilip aktivasyon aralıkları toplanır; nicemlenmiş model
+TorchScript olarak checkpoint'in yanına kaydedilir ve
+ModNetLocalBGRemover(precision="int8") veya BIYOVES_MODNET_PRECISION=int8
+ile kullanılır. Kalibrasyon, gerçek kullanımı temsil eden (farklı ışık,
+saç, arkaplan) 20-50 portreyle yapılmalıdır.
+
+    python scripts/calibrate_modnet_int8.py ornek_portreler/
+    python scripts/calibrate_modnet_int8.py ornek_portreler/ --ckpt model.ckpt --limit 50
+"""
+
+import argparse
+import os
+import sys
+
+import torch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import app_modules.modnet_local  # noqa: F401  (MODNet/src yolunu ekler)
+from app_modules.image_io import load_rgb
+from app_modules.matting import prepare_input
+from app_modules.modnet_optimize import strip_module_prefix
+from app_modules.modnet_quantize import int8_model_path, quantize_modnet
+from models.modnet import MODNet
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.webp')
+
+
+def list_images(folder, limit):
+    names = sorted(name for name in os.listdir(folder) if name.lower().endswith(IMAGE_EXTENSIONS))
+    return [os.path.join(folder, name) for name in names[:limit]]
+
+
+def calibration_inputs(paths):
+    for path in paths:
+        yield torch.from_numpy(prepare_input(load_rgb(path)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('folder', help='Kalibrasyon portreleri klasörü')
+    parser.add_argument('--ckpt', help='MODNet checkpoint (varsayılan: uygulamanın kullandığı)')
+    parser.add_argument('--output', help='int8 model dosyası (varsayılan: checkpoint yanında)')
+    parser.add_argument('--limit', type=int, default=50, help='En fazla kaç görüntü kullanılacak')
+    args = parser.parse_args()
+
+    ckpt = args.ckpt
+    if ckpt is None:
+        from app_modules.model_loader import get_model_path
+        ckpt = get_model_path()
+    output = args.output or int8_model_path(ckpt)
+
+    paths = list_images(args.folder, args.limit)
+    if not paths:
+        parser.error(f"{args.folder} içinde görüntü bulunamadı")
+
+    model = MODNet(backbone_pretrained=False)
+    model.load_state_dict(strip_module_prefix(torch.load(ckpt, map_location='cpu')))
+    model.eval()
+
+    quantized = quantize_modnet(model, calibration_inputs(paths))
+    quantized.save(output)
+    print(f"[OK] int8 model kaydedildi: {output} ({os.path.getsize(output) / 1e6:.1f} MB)")
+    print("Kalite ve hız için: python benchmarks/bench_modnet_int8.py <ayrı test klasörü>")
+
+
+if __name__ == '__main__':
+    main()
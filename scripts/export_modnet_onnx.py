@@ -0,0 +1,72 @@
+"""
+MODNet checkpoint'ini ONNX Runtime arka ucu için dışa aktarır.
+
+Yalnızca çıkarım yolu (MODNet(..., inference=True) -> matte) aktarılır;
+girdi (1, 3, H, W) float32 [-1, 1], çıktı (1, 1, H, W) matte. H ve W
+dinamiktir (32'nin katı olmalı). BatchNorm katlama ve Conv+ReLU
+birleştirme ONNX Runtime'ın grafik optimizasyonlarına bırakılır, bu yüzden
+aktarılan grafik orijinal modeldir.
+
+Aktarımdan sonra PyTorch ve ONNX Runtime çıktıları iki farklı boyutta
+karşılaştırılır.
+
+    python scripts/export_modnet_onnx.py
+    python scripts/export_modnet_onnx.py --ckpt model.ckpt --output model.onnx
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+import torch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import app_modules.modnet_local  # noqa: F401  (MODNet/src yolunu ekler)
+from app_modules.modnet_onnx import ONNX_MODEL_NAME
+from app_modules.modnet_optimize import MattingInference, strip_module_prefix
+from models.modnet import MODNet
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--ckpt', help='MODNet checkpoint (varsayılan: uygulamanın kullandığı)')
+    parser.add_argument('--output', help=f'ONNX dosyası (varsayılan: checkpoint yanında {ONNX_MODEL_NAME})')
+    parser.add_argument('--opset', type=int, default=17)
+    args = parser.parse_args()
+
+    ckpt = args.ckpt
+    if ckpt is None:
+        from app_modules.model_loader import get_model_path
+        ckpt = get_model_path()
+    output = args.output or os.path.join(os.path.dirname(os.path.abspath(ckpt)), ONNX_MODEL_NAME)
+
+    model = MODNet(backbone_pretrained=False)
+    model.load_state_dict(strip_module_prefix(torch.load(ckpt, map_location='cpu')))
+    wrapper = MattingInference(model).eval()
+
+    dummy = torch.zeros(1, 3, 512, 512)
+    torch.onnx.export(
+        wrapper, (dummy,), output,
+        input_names=['image'], output_names=['matte'],
+        dynamic_axes={'image': {0: 'batch', 2: 'height', 3: 'width'},
+                      'matte': {0: 'batch', 2: 'height', 3: 'width'}},
+        opset_version=args.opset,
+        dynamo=False,
+    )
+    print(f"[OK] ONNX modeli kaydedildi: {output} ({os.path.getsize(output) / 1e6:.1f} MB)")
+
+    import onnxruntime as ort
+    session = ort.InferenceSession(output, providers=['CPUExecutionProvider'])
+    for height, width in ((512, 384), (384, 512)):
+        image = torch.rand(1, 3, height, width) * 2 - 1
+        with torch.inference_mode():
+            expected = wrapper(image).numpy()
+        actual = session.run(None, {'image': image.numpy()})[0]
+        diff = np.abs(expected - actual).max()
+        print(f"{width}x{height}: PyTorch / ONNX Runtime maks. fark = {diff:.2e}")
+
+
+if __name__ == '__main__':
+    main()